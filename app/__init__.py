@@ -1,20 +1,39 @@
-from config import db  # 데이터베이스 객체 가져오기
+from config import db, pool_options, replica_binds  # 데이터베이스 객체, 커넥션 풀 / 복제본 설정
 from flask_smorest import Api  # Flask-Smorest API 객체 가져오기
 from flask import Flask  # Flask 애플리케이션 객체
+from werkzeug.middleware.proxy_fix import ProxyFix  # nginx 뒤에서 실제 클라이언트 IP 사용
 from flask_migrate import Migrate  # 데이터베이스 마이그레이션 도구
 import os  # 환경 변수 관리
+from app import answer_spool  # 답변 비동기 저장 스풀
+from app import content_version  # 설문 내용 변경 감지 (캐시 무효화)
+from app import metrics  # 요청별 SQL / 지연 시간 측정
+from app import replicas  # 조회 요청을 읽기 전용 복제본으로 분산
+from app import admission  # 유입 제어 (동시 처리 수 / 초당 요청 수 제한)
+from app import http_cache  # JSON 응답 gzip 압축
+from app.serializers import JSONProvider  # orjson 기반 JSON 인코딩 (기존 jsonify와 같은 결과)
 
 migrate = Migrate()  # 마이그레이션 객체 생성
 api = Api()  # Flask-Smorest API 객체 생성
 
-def create_app():
+def create_app(config=None):
     """
     Flask 애플리케이션 생성 및 초기화 함수
+    config: 기본 설정 위에 덮어쓸 설정 dict (로컬 테스트/벤치마크용)
     """
     app = Flask(__name__)  # Flask 애플리케이션 인스턴스 생성
+    app.json = JSONProvider(app)  # Enum / datetime 직접 인코딩, orjson이 있으면 사용
 
     # Flask 설정
     app.config.from_object("config.Config")  # config.py에서 설정 로드
+    if config:
+        app.config.update(config)  # 전달받은 설정으로 덮어쓰기
+        if "SQLALCHEMY_ENGINE_OPTIONS" not in config:
+            # DB 주소나 동시 처리 수가 바뀌었을 수 있으므로 풀 설정 다시 계산
+            app.config["SQLALCHEMY_ENGINE_OPTIONS"] = pool_options(
+                app.config["SQLALCHEMY_DATABASE_URI"], app.config["WORKER_CONCURRENCY"]
+            )
+        if "SQLALCHEMY_BINDS" not in config:
+            app.config["SQLALCHEMY_BINDS"] = replica_binds(app.config["REPLICA_DATABASE_URLS"])
     app.secret_key = os.getenv("FLASK_SECRET_KEY", "default_secret")  # 비밀키 설정
 
     # OpenAPI 및 Swagger UI 설정
@@ -29,6 +48,14 @@ def create_app():
     db.init_app(app)  # SQLAlchemy 데이터베이스 초기화
     api.init_app(app)  # Flask-Smorest API 초기화
     migrate.init_app(app, db)  # Flask-Migrate 초기화
+    answer_spool.init_app(app)  # 답변 스풀 (ANSWER_INGEST_MODE = "spool"일 때만)
+    content_version.init_app(app)  # 워커 간 공유 설문 내용 버전
+    metrics.init_app(app)  # 요청별 측정 (/metrics)
+    replicas.init_app(app)  # GET 요청은 복제본, 쓰기 / 쓰기 직후 조회는 primary
+    admission.init_app(app)  # 커넥션 풀 대기 초과는 503
+    http_cache.init_app(app)  # 큰 JSON / CSV 응답 gzip (Accept-Encoding 허용 시)
+    if app.config["PROXY_FIX_X_FOR"]:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config["PROXY_FIX_X_FOR"])
 
     # 블루프린트 가져오기 및 등록
     from app.routes import api_bp
@@ -37,6 +64,7 @@ def create_app():
     from app.views.users import users_bp
     from app.views.choices import choices_bp
     from app.views.answers import answer_bp
+    from app.views.results import results_bp
 
     api.register_blueprint(api_bp)
     api.register_blueprint(images_bp,)  # 이미지 관련 API
@@ -44,6 +72,14 @@ def create_app():
     api.register_blueprint(users_bp)  # 사용자 관련 API
     api.register_blueprint(choices_bp)  # 선택지 관련 API
     api.register_blueprint(answer_bp)  # 답안 관련 API
+    api.register_blueprint(results_bp)  # 설문 결과 집계 API
+
+    # CLI 명령 등록 (flask init-db, flask results ..., flask answers ..., flask users ...)
+    from app.commands import answers_cli, init_db, results_cli, users_cli
+    app.cli.add_command(init_db)
+    app.cli.add_command(results_cli)
+    app.cli.add_command(answers_cli)
+    app.cli.add_command(users_cli)
 
     return app  # 생성된 Flask 애플리케이션 반환
 
@@ -0,0 +1,233 @@
+import fcntl
+import math
+import os
+import random
+import sqlite3
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, jsonify, request
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+
+from config import db
+
+PRUNE_PROBABILITY = 0.001  # 요청 1000번에 한 번 꼴로 오래된 IP 버킷 정리
+PRUNE_AFTER_SECONDS = 3600  # 이 시간 동안 쓰이지 않은 버킷은 가득 찬 상태와 같으므로 삭제
+REJECT_DRAIN_BYTES = 64 * 1024  # 거절 응답 전에 읽어 버리는 요청 본문 최대 크기 (넘으면 연결 종료)
+DRAIN_CHUNK_BYTES = 8 * 1024
+
+
+class BucketStore:
+    """
+    모든 워커가 공유하는 토큰 버킷 (로컬 SQLite 파일)
+    여러 버킷을 한 트랜잭션에서 확인하여 모두 토큰이 있을 때만 차감
+    저장소가 잠겨 있거나 오류가 나면 요청을 막지 않고 통과시킴 (fail open)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is None or self.local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=0.05, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")  # 재시작 시 잃어도 되는 상태
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            self.local.connection = connection
+            self.local.pid = os.getpid()
+        return connection
+
+    def take(self, buckets):
+        """
+        buckets: [(키, 초당 보충 수, 최대 토큰 수)]
+        모두 토큰이 있으면 하나씩 차감하고 0, 아니면 다시 시도할 수 있을 때까지의 초
+        """
+        now = time.time()
+        try:
+            connection = self._connection()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                wait = 0.0
+                updates = []
+                for key, rate, burst in buckets:
+                    row = connection.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+                    tokens = burst if row is None else min(burst, row[0] + (now - row[1]) * rate)
+                    if tokens < 1:
+                        wait = max(wait, (1 - tokens) / rate)
+                    updates.append((key, tokens - 1, now))
+                if wait:
+                    connection.execute("ROLLBACK")
+                    return wait
+                connection.executemany(
+                    "INSERT INTO buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                    updates,
+                )
+                if random.random() < PRUNE_PROBABILITY:
+                    connection.execute("DELETE FROM buckets WHERE updated < ?", (now - PRUNE_AFTER_SECONDS,))
+                connection.execute("COMMIT")
+                return 0.0
+            except BaseException:
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                raise
+        except sqlite3.Error:
+            return 0.0
+
+
+class SlotPool:
+    """
+    모든 워커가 공유하는 동시 처리 슬롯 (슬롯마다 flock 파일 하나)
+    프로세스가 죽으면 잠금이 자동으로 풀리므로 슬롯이 새지 않음
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def acquire(self, name, limit):
+        """빈 슬롯의 파일 디스크립터, 모두 사용 중이면 None"""
+        start = random.randrange(limit)
+        for offset in range(limit):
+            path = os.path.join(self.directory, f"{name}.{(start + offset) % limit}.slot")
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return fd
+            except BlockingIOError:
+                os.close(fd)
+        return None
+
+    @staticmethod
+    def release(fd):
+        os.close(fd)  # 닫으면 flock도 풀림
+
+
+class Controller:
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.pid = os.getpid()
+        self.buckets = BucketStore(os.path.join(directory, "buckets.sqlite3"))
+        self.slots = SlotPool(directory)
+
+
+_controller = None
+_controller_lock = threading.Lock()
+
+
+def get_controller(config):
+    """현재 워커의 Controller (fork 이후에는 새로 생성)"""
+    global _controller
+    if _controller is None or _controller.pid != os.getpid():
+        with _controller_lock:
+            if _controller is None or _controller.pid != os.getpid():
+                _controller = Controller(config["ADMISSION_DIR"])
+    return _controller
+
+
+def pool_usage(config):
+    """현재 워커의 DB 커넥션 사용률 (0 ~ 1), 풀 크기를 알 수 없으면 None"""
+    options = config.get("SQLALCHEMY_ENGINE_OPTIONS") or {}
+    if "pool_size" not in options:
+        return None
+    capacity = options["pool_size"] + options.get("max_overflow", 0)
+    checkedout = getattr(db.engine.pool, "checkedout", None)
+    return checkedout() / capacity if checkedout and capacity else None
+
+
+def _discard_body():
+    """
+    읽지 않은 요청 본문을 REJECT_DRAIN_BYTES까지만 조금씩 읽어 버림 (keep-alive 연결의 다음 요청이 깨지지 않도록)
+    그보다 크면 읽지 않고 False 반환 → 응답에 Connection: close
+    (gunicorn은 앱의 Connection 헤더 대신, 남은 본문을 자체 상한까지 버리고 넘으면 연결을 닫음)
+    """
+    length = request.content_length
+    if length is not None and length > REJECT_DRAIN_BYTES:
+        return False
+    remaining = REJECT_DRAIN_BYTES
+    while remaining > 0:
+        chunk = request.stream.read(min(DRAIN_CHUNK_BYTES, remaining))
+        if not chunk:
+            return True
+        remaining -= len(chunk)
+    return not request.stream.read(1)
+
+
+def reject(status, retry_after, message):
+    """바로 거절하는 응답 (클라이언트가 Retry-After 이후 다시 시도)"""
+    drained = _discard_body()
+    response = jsonify({"message": message})
+    if not drained:
+        response.headers["Connection"] = "close"
+    response.status_code = status
+    response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def limit(name):
+    """
+    경로별 유입 제어 데코레이터 (설정은 ADMISSION_LIMITS[name])
+    1) 우선순위: 워커의 DB 커넥션 사용률이 ADMISSION_SHED_AT[priority] 이상이면 503 (조회 요청용 커넥션 확보)
+    2) 토큰 버킷: 전체 / 클라이언트 IP별 초당 요청 수를 넘으면 429
+    3) 동시 처리 수: 모든 워커 합계가 concurrency에 도달하면 503
+    대기열에 쌓지 않고 바로 거절하므로 커넥션 풀 대기(pool_timeout) 후 500이 나는 일이 없음
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            config = current_app.config
+            if not config["ADMISSION_ENABLED"]:
+                return view(*args, **kwargs)
+            settings = config["ADMISSION_LIMITS"][name]
+            controller = get_controller(config)
+
+            shed_at = config["ADMISSION_SHED_AT"].get(settings.get("priority"))
+            usage = pool_usage(config) if shed_at is not None else None
+            if usage is not None and usage >= shed_at:
+                return reject(503, 1, "서버가 혼잡합니다. 잠시 후 다시 시도해 주세요.")
+
+            buckets = []
+            if settings.get("rate"):
+                buckets.append((name, settings["rate"], settings["burst"]))
+            if settings.get("ip_rate"):
+                buckets.append((f"{name}:{request.remote_addr}", settings["ip_rate"], settings["ip_burst"]))
+            wait = controller.buckets.take(buckets) if buckets else 0
+            if wait:
+                return reject(429, wait, "요청이 너무 많습니다. 잠시 후 다시 시도해 주세요.")
+
+            slot = controller.slots.acquire(name, settings["concurrency"])
+            if slot is None:
+                return reject(503, 1, "서버가 혼잡합니다. 잠시 후 다시 시도해 주세요.")
+            try:
+                response = current_app.make_response(view(*args, **kwargs))
+            except BaseException:
+                controller.slots.release(slot)
+                raise
+            # 스트리밍 응답(이미지 중계)은 전송이 끝날 때까지 슬롯 유지
+            response.call_on_close(lambda: controller.slots.release(slot))
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def init_app(app):
+    """
+    커넥션 풀 대기 시간 초과와 DB 잠금 / 연결 오류(OperationalError)를 500 대신 503 + Retry-After로 응답
+    (답변 스풀과 같이 일시적인 오류로 보고 클라이언트가 다시 시도)
+    """
+
+    @app.errorhandler(PoolTimeoutError)
+    def pool_timeout(error):
+        return reject(503, 1, "서버가 혼잡합니다. 잠시 후 다시 시도해 주세요.")
+
+    @app.errorhandler(OperationalError)
+    def database_unavailable(error):
+        current_app.logger.warning("database unavailable: %s", error.orig or error)
+        return reject(503, 1, "서버가 혼잡합니다. 잠시 후 다시 시도해 주세요.")
@@ -0,0 +1,329 @@
+import csv
+import gzip
+import os
+import re
+import tempfile
+from datetime import datetime
+from importlib.util import find_spec
+
+from sqlalchemy import delete, func, insert, select, text
+
+from config import db
+from app import answer_stats
+from app.models import KST, Answer, AnswerArchive, AnswerPeriod, AnswerPeriodStat, Question, User
+
+# 선택 의존성 pyarrow (있으면 Parquet, 없으면 CSV + gzip)
+# 불러오는 데 시간이 걸리므로 설치 여부만 확인하고 Parquet 파일을 읽고 쓸 때 불러옴
+HAS_PYARROW = find_spec("pyarrow") is not None
+
+# 보관 파일 컬럼 (answers 테이블 그대로, 리포트용 조인은 users / choices / questions와)
+COLUMNS = ("id", "user_id", "question_id", "choice_id", "created_at", "updated_at")
+PERIOD_PATTERN = re.compile(r"^(\d{4})-(0[1-9]|1[0-2])$")
+
+
+def period_range(period):
+    """'YYYY-MM' 기간의 created_at 범위 [시작, 끝) (KST 기준 naive datetime), 잘못된 값이면 ValueError"""
+    match = PERIOD_PATTERN.match(period or "")
+    if not match:
+        raise ValueError(f"유효하지 않은 기간입니다 (YYYY-MM): {period}")
+    year, month = int(match.group(1)), int(match.group(2))
+    start = datetime(year, month, 1)
+    end = datetime(year + month // 12, month % 12 + 1, 1)
+    return start, end
+
+
+def _period_of(value):
+    return f"{value.year:04d}-{value.month:02d}"
+
+
+def current_period():
+    """지금(KST)이 속한 기간, 이 기간과 이후 기간은 아직 닫히지 않음"""
+    return _period_of(datetime.now(tz=KST))
+
+
+def closed_periods():
+    """answers에 답변이 남아 있는 닫힌 기간 목록 (created_at 인덱스로 기간마다 존재 여부만 확인)"""
+    current_start, _ = period_range(current_period())
+    oldest = db.session.execute(
+        select(func.min(Answer.created_at)).where(Answer.created_at < current_start)
+    ).scalar()
+    periods = []
+    while oldest is not None and oldest < current_start:
+        period = _period_of(oldest)
+        start, end = period_range(period)
+        if db.session.execute(
+            select(Answer.id).where(Answer.created_at >= start, Answer.created_at < end).limit(1)
+        ).first():
+            periods.append(period)
+        oldest = end
+    return periods
+
+
+def archived_questions(question_ids):
+    """보관한 기간에 답변이 있는 질문 id 집합 (answers에서 옮겨져 중복 검사에 보이지 않으므로 새 답변을 받지 않음)"""
+    return set(db.session.execute(
+        select(AnswerPeriodStat.question_id).where(AnswerPeriodStat.question_id.in_(question_ids)).distinct()
+    ).scalars())
+
+
+def _active_questions(start, end):
+    """기간의 답변이 가리키는 활성 질문 id 목록"""
+    return db.session.execute(
+        select(Answer.question_id).join(Question, Question.id == Answer.question_id)
+        .where(Answer.created_at >= start, Answer.created_at < end, Question.is_active.is_(True))
+        .distinct()
+        .order_by(Answer.question_id)
+    ).scalars().all()
+
+
+def archive_format(config):
+    """ANSWER_ARCHIVE_FORMAT이 auto면 pyarrow가 있을 때 parquet, 없으면 csv.gz"""
+    output_format = config["ANSWER_ARCHIVE_FORMAT"]
+    if output_format == "auto":
+        return "parquet" if HAS_PYARROW else "csv.gz"
+    if output_format == "parquet" and not HAS_PYARROW:
+        raise RuntimeError("parquet 형식에는 pyarrow가 필요합니다.")
+    return output_format
+
+
+class _CsvWriter:
+    """CSV + gzip 보관 파일 (헤더 한 줄, 시각은 ISO 8601, NULL은 빈 칸)"""
+
+    def __init__(self, path):
+        self.file = gzip.open(path, "wt", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(COLUMNS)
+
+    def write(self, rows):
+        self.writer.writerows(
+            [value.isoformat() if isinstance(value, datetime) else value for value in row] for row in rows
+        )
+
+    def close(self):
+        self.file.close()
+
+
+class _ParquetWriter:
+    """Parquet 보관 파일 (행 묶음마다 row group 하나, zstd 압축)"""
+
+    def __init__(self, path):
+        import pyarrow
+        import pyarrow.parquet
+
+        self.pyarrow = pyarrow
+        self.schema = pyarrow.schema([
+            ("id", pyarrow.int64()),
+            ("user_id", pyarrow.int64()),
+            ("question_id", pyarrow.int64()),
+            ("choice_id", pyarrow.int64()),
+            ("created_at", pyarrow.timestamp("us")),
+            ("updated_at", pyarrow.timestamp("us")),
+        ])
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.schema, compression="zstd")
+
+    def write(self, rows):
+        columns = list(zip(*rows))
+        self.writer.write_table(self.pyarrow.table(
+            {name: list(values) for name, values in zip(COLUMNS, columns)}, schema=self.schema
+        ))
+
+    def close(self):
+        self.writer.close()
+
+
+def read_file(path, batch_rows):
+    """보관 파일을 batch_rows개씩 {컬럼: 값} 리스트로 읽음 (형식은 확장자로 구분)"""
+    if path.endswith(".parquet"):
+        if not HAS_PYARROW:
+            raise RuntimeError("parquet 파일을 읽으려면 pyarrow가 필요합니다.")
+        import pyarrow.parquet
+
+        for batch in pyarrow.parquet.ParquetFile(path).iter_batches(batch_size=batch_rows):
+            yield batch.to_pylist()
+        return
+
+    with gzip.open(path, "rt", newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        rows = []
+        for record in reader:
+            rows.append({
+                "id": int(record["id"]),
+                "user_id": int(record["user_id"]),
+                "question_id": int(record["question_id"]) if record["question_id"] else None,
+                "choice_id": int(record["choice_id"]),
+                "created_at": datetime.fromisoformat(record["created_at"]),
+                "updated_at": datetime.fromisoformat(record["updated_at"]),
+            })
+            if len(rows) >= batch_rows:
+                yield rows
+                rows = []
+        if rows:
+            yield rows
+
+
+def _write_file(config, period, start, end, max_id):
+    """
+    기간의 답변(id <= max_id)을 서버 측 커서로 읽어 임시 파일에 쓴 뒤 이름 변경
+    반환: (파일 이름, 행 수)
+    """
+    directory = config["ANSWER_ARCHIVE_DIR"]
+    os.makedirs(directory, exist_ok=True)
+    output_format = archive_format(config)
+    file_name = f"answers-{period}.{output_format}"
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+
+    writer = _ParquetWriter(tmp_path) if output_format == "parquet" else _CsvWriter(tmp_path)
+    count = 0
+    try:
+        result = db.session.execute(
+            select(Answer.id, Answer.user_id, Answer.question_id, Answer.choice_id, Answer.created_at, Answer.updated_at)
+            .where(Answer.created_at >= start, Answer.created_at < end, Answer.id <= max_id)
+            .execution_options(yield_per=config["ANSWER_ARCHIVE_BATCH_ROWS"])
+        )
+        for rows in result.partitions():
+            writer.write(rows)
+            count += len(rows)
+        writer.close()
+        with open(tmp_path, "rb") as f:
+            os.fsync(f.fileno())  # answers에서 지우기 전에 디스크에 기록
+        os.replace(tmp_path, os.path.join(directory, file_name))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    db.session.commit()  # 읽기 트랜잭션 종료
+    return file_name, count
+
+
+def archive(config, period, log=print):
+    """
+    닫힌 기간의 답변을 보관 파일로 옮기고 answers에서 삭제
+    결과 집계(answer_stats)는 그대로 두어 /results는 보관한 기간도 포함, 삭제한 답변 수는 answer_period_stats에 기록
+    기간의 답변이 가리키는 질문이 모두 비활성이어야 함 (보관한 질문은 이후 새 답변을 받지 않고 진행 상황에도 나오지 않음)
+    1) 파일 저장 후 answer_periods에 archiving으로 기록  2) 묶음 단위로 삭제 + 기간 집계 반영 커밋  3) archived
+    중간에 멈추면 다시 실행했을 때 저장된 파일은 그대로 두고 삭제부터 이어서 진행
+    반환: 보관한 답변 수
+    """
+    start, end = period_range(period)
+    if period >= current_period():
+        raise ValueError(f"아직 닫히지 않은 기간입니다: {period}")
+
+    record = AnswerPeriod.query.filter_by(period=period).first()
+    if record is not None and record.status == "archived":
+        log(f"{period}: already archived ({record.row_count} answers, {record.file})")
+        return 0
+
+    if record is None:
+        active = _active_questions(start, end)
+        if active:
+            raise ValueError(
+                f"{period}: 활성 질문의 답변이 있어 보관할 수 없습니다 "
+                f"(question_id: {', '.join(map(str, active))}). 질문을 비활성화한 뒤 다시 실행하세요."
+            )
+        max_id = db.session.execute(
+            select(func.max(Answer.id)).where(Answer.created_at >= start, Answer.created_at < end)
+        ).scalar()
+        if max_id is None:
+            log(f"{period}: no answers")
+            return 0
+        file_name, count = _write_file(config, period, start, end, max_id)
+        record = AnswerPeriod(
+            period=period, status="archiving", file=file_name, row_count=count, max_answer_id=max_id
+        )
+        db.session.add(record)
+        db.session.commit()
+        log(f"{period}: wrote {count} answers to {file_name}")
+
+    # 보관한 답변을 묶음 단위로 삭제 (한 트랜잭션이 너무 길어지지 않도록), 기간 집계도 같은 트랜잭션에서 더함
+    deleted = 0
+    batch_rows = config["ANSWER_ARCHIVE_BATCH_ROWS"]
+    while True:
+        rows = db.session.execute(
+            select(Answer.id, Answer.question_id, Answer.choice_id, User.age, User.gender)
+            .outerjoin(User, User.id == Answer.user_id)
+            .where(Answer.created_at >= start, Answer.created_at < end, Answer.id <= record.max_answer_id)
+            .limit(batch_rows)
+        ).all()
+        if not rows:
+            break
+        db.session.execute(delete(Answer).where(Answer.id.in_([row.id for row in rows])))
+        answer_stats.add_archived(period, answer_stats.count([row._mapping for row in rows if row.age is not None]))
+        db.session.commit()
+        deleted += len(rows)
+
+    record.status = "archived"
+    db.session.commit()
+    log(f"{period}: removed {deleted} answers from answers")
+
+    late = db.session.execute(
+        select(func.count()).select_from(Answer).where(Answer.created_at >= start, Answer.created_at < end)
+    ).scalar()
+    if late:
+        log(f"{period}: {late} answers were added after archiving started and remain in answers")
+    return record.row_count
+
+
+def _partition_name(period):
+    return "p" + period.replace("-", "_")
+
+
+def _partitions():
+    """
+    answers_archive의 파티션 이름 목록, 파티션을 쓰지 않으면 None
+    (MySQL에서 마이그레이션으로 만든 경우만 파티션 사용, create_all로 만든 테이블이나 SQLite는 None)
+    """
+    if db.session.get_bind(mapper=AnswerArchive).dialect.name != "mysql":
+        return None
+    names = set(db.session.execute(text(
+        "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'answers_archive'"
+    )).scalars())
+    names.discard(None)
+    return names or None
+
+
+def unload(period):
+    """answers_archive에서 기간 데이터 제거 (파티션이면 파티션 삭제, 아니면 DELETE)"""
+    period_range(period)
+    partitions = _partitions()
+    if partitions is None:
+        db.session.execute(delete(AnswerArchive).where(AnswerArchive.period == period))
+    elif _partition_name(period) in partitions:
+        db.session.execute(text(f"ALTER TABLE answers_archive DROP PARTITION {_partition_name(period)}"))
+    record = AnswerPeriod.query.filter_by(period=period).first()
+    if record is not None:
+        record.loaded_at = None
+    db.session.commit()
+
+
+def load(config, period):
+    """
+    보관 파일을 answers_archive에 다시 불러옴 (리포트용, 이미 불러온 기간은 교체)
+    MySQL은 기간마다 파티션 하나를 만들어 period 조건 조회 시 해당 파티션만 읽음
+    반환: 불러온 답변 수
+    """
+    record = AnswerPeriod.query.filter_by(period=period).first()
+    if record is None:
+        raise ValueError(f"보관되지 않은 기간입니다: {period}")
+    path = os.path.join(config["ANSWER_ARCHIVE_DIR"], record.file)
+    if not os.path.exists(path):
+        raise ValueError(f"보관 파일이 없습니다: {path}")
+
+    unload(period)
+    if _partitions() is not None:
+        db.session.execute(text(
+            f"ALTER TABLE answers_archive ADD PARTITION "
+            f"(PARTITION {_partition_name(period)} VALUES IN ('{period}'))"
+        ))
+
+    count = 0
+    for rows in read_file(path, config["ANSWER_ARCHIVE_BATCH_ROWS"]):
+        db.session.execute(insert(AnswerArchive), [{**row, "period": period} for row in rows])
+        db.session.commit()
+        count += len(rows)
+
+    record = AnswerPeriod.query.filter_by(period=period).first()
+    record.loaded_at = datetime.now(tz=KST)
+    db.session.commit()
+    return count
@@ -0,0 +1,234 @@
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import insert, literal, null, select, union_all
+
+from config import db
+from app import answer_stats
+from app.models import KST, Answer, AnswerPeriodStat, Choices, User
+from app.upsert import upsert
+
+
+def _to_id(value):
+    """양의 정수 id로 변환, 변환할 수 없으면 None"""
+    if isinstance(value, bool):
+        return None
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return None
+    return value if value > 0 else None
+
+
+def parse_items(items):
+    """
+    답변 목록 형식 검사 (DB 조회 없음)
+    반환: ((index, user_id, choice_id) 리스트, 항목별 오류 리스트)
+    """
+    parsed = []
+    errors = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append({"index": index, "msg": "Invalid data: item must be an object"})
+            continue
+        user_id = _to_id(item.get("userId"))
+        choice_id = _to_id(item.get("choiceId"))
+        if not user_id or not choice_id:
+            errors.append({"index": index, "msg": "Invalid data: userId and choiceId are required"})
+            continue
+        parsed.append((index, user_id, choice_id))
+    return parsed, errors
+
+
+def _lookup(user_ids, choice_ids, answered=True):
+    """
+    users / choices 존재 여부와 집계용 정보(나이, 성별, 질문 id)를 UNION ALL 한 번으로 조회
+    선택지의 질문 중 보관한 기간에 답변이 있는 질문도 함께 조회 (answers에서 옮겨져 중복 검사에 보이지 않으므로 새 답변을 받지 않음)
+    answered가 참이면 해당 유저들이 이미 답한 (user_id, question_id)도 함께 조회
+    반환: ({user_id: row}, {choice_id: question_id}, {(user_id, question_id)}, {보관한 question_id})
+    """
+    queries = [
+        select(
+            literal("user").label("kind"), User.id, User.age, User.gender,
+            null().label("question_id"),
+        ).where(User.id.in_(user_ids)),
+        select(
+            literal("choice").label("kind"), Choices.id, null(), null(), Choices.question_id,
+        ).where(Choices.id.in_(choice_ids)),
+        select(
+            literal("archived").label("kind"), null(), null(), null(), AnswerPeriodStat.question_id,
+        ).where(
+            AnswerPeriodStat.question_id.in_(select(Choices.question_id).where(Choices.id.in_(choice_ids)))
+        ).distinct(),
+    ]
+    if answered:
+        queries.append(
+            select(
+                literal("answer").label("kind"), Answer.user_id, null(), null(), Answer.question_id,
+            ).where(Answer.user_id.in_(user_ids))
+        )
+    found = db.session.execute(union_all(*queries)).all()
+    found_users = {row.id: row for row in found if row.kind == "user"}
+    found_choices = {row.id: row.question_id for row in found if row.kind == "choice"}
+    found_answers = {(row.id, row.question_id) for row in found if row.kind == "answer"}
+    archived = {row.question_id for row in found if row.kind == "archived"}
+    return found_users, found_choices, found_answers, archived
+
+
+def validate_items(items):
+    """
+    답변 목록 검증
+    형식 검사 후 참조된 모든 userId/choiceId의 존재 여부와 기존 답변을 한 번의 쿼리로 확인
+    유저당 질문 하나에 답변 하나만 허용 (이미 답한 질문, 요청 안에서 중복된 질문, 보관한 질문은 오류)
+    반환: (저장할 행 리스트, 항목별 오류 리스트)
+    """
+    parsed, errors = parse_items(items)
+    if not parsed:
+        return [], errors
+
+    found_users, found_choices, answered, archived = _lookup(
+        {user_id for _, user_id, _ in parsed},
+        {choice_id for _, _, choice_id in parsed},
+    )
+
+    rows = []
+    for index, user_id, choice_id in parsed:
+        if user_id not in found_users:
+            errors.append({"index": index, "msg": f"Not found user_id: {user_id}"})
+        elif choice_id not in found_choices:
+            errors.append({"index": index, "msg": f"Not found choice_id: {choice_id}"})
+        elif (user_id, found_choices[choice_id]) in answered:
+            errors.append({"index": index, "msg": f"Already answered question_id: {found_choices[choice_id]}"})
+        elif found_choices[choice_id] in archived:
+            errors.append({"index": index, "msg": f"Archived question_id: {found_choices[choice_id]}"})
+        else:
+            user = found_users[user_id]
+            question_id = found_choices[choice_id]
+            if question_id is not None:
+                answered.add((user_id, question_id))
+            rows.append({
+                "user_id": user_id,
+                "choice_id": choice_id,
+                "question_id": question_id,
+                "age": user.age,
+                "gender": user.gender,
+            })
+    errors.sort(key=lambda error: error["index"])
+    return rows, errors
+
+
+def insert_answers(rows):
+    """
+    검증된 답변 행을 다중 행 INSERT로 저장하고 결과 집계(answer_stats)도 함께 갱신
+    (커밋은 호출자가 담당하므로 두 변경은 같은 트랜잭션)
+    executemany로 넘기면 PyMySQL이 INSERT ... VALUES (...), (...) 한 문장으로 묶어 전송
+    """
+    if not rows:
+        return 0
+    now = datetime.now(tz=KST)
+    values = [
+        {
+            "user_id": row["user_id"],
+            "choice_id": row["choice_id"],
+            "question_id": row["question_id"],
+            "created_at": now,
+            "updated_at": now,
+        }
+        for row in rows
+    ]
+    db.session.execute(insert(Answer), values)
+    answer_stats.apply(answer_stats.count(rows))
+    return len(values)
+
+
+def replace_answers(user_id, items):
+    """
+    한 유저의 질문별 답변을 한 문장의 upsert로 교체 (없던 질문은 새로 추가)
+    (uq_answers_user_id_question_id 충돌 시 choice_id/updated_at만 갱신, 커밋은 호출자가 담당)
+    items: [{"choiceId": ...}] / 요청 안에서 같은 질문이 두 번 나오면 오류
+    반환: (결과 행 리스트, 항목별 오류 리스트), 유저가 없으면 (None, [])
+    결과 행은 다시 조회하지 않고 기존 값과 새로 쓴 값으로 구성
+    """
+    parsed = []
+    errors = []
+    for index, item in enumerate(items):
+        choice_id = _to_id(item.get("choiceId")) if isinstance(item, dict) else None
+        if not choice_id:
+            errors.append({"index": index, "msg": "Invalid data: choiceId is required"})
+            continue
+        parsed.append((index, choice_id))
+
+    found_users, found_choices, _, archived = _lookup(
+        {user_id}, {choice_id for _, choice_id in parsed}, answered=False
+    )
+    user = found_users.get(user_id)
+    if user is None:
+        return None, []
+
+    choices = {}
+    for index, choice_id in parsed:
+        question_id = found_choices.get(choice_id)
+        if choice_id not in found_choices:
+            errors.append({"index": index, "msg": f"Not found choice_id: {choice_id}"})
+        elif question_id is None:
+            errors.append({"index": index, "msg": f"Choice has no question: {choice_id}"})
+        elif question_id in archived:
+            errors.append({"index": index, "msg": f"Archived question_id: {question_id}"})
+        elif question_id in choices:
+            errors.append({"index": index, "msg": f"Duplicate question_id: {question_id}"})
+        else:
+            choices[question_id] = choice_id
+    errors.sort(key=lambda error: error["index"])
+    if not choices:
+        return [], errors
+
+    # 기존 답변을 잠그고 읽어 집계 증감과 결과 행 계산에 사용 (동시 수정 시 순서 보장)
+    existing = {
+        row.question_id: row
+        for row in db.session.execute(
+            select(Answer.question_id, Answer.choice_id, Answer.created_at, Answer.updated_at)
+            .where(Answer.user_id == user_id, Answer.question_id.in_(choices))
+            .order_by(Answer.question_id)
+            .with_for_update()
+        )
+    }
+
+    # DATETIME 컬럼 정밀도(초)에 맞춰 저장될 값 그대로 결과에 사용
+    now = datetime.now(tz=KST).replace(tzinfo=None, microsecond=0)
+    results = []
+    values = []
+    deltas = Counter()
+    for question_id in sorted(choices):
+        choice_id = choices[question_id]
+        old = existing.get(question_id)
+        if old is not None and old.choice_id == choice_id:
+            results.append({
+                "user_id": user_id, "question_id": question_id, "choice_id": choice_id,
+                "created_at": old.created_at, "updated_at": old.updated_at, "status": "unchanged",
+            })
+            continue
+        values.append({
+            "user_id": user_id, "question_id": question_id, "choice_id": choice_id,
+            "created_at": now, "updated_at": now,
+        })
+        deltas[(question_id, choice_id, user.age, user.gender)] += 1
+        if old is not None:
+            deltas[(question_id, old.choice_id, user.age, user.gender)] -= 1
+        results.append({
+            "user_id": user_id, "question_id": question_id, "choice_id": choice_id,
+            "created_at": old.created_at if old is not None else now, "updated_at": now,
+            "status": "updated" if old is not None else "created",
+        })
+
+    if values:
+        db.session.execute(upsert(
+            Answer,
+            values,
+            index_elements=["user_id", "question_id"],
+            update={
+                "choice_id": lambda inserted: inserted.choice_id,
+                "updated_at": lambda inserted: inserted.updated_at,
+            },
+        ))
+        answer_stats.apply(deltas)
+    return results, errors
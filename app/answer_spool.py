@@ -0,0 +1,427 @@
+import atexit
+import fcntl
+import glob
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError, OperationalError, TimeoutError as PoolTimeoutError
+
+from config import db
+from app.answer_ingest import insert_answers, validate_items
+from app.models import AnswerSpoolOffset, AnswerSubmission
+
+logger = logging.getLogger(__name__)
+
+ORPHAN_SCAN_INTERVAL = 30  # 종료된 워커가 남긴 스풀 파일을 찾는 주기(초)
+ROTATE_BYTES = 64 * 1024 * 1024  # 모두 반영된 스풀 파일이 이 크기를 넘으면 새 파일로 교체
+RETRY_DELAY = 5  # DB 반영 실패 시 다시 시도하기까지 대기 시간(초)
+PARKED_DIR = "parked"  # 계속 실패한 기록 묶음을 옮겨 두는 하위 디렉토리 (NDJSON, 수동 확인용)
+
+
+class AnswerSpool:
+    """
+    워커 프로세스별 답변 스풀 (append-only 파일 + 백그라운드 일괄 저장)
+
+    요청 스레드는 스풀 파일 끝에 한 줄(JSON)을 기록하고 바로 응답한다.
+    백그라운드 스레드가 쌓인 기록을 큰 묶음으로 answers 테이블에 저장하고,
+    같은 트랜잭션에서 파일의 반영 위치(answer_spool_offsets)를 갱신하므로
+    재시작 후 다시 읽어도 중복 저장되지 않는다.
+    각 워커는 자기 스풀 파일에 flock을 잡고 있어, 잠글 수 있는 파일은
+    종료된 워커가 남긴 것으로 보고 다른 워커가 이어서 반영한다.
+    """
+
+    def __init__(self, app):
+        config = app.config
+        self.app = app
+        self.pid = os.getpid()
+        self.directory = config["ANSWER_SPOOL_DIR"]
+        self.flush_rows = config["ANSWER_SPOOL_FLUSH_ROWS"]
+        self.flush_interval = config["ANSWER_SPOOL_FLUSH_INTERVAL"]
+        self.fsync = config["ANSWER_SPOOL_FSYNC"]
+        self.max_attempts = config["ANSWER_SPOOL_MAX_ATTEMPTS"]
+
+        self.lock = threading.Lock()
+        self.drain_lock = threading.Lock()  # 같은 파일을 두 스레드가 동시에 반영하지 않도록
+        self.wakeup = threading.Condition(self.lock)
+        self.pending_rows = 0  # 아직 반영되지 않은 답변 수 (이 워커 기준)
+        self.oldest_pending = None  # 반영되지 않은 가장 오래된 기록 시각
+        self.last_flush_at = None
+        self.flushed_rows = 0
+        self.failures = {}  # (스풀 이름, 반영 위치) -> 연속 실패 횟수
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._open_file()
+        self.thread = threading.Thread(target=self._run, name="answer-spool", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def _open_file(self):
+        """이 워커 전용 스풀 파일 생성 (이름은 재사용되지 않음)"""
+        self.name = f"{self.pid}-{secrets.token_hex(4)}.spool"
+        self.path = os.path.join(self.directory, self.name)
+        self.fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        fcntl.flock(self.fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        self.total_records = 0  # 이 파일에 기록한 누적 기록 / 답변 수 (각 줄에 함께 기록)
+        self.total_rows = 0
+
+    def append(self, items, key=None):
+        """답변 묶음 하나를 스풀 파일에 기록 (fsync 후 반환)"""
+        now = time.time()
+        with self.lock:
+            # 누적 수(records / rows)를 함께 기록하여 상태 조회 시 파일 전체를 읽지 않고 대기 수 계산
+            self.total_records += 1
+            self.total_rows += len(items)
+            line = json.dumps({
+                "ts": now, "key": key, "items": items, "records": self.total_records, "rows": self.total_rows,
+            }).encode("utf-8") + b"\n"
+            view = memoryview(line)
+            while view:
+                view = view[os.write(self.fd, view):]
+            if self.fsync:
+                os.fsync(self.fd)
+            self.pending_rows += len(items)
+            if self.oldest_pending is None:
+                self.oldest_pending = now
+            if self.pending_rows >= self.flush_rows:
+                self.wakeup.notify()
+
+    def _due(self):
+        if self.pending_rows >= self.flush_rows:
+            return True
+        return self.oldest_pending is not None and time.time() - self.oldest_pending >= self.flush_interval
+
+    def _run(self):
+        """백그라운드 저장 루프: 크기 또는 지연 시간 기준을 넘으면 반영"""
+        next_orphan_scan = 0
+        while True:
+            if time.monotonic() >= next_orphan_scan:
+                self._safe(self._drain_orphans)
+                next_orphan_scan = time.monotonic() + ORPHAN_SCAN_INTERVAL
+
+            with self.lock:
+                if not self._due():
+                    if self.oldest_pending is None:
+                        timeout = ORPHAN_SCAN_INTERVAL
+                    else:
+                        timeout = self.flush_interval - (time.time() - self.oldest_pending)
+                    self.wakeup.wait(max(timeout, 0.01))
+                    continue
+                self.pending_rows = 0
+                self.oldest_pending = None
+
+            if not self._safe(self.flush):
+                with self.lock:
+                    # 실패한 기록은 파일에 남아 있으므로 잠시 후 다시 시도
+                    self.oldest_pending = time.time() - self.flush_interval + RETRY_DELAY
+
+    def _safe(self, fn):
+        try:
+            with self.app.app_context():
+                fn()
+            return True
+        except Exception:
+            logger.exception("answer spool flush failed")
+            return False
+
+    def flush(self):
+        """이 워커의 스풀 파일을 끝까지 반영하고, 충분히 커졌으면 새 파일로 교체"""
+        with self.drain_lock:
+            position = self._drain(self.path, self.name)
+            with self.lock:
+                rotate = position >= ROTATE_BYTES and os.fstat(self.fd).st_size == position
+                if rotate:
+                    old_name, old_path, old_fd = self.name, self.path, self.fd
+                    self._open_file()
+                    os.unlink(old_path)
+                    os.close(old_fd)
+            if rotate:
+                self._forget(old_name)
+
+    def close(self):
+        """프로세스 종료 시 남은 기록 반영 시도 (실패해도 다음 시작 때 다시 반영됨)"""
+        if os.getpid() == self.pid:
+            self._safe(self.flush)
+
+    def _drain(self, path, name):
+        """스풀 파일의 반영 위치부터 끝까지 flush_rows 단위로 저장, 마지막 위치 반환"""
+        position = db.session.execute(
+            select(AnswerSpoolOffset.position).where(AnswerSpoolOffset.spool_name == name)
+        ).scalar() or 0
+        with open(path, "rb") as f:
+            f.seek(position)
+            while True:
+                records, end = _read_batch(f, self.flush_rows)
+                if not records:
+                    return position
+                try:
+                    try:
+                        self._store(name, records, end)
+                    except IntegrityError:
+                        # 같은 유저의 같은 질문 답변이 동시에 저장된 경우, 다시 검증하면 이미 답한 항목으로 걸러짐
+                        db.session.rollback()
+                        self._store(name, records, end)
+                except (OperationalError, PoolTimeoutError):
+                    raise  # DB 연결 장애는 복구될 때까지 계속 재시도
+                except Exception:
+                    # 같은 묶음이 max_attempts번 연속 실패하면 따로 옮겨 두고 다음 기록부터 반영
+                    db.session.rollback()
+                    attempts = self.failures.get((name, position), 0) + 1
+                    if attempts < self.max_attempts:
+                        self.failures[(name, position)] = attempts
+                        raise
+                    logger.exception("answer spool %s: parking batch at byte %d after %d attempts", name, position, attempts)
+                    self._park(name, position, records, end)
+                self.failures.pop((name, position), None)
+                position = end
+
+    def _park(self, name, position, records, end):
+        """실패한 기록 묶음을 parked 디렉토리에 저장하고 반영 위치를 묶음 끝으로 옮김"""
+        directory = os.path.join(self.directory, PARKED_DIR)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{name}-{position}.ndjson"), "wb") as f:
+            for record in records:
+                f.write(json.dumps(record).encode("utf-8") + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._set_position(name, end)
+        db.session.commit()
+
+    def _set_position(self, name, position):
+        offset = AnswerSpoolOffset.query.filter_by(spool_name=name).first()
+        if offset is None:
+            db.session.add(AnswerSpoolOffset(spool_name=name, position=position))
+        else:
+            offset.position = position
+
+    def _store(self, name, records, position):
+        """기록 묶음을 한 트랜잭션으로 answers에 저장하고 반영 위치 갱신"""
+        # 클라이언트 Idempotency-Key가 이미 처리된 기록은 건너뜀
+        keys = {record["key"] for record in records if record.get("key")}
+        done = set()
+        if keys:
+            done = set(db.session.execute(
+                select(AnswerSubmission.idempotency_key).where(AnswerSubmission.idempotency_key.in_(keys))
+            ).scalars())
+
+        items = []
+        owners = []
+        for record in records:
+            key = record.get("key")
+            if key:
+                if key in done:
+                    continue
+                done.add(key)
+            owners.append((key, len(items), len(items) + len(record["items"])))
+            items.extend(record["items"])
+
+        rows, errors = validate_items(items)
+        created = insert_answers(rows)
+        for key, start, end in owners:
+            if key:
+                record_errors = [
+                    {"index": error["index"] - start, "msg": error["msg"]}
+                    for error in errors
+                    if start <= error["index"] < end
+                ]
+                db.session.add(AnswerSubmission(idempotency_key=key, result={
+                    "msg": "Successfully created answers.",
+                    "created": end - start - len(record_errors),
+                    "errors": record_errors,
+                }))
+
+        self._set_position(name, position)
+        db.session.commit()
+
+        if errors:
+            logger.warning("answer spool %s: dropped %d invalid answers", name, len(errors))
+        self.last_flush_at = time.time()
+        self.flushed_rows += created
+
+    def _drain_orphans(self):
+        """잠금이 풀린 (종료된 워커의) 스풀 파일을 끝까지 반영한 뒤 삭제"""
+        for path in glob.glob(os.path.join(self.directory, "*.spool")):
+            name = os.path.basename(path)
+            if name == self.name:
+                continue
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except FileNotFoundError:
+                continue
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue  # 살아 있는 워커의 파일
+            try:
+                if not os.path.exists(path):
+                    continue  # 잠금을 얻기 전에 다른 워커가 처리 완료
+                with self.drain_lock:
+                    self._drain(path, name)
+                os.unlink(path)
+                self._forget(name)
+            finally:
+                os.close(fd)
+
+    def _forget(self, name):
+        db.session.execute(delete(AnswerSpoolOffset).where(AnswerSpoolOffset.spool_name == name))
+        db.session.commit()
+
+
+def _read_batch(f, max_rows):
+    """
+    완전한 줄만 읽어 기록 리스트와 다음 읽기 위치 반환
+    쓰다 만 마지막 줄(개행 없음)은 남겨 둠
+    """
+    records = []
+    rows = 0
+    end = f.tell()
+    while rows < max_rows:
+        line = f.readline()
+        if not line.endswith(b"\n"):
+            break
+        end = f.tell()
+        try:
+            record = json.loads(line)
+        except ValueError:
+            logger.warning("answer spool: skipped unreadable record at byte %d", end - len(line))
+            continue
+        records.append(record)
+        rows += len(record["items"])
+    f.seek(end)
+    return records, end
+
+
+_spool = None
+_spool_lock = threading.Lock()
+
+
+def get_spool(app):
+    """현재 워커 프로세스의 스풀 반환 (없거나 fork 이후면 새로 생성)"""
+    global _spool
+    if _spool is None or _spool.pid != os.getpid():
+        with _spool_lock:
+            if _spool is None or _spool.pid != os.getpid():
+                _spool = AnswerSpool(app)
+    return _spool
+
+
+def init_app(app):
+    """
+    스풀 모드일 때 워커가 첫 요청을 받으면 스풀과 백그라운드 저장 스레드를 시작
+    (fork 이전에는 파일/스레드를 만들지 않음, 시작 시 남은 스풀 파일도 다시 반영)
+    """
+    if app.config["ANSWER_INGEST_MODE"] != "spool":
+        return
+
+    @app.before_request
+    def start_answer_spool():
+        get_spool(app)
+
+
+def _record_at(f, start):
+    """start 위치에서 시작하는 완전한 한 줄의 기록, 없거나 읽을 수 없으면 None"""
+    f.seek(start)
+    line = f.readline()
+    if not line.endswith(b"\n"):
+        return None
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+def _line_end_before(f, end):
+    """end 앞에서 마지막 개행 다음 위치 (= 완전한 줄의 끝), 뒤에서부터 필요한 만큼만 읽음"""
+    position = end
+    while position > 0:
+        step = min(position, 64 * 1024)
+        f.seek(position - step)
+        chunk = f.read(step)
+        newline = chunk.rfind(b"\n")
+        if newline >= 0:
+            return position - step + newline + 1
+        position -= step
+    return 0
+
+
+def _totals_before(f, end):
+    """end 위치까지 기록된 누적 (기록 수, 답변 수), 누적 값이 없는 줄이면 None"""
+    if end == 0:
+        return 0, 0
+    record = _record_at(f, _line_end_before(f, end - 1))  # end 바로 앞 줄
+    if record is None or "records" not in record:
+        return None
+    return record["records"], record["rows"]
+
+
+def _scan_pending(f, position):
+    """누적 값이 없는 (이전 형식) 파일은 남은 줄을 모두 읽어서 계산"""
+    pending_records = pending_rows = 0
+    f.seek(position)
+    for line in f:
+        if not line.endswith(b"\n"):
+            break
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        pending_records += 1
+        pending_rows += len(record["items"])
+    return pending_records, pending_rows
+
+
+def status(config):
+    """
+    모든 워커의 스풀 상태 (큐 깊이, 반영 지연, 따로 옮겨 둔 실패 묶음 수)
+    파일 크기와 DB의 반영 위치를 비교해 계산하므로 어느 워커에서 호출해도 같은 결과
+    대기 수는 반영 위치 앞 줄과 마지막 줄의 누적 값 차이로 계산 (파일 크기와 무관하게 줄 몇 개만 읽음)
+    """
+    directory = config["ANSWER_SPOOL_DIR"]
+    paths = sorted(glob.glob(os.path.join(directory, "*.spool")))
+    names = [os.path.basename(path) for path in paths]
+    positions = dict(db.session.execute(
+        select(AnswerSpoolOffset.spool_name, AnswerSpoolOffset.position)
+        .where(AnswerSpoolOffset.spool_name.in_(names))
+    ).all()) if names else {}
+
+    now = time.time()
+    files = []
+    for path, name in zip(paths, names):
+        position = positions.get(name, 0)
+        pending_records = pending_rows = 0
+        oldest = None
+        try:
+            with open(path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                end = _line_end_before(f, size)  # 쓰는 중인 마지막 줄 제외
+                if end > position:
+                    first = _record_at(f, position)
+                    oldest = first["ts"] if first else None
+                    done, last = _totals_before(f, position), _totals_before(f, end)
+                    if done is not None and last is not None:
+                        pending_records, pending_rows = last[0] - done[0], last[1] - done[1]
+                    else:
+                        pending_records, pending_rows = _scan_pending(f, position)
+        except FileNotFoundError:
+            continue
+        files.append({
+            "name": name,
+            "pending_bytes": size - position,
+            "pending_records": pending_records,
+            "pending_rows": pending_rows,
+            "lag_seconds": round(now - oldest, 3) if oldest else 0,
+        })
+
+    return {
+        "mode": config["ANSWER_INGEST_MODE"],
+        "queue_depth": sum(item["pending_rows"] for item in files),
+        "pending_records": sum(item["pending_records"] for item in files),
+        "flush_lag_seconds": max((item["lag_seconds"] for item in files), default=0),
+        "parked_batches": len(glob.glob(os.path.join(directory, PARKED_DIR, "*.ndjson"))),
+        "spools": files,
+    }
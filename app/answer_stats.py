@@ -0,0 +1,184 @@
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import delete, func, insert, select
+
+from config import db
+from app.models import KST, Answer, AnswerPeriodStat, AnswerStat, Choices, User
+from app.upsert import upsert
+
+
+def count(rows, sign=1):
+    """
+    답변 행 목록을 (question_id, choice_id, age, gender)별 증감 수로 집계
+    rows의 각 항목에는 question_id, choice_id, age, gender가 있어야 함
+    """
+    deltas = Counter()
+    for row in rows:
+        deltas[(row["question_id"], row["choice_id"], row["age"], row["gender"])] += sign
+    return deltas
+
+
+def apply(deltas):
+    """
+    집계 테이블에 증감 반영 (커밋은 호출자가 담당, 답변 저장과 같은 트랜잭션)
+    동시 요청 간 잠금 순서를 맞추기 위해 키 순서대로 정렬해서 반영
+    반영한 행은 version을 1씩 올림 (sum(version)이 매번 커지므로 같은 초 안의 변경도 결과 ETag에 드러남)
+    """
+    now = datetime.now(tz=KST)
+    rows = [
+        {
+            "question_id": question_id,
+            "choice_id": choice_id,
+            "age": age,
+            "gender": gender,
+            "count": delta,
+            "version": 1,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for (question_id, choice_id, age, gender), delta in sorted(
+            deltas.items(), key=lambda item: (item[0][1], item[0][2].value, item[0][3].value)
+        )
+        if delta
+    ]
+    if not rows:
+        return
+    db.session.execute(upsert(
+        AnswerStat,
+        rows,
+        index_elements=["choice_id", "age", "gender"],
+        update={
+            "count": lambda inserted: AnswerStat.count + inserted.count,
+            "version": lambda inserted: AnswerStat.version + 1,
+            "updated_at": lambda inserted: inserted.updated_at,
+        },
+    ))
+
+
+def add_archived(period, deltas):
+    """
+    보관하는 답변 수를 기간별 집계(answer_period_stats)에 더함 (커밋은 호출자가 담당, answers 삭제와 같은 트랜잭션)
+    answer_stats는 그대로 두므로 결과 조회는 보관한 기간도 포함, 집계를 다시 계산할 때 이 값을 더함
+    """
+    now = datetime.now(tz=KST)
+    rows = [
+        {
+            "period": period,
+            "question_id": question_id,
+            "choice_id": choice_id,
+            "age": age,
+            "gender": gender,
+            "count": delta,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for (question_id, choice_id, age, gender), delta in sorted(
+            deltas.items(), key=lambda item: (item[0][1], item[0][2].value, item[0][3].value)
+        )
+        if delta
+    ]
+    if not rows:
+        return
+    db.session.execute(upsert(
+        AnswerPeriodStat,
+        rows,
+        index_elements=["period", "choice_id", "age", "gender"],
+        update={
+            "count": lambda inserted: AnswerPeriodStat.count + inserted.count,
+            "updated_at": lambda inserted: inserted.updated_at,
+        },
+    ))
+
+
+def describe(pairs):
+    """
+    (user_id, choice_id) 쌍에 집계 키 정보(question_id, age, gender)를 붙여 반환
+    존재하지 않는 user/choice가 포함된 쌍은 제외
+    """
+    user_ids = {user_id for user_id, _ in pairs}
+    choice_ids = {choice_id for _, choice_id in pairs}
+    users = {
+        row.id: row
+        for row in db.session.execute(select(User.id, User.age, User.gender).where(User.id.in_(user_ids)))
+    }
+    questions = dict(db.session.execute(
+        select(Choices.id, Choices.question_id).where(Choices.id.in_(choice_ids))
+    ).all())
+    return [
+        {
+            "user_id": user_id,
+            "choice_id": choice_id,
+            "question_id": questions[choice_id],
+            "age": users[user_id].age,
+            "gender": users[user_id].gender,
+        }
+        for user_id, choice_id in pairs
+        if user_id in users and choice_id in questions
+    ]
+
+
+def live_counts():
+    """
+    answers → users → choices 조인으로 집계 테이블 내용을 처음부터 다시 계산
+    answers에서 옮긴 기간의 답변 수는 answer_period_stats에서 더함 (삭제된 선택지는 제외)
+    """
+    stmt = (
+        select(Choices.question_id, Answer.choice_id, User.age, User.gender, func.count())
+        .select_from(Answer)
+        .join(User, User.id == Answer.user_id)
+        .join(Choices, Choices.id == Answer.choice_id)
+        .group_by(Choices.question_id, Answer.choice_id, User.age, User.gender)
+    )
+    archived = (
+        select(Choices.question_id, AnswerPeriodStat.choice_id, AnswerPeriodStat.age, AnswerPeriodStat.gender,
+               func.sum(AnswerPeriodStat.count))
+        .join(Choices, Choices.id == AnswerPeriodStat.choice_id)
+        .group_by(Choices.question_id, AnswerPeriodStat.choice_id, AnswerPeriodStat.age, AnswerPeriodStat.gender)
+    )
+    counts = Counter()
+    for result in (db.session.execute(stmt), db.session.execute(archived)):
+        for question_id, choice_id, age, gender, total in result:
+            counts[(question_id, choice_id, age, gender)] += total
+    return counts
+
+
+def stored_counts():
+    """집계 테이블에 저장된 값"""
+    stmt = select(AnswerStat.question_id, AnswerStat.choice_id, AnswerStat.age, AnswerStat.gender, AnswerStat.count)
+    return Counter({
+        (question_id, choice_id, age, gender): total
+        for question_id, choice_id, age, gender, total in db.session.execute(stmt)
+        if total
+    })
+
+
+def diff(live, stored):
+    """두 집계의 차이 목록 [(키, 실제 값, 저장 값)]"""
+    keys = set(live) | set(stored)
+    return [(key, live.get(key, 0), stored.get(key, 0)) for key in keys if live.get(key, 0) != stored.get(key, 0)]
+
+
+def rebuild(live):
+    """
+    집계 테이블을 계산된 값으로 교체 (커밋은 호출자가 담당)
+    모든 행의 version을 기존 max(version)보다 크게 두어 교체 후에도 결과 ETag가 바뀜
+    """
+    now = datetime.now(tz=KST)
+    version = (db.session.execute(select(func.max(AnswerStat.version))).scalar() or 0) + 1
+    db.session.execute(delete(AnswerStat))
+    rows = [
+        {
+            "question_id": question_id,
+            "choice_id": choice_id,
+            "age": age,
+            "gender": gender,
+            "count": total,
+            "version": version,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for (question_id, choice_id, age, gender), total in live.items()
+    ]
+    if rows:
+        db.session.execute(insert(AnswerStat), rows)
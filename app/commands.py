@@ -0,0 +1,221 @@
+import gzip
+from functools import partial
+
+import click
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from flask import current_app
+from flask.cli import AppGroup, with_appcontext
+from flask_migrate import stamp
+from sqlalchemy import inspect
+
+from config import db
+from app import answer_archive, answer_stats, exports, user_import
+from app.models import AnswerPeriod
+
+# flask results ... 명령 그룹
+results_cli = AppGroup("results", help="설문 결과 집계 테이블 관리")
+
+# flask answers ... 명령 그룹
+answers_cli = AppGroup("answers", help="답변 데이터 관리")
+
+# flask users ... 명령 그룹
+users_cli = AppGroup("users", help="유저 데이터 관리")
+
+
+@click.command("init-db")
+@with_appcontext
+def init_db():
+    """
+    데이터베이스 스키마 생성 (앱 시작 시에는 DB에 접속하지 않으므로 배포 전에 한 번 실행)
+    빈 DB면 모델 기준으로 테이블을 만들고 마이그레이션 버전을 최신(head)으로 기록
+    이미 테이블이 있으면 없는 테이블만 만들고, 스키마 변경은 flask db upgrade로 반영
+    """
+    with db.engine.connect() as connection:
+        revision = MigrationContext.configure(connection).get_current_revision()
+        empty = not inspect(connection).get_table_names()
+    db.create_all(bind_key=None)  # primary에만 생성 (읽기 전용 복제본 제외)
+    if empty:
+        stamp()
+    elif revision is None:
+        click.echo("기존 테이블에 마이그레이션 버전 기록이 없습니다. 스키마 확인 후 flask db stamp head를 실행하세요.")
+    click.echo("Initialized the database.")
+
+
+@results_cli.command("rebuild")
+@click.option("--check", is_flag=True, help="다시 계산만 하고 저장된 값과 비교 (변경하지 않음)")
+def rebuild_results(check):
+    """
+    answers → users → choices를 다시 집계해 (보관한 기간은 answer_period_stats를 더해) answer_stats와 비교하고 교체
+    교체 중 들어온 답변이 빠지지 않도록 트래픽이 적을 때 실행 권장
+    """
+    live = answer_stats.live_counts()
+    differences = answer_stats.diff(live, answer_stats.stored_counts())
+    for (question_id, choice_id, age, gender), actual, stored in sorted(
+        differences, key=lambda item: (item[0][1], item[0][2].value, item[0][3].value)
+    ):
+        click.echo(
+            f"question={question_id} choice={choice_id} age={age.value} gender={gender.value}: "
+            f"actual={actual} stored={stored}"
+        )
+    click.echo(f"{len(live)} counters, {len(differences)} mismatched")
+
+    if check:
+        if differences:
+            raise SystemExit(1)
+        return
+
+    answer_stats.rebuild(live)
+    db.session.commit()
+    click.echo("answer_stats rebuilt")
+
+
+@answers_cli.command("export")
+@click.option("--format", "output_format", type=click.Choice(exports.FORMATS), default="csv", show_default=True)
+@click.option("--gzip", "compress", is_flag=True, help="gzip으로 압축")
+@click.option("--output", "-o", type=click.Path(dir_okay=False), help="저장할 파일 (생략하면 표준 출력)")
+@click.option("--created-from", help="이 시각 이후 답변만 (ISO 8601)")
+@click.option("--created-to", help="이 시각 이전 답변만 (ISO 8601)")
+@click.option("--question-id", multiple=True, type=int, help="질문 id (여러 번 지정 가능)")
+@click.option("--active-only", is_flag=True, help="활성 선택지의 답변만")
+def export_answers(output_format, compress, output, created_from, created_to, question_id, active_only):
+    """
+    답변 + 유저 나이/성별 + 질문/선택지 내용을 CSV / NDJSON으로 내보내기
+    서버 측 커서로 조금씩 읽어 쓰므로 답변 수와 무관하게 메모리 사용량이 일정함
+    """
+    try:
+        filters = exports.answer_filters({
+            "created_from": created_from,
+            "created_to": created_to,
+            "question_id": ",".join(map(str, question_id)),
+            "active_only": active_only,
+        })
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+    stream = open(output, "wb") if output else click.get_binary_stream("stdout")
+    try:
+        for data in exports.generate(filters, output_format, compress):
+            stream.write(data)
+    finally:
+        if output:
+            stream.close()
+
+
+def _require_schema_head():
+    """
+    보관 명령은 answers 행을 지우므로 DB 스키마가 최신 마이그레이션인지 먼저 확인
+    (answer_periods / answers_archive / created_at 인덱스 / MySQL 파티션은 flask db upgrade로 생성)
+    """
+    migrate = current_app.extensions["migrate"]
+    heads = set(ScriptDirectory.from_config(migrate.migrate.get_config(migrate.directory)).get_heads())
+    with db.engine.connect() as connection:
+        current = set(MigrationContext.configure(connection).get_current_heads())
+    if current != heads:
+        raise click.ClickException(
+            f"DB 스키마가 최신이 아닙니다 (현재 {sorted(current) or '없음'}, 최신 {sorted(heads)}). "
+            "flask db upgrade를 먼저 실행하세요."
+        )
+
+
+@answers_cli.command("periods")
+def list_periods():
+    """보관된 기간과 answers에 남아 있는 닫힌 기간 목록"""
+    for record in AnswerPeriod.query.order_by(AnswerPeriod.period):
+        loaded = f"loaded {record.loaded_at:%Y-%m-%d %H:%M}" if record.loaded_at else "not loaded"
+        click.echo(f"{record.period}  {record.status:<10} {record.row_count:>10} answers  {record.file}  ({loaded})")
+    for period in answer_archive.closed_periods():
+        click.echo(f"{period}  {'closed':<10} (not archived, still in answers)")
+
+
+@answers_cli.command("archive")
+@click.argument("periods", nargs=-1)
+@click.option("--all-closed", is_flag=True, help="answers에 남아 있는 모든 닫힌 기간")
+@click.option("--yes", is_flag=True, help="확인 없이 실행")
+def archive_answers(periods, all_closed, yes):
+    """
+    닫힌 기간(YYYY-MM, 지난 달까지)의 답변을 ANSWER_ARCHIVE_DIR에 Parquet / CSV+gzip으로 옮기고 answers에서 삭제
+    결과 집계(answer_stats)는 그대로라 /results에는 계속 포함되며, 중간에 멈추면 같은 명령으로 이어서 진행
+    기간의 답변이 가리키는 질문을 먼저 모두 비활성화해야 함 (보관한 질문은 새 답변을 받지 않음)
+    """
+    _require_schema_head()
+    periods = list(periods) + (answer_archive.closed_periods() if all_closed else [])
+    if not periods:
+        raise click.UsageError("기간(YYYY-MM) 또는 --all-closed를 지정하세요.")
+    if not yes:
+        click.confirm(f"{', '.join(periods)} 기간의 답변을 answers에서 옮깁니다. 계속할까요?", abort=True)
+    for period in periods:
+        try:
+            answer_archive.archive(current_app.config, period, log=click.echo)
+        except ValueError as e:
+            raise click.BadParameter(str(e))
+
+
+@answers_cli.command("load-archive")
+@click.argument("periods", nargs=-1, required=True)
+def load_archive(periods):
+    """보관 파일을 answers_archive 테이블로 다시 불러오기 (리포트용, 이미 불러온 기간은 교체)"""
+    _require_schema_head()
+    for period in periods:
+        try:
+            count = answer_archive.load(current_app.config, period)
+        except ValueError as e:
+            raise click.BadParameter(str(e))
+        click.echo(f"{period}: loaded {count} answers into answers_archive")
+
+
+@answers_cli.command("unload-archive")
+@click.argument("periods", nargs=-1, required=True)
+def unload_archive(periods):
+    """answers_archive에서 기간 데이터 제거 (보관 파일은 그대로)"""
+    _require_schema_head()
+    for period in periods:
+        try:
+            answer_archive.unload(period)
+        except ValueError as e:
+            raise click.BadParameter(str(e))
+        click.echo(f"{period}: removed from answers_archive")
+
+
+@users_cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False, allow_dash=True))
+@click.option("--format", "input_format", type=click.Choice(user_import.FORMATS), help="생략하면 확장자로 판단 (.csv / .ndjson, .gz 가능)")
+@click.option("--report", type=click.Path(dir_okay=False), help="행별 결과 NDJSON을 저장할 파일 (생략하면 요약만 출력)")
+@click.option("--batch-rows", type=int, help="한 번에 검사 / 저장하는 행 수 (기본값: USER_IMPORT_BATCH_ROWS)")
+def import_users(path, input_format, report, batch_rows):
+    """
+    CSV(name,age,gender,email 헤더) / NDJSON 파일의 유저를 묶음 단위로 일괄 가입
+    파일 안 / DB와 중복된 이메일은 건너뛰고 행별 결과를 기록
+    도중에 실패하면 마지막으로 처리한 행을 출력하고 종료 코드 1 (그 다음 행부터 다시 가져오면 됨)
+    """
+    name = path[:-3] if path.endswith(".gz") else path
+    input_format = input_format or ("csv" if name.endswith(".csv") else "ndjson" if name.endswith(".ndjson") else None)
+    if input_format is None:
+        raise click.BadParameter("확장자로 형식을 알 수 없습니다. --format을 지정하세요.")
+
+    if path == "-":
+        stream = click.get_binary_stream("stdin")
+    elif path.endswith(".gz"):
+        stream = gzip.open(path, "rb")
+    else:
+        stream = open(path, "rb")
+    output = open(report, "w", encoding="utf-8") if report else None
+    dumps = partial(current_app.json.dumps, separators=(",", ":"))
+    try:
+        for result in user_import.import_users(
+            user_import.read_records(stream, input_format), batch_rows or current_app.config["USER_IMPORT_BATCH_ROWS"]
+        ):
+            if output is not None:
+                output.write(dumps(result) + "\n")
+            if result.get("status") == "error":
+                click.echo(f"stopped after row {result['after_row']}: {result['msg']}", err=True)
+            if "summary" in result:
+                click.echo(" ".join(f"{status}={count}" for status, count in result["summary"].items()))
+                if not result["complete"]:
+                    raise SystemExit(1)
+    except (ValueError, OSError, EOFError) as e:  # 헤더 누락, 인코딩 / gzip 오류 (첫 묶음)
+        raise click.ClickException(f"가져올 수 없는 파일입니다: {e}")
+    finally:
+        stream.close()
+        if output is not None:
+            output.close()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models import Choices, Image, Question
+
+# 설문 내용(질문 / 선택지 / 이미지)이 바뀌면 갱신되는 버전
+WATCHED_MODELS = (Question, Choices, Image)
+
+_path = os.path.join(tempfile.gettempdir(), "oz_form_content_version")
+
+
+def init_app(app):
+    """
+    버전 파일 경로 설정
+    모든 gunicorn 워커가 같은 파일을 보므로, 한 워커의 변경이 다른 워커 캐시도 무효화함
+    """
+    global _path
+    _path = app.config["CONTENT_VERSION_PATH"]
+
+
+def current():
+    """
+    현재 설문 내용 버전 (버전 파일의 inode + 수정 시각)
+    요청마다 stat 한 번이면 되므로 비용이 거의 없음
+    """
+    try:
+        stat = os.stat(_path)
+    except FileNotFoundError:
+        bump()
+        stat = os.stat(_path)
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def bump():
+    """새 버전 파일로 교체 (os.replace로 inode가 바뀌므로 같은 시각에 겹쳐도 구분됨)"""
+    directory = os.path.dirname(_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    os.replace(tmp_path, _path)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_changed(session, flush_context):
+    # 질문 / 선택지 / 이미지가 추가, 수정, 삭제되었는지 표시
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, WATCHED_MODELS):
+            session.info["content_changed"] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_commit(session):
+    # 커밋된 뒤에만 버전 증가 (롤백된 변경은 무시)
+    if session.info.pop("content_changed", False):
+        bump()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_on_rollback(session):
+    session.info.pop("content_changed", None)
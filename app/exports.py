@@ -0,0 +1,118 @@
+import csv
+import io
+import zlib
+
+from flask import current_app
+from sqlalchemy import func, select
+
+from app.models import Answer, Choices, Question, User, parse_datetime
+from config import db
+
+# 내보내는 컬럼 (CSV 헤더 / NDJSON 키)
+EXPORT_COLUMNS = (
+    Answer.id.label("answer_id"),
+    Answer.created_at.label("answered_at"),
+    Answer.user_id,
+    User.age,
+    User.gender,
+    Choices.question_id,
+    Question.title.label("question_title"),
+    Answer.choice_id,
+    Choices.content.label("choice_content"),
+)
+FORMATS = ("csv", "ndjson")
+MIMETYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+CHUNK_ROWS = 20000  # 한 트랜잭션에서 읽는 최대 행 수 (다음 구간은 새 트랜잭션에서 마지막 id 이후부터)
+BATCH_ROWS = 1000  # 서버 측 커서에서 한 번에 가져오는 행 수 (yield_per)
+
+
+def answer_filters(args):
+    """
+    created_from / created_to (ISO 8601), question_id (쉼표 구분), active_only 를 조건 리스트로 변환
+    잘못된 값이면 ValueError
+    """
+    filters = []
+    if args.get("created_from"):
+        filters.append(Answer.created_at >= parse_datetime(args["created_from"]))
+    if args.get("created_to"):
+        filters.append(Answer.created_at < parse_datetime(args["created_to"]))
+    if args.get("question_id"):
+        try:
+            question_ids = [int(value) for value in str(args["question_id"]).split(",")]
+        except ValueError:
+            raise ValueError(f"유효하지 않은 question_id 값입니다: {args['question_id']}")
+        filters.append(Choices.question_id.in_(question_ids))
+    if str(args.get("active_only", "")).lower() in ("1", "true", "yes"):
+        filters.append(Choices.is_active.is_(True))
+    return filters
+
+
+def _partitions(filters):
+    """
+    답변 id 구간(CHUNK_ROWS)마다 짧은 트랜잭션으로 읽으며 행 묶음 생성
+    시작 시점의 최대 id까지만 읽으므로 내보내는 중 들어온 답변 때문에 끝나지 않는 일이 없음
+    """
+    upper = db.session.execute(select(func.max(Answer.id))).scalar()
+    db.session.commit()
+    if upper is None:
+        return
+
+    after = 0
+    while True:
+        stmt = (
+            select(*EXPORT_COLUMNS)
+            .join(User, User.id == Answer.user_id)
+            .join(Choices, Choices.id == Answer.choice_id)
+            .join(Question, Question.id == Choices.question_id)
+            .where(Answer.id > after, Answer.id <= upper, *filters)
+            .order_by(Answer.id)
+            .limit(CHUNK_ROWS)
+            .execution_options(yield_per=BATCH_ROWS)
+        )
+        count = 0
+        for rows in db.session.execute(stmt).partitions():
+            yield rows
+            count += len(rows)
+            after = rows[-1].answer_id
+        # 구간마다 트랜잭션을 끝내 커넥션 / 읽기 스냅샷을 오래 잡지 않음 (/submit 쓰기와 경합 방지)
+        db.session.commit()
+        if count < CHUNK_ROWS:
+            return
+
+
+def _encode(filters, output_format):
+    """행 묶음을 CSV 또는 NDJSON 문자열로 변환"""
+    keys = [column.key for column in EXPORT_COLUMNS]
+    if output_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(keys)
+        for rows in _partitions(filters):
+            writer.writerows(
+                (row.answer_id, row.answered_at.isoformat(), row.user_id, row.age.value, row.gender.value,
+                 row.question_id, row.question_title, row.choice_id, row.choice_content)
+                for row in rows
+            )
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    else:
+        dumps = current_app.json.dumps
+        for rows in _partitions(filters):
+            yield "".join(dumps(dict(zip(keys, row)), separators=(",", ":")) + "\n" for row in rows)
+
+
+def generate(filters, output_format, compress=False):
+    """
+    내보내기 본문을 bytes 조각으로 생성 (메모리 사용량은 BATCH_ROWS 행 분량으로 일정)
+    compress면 gzip 형식으로 바로 압축
+    """
+    encoder = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None  # wbits=31: gzip 헤더
+    for text in _encode(filters, output_format):
+        data = text.encode("utf-8")
+        if encoder is not None:
+            data = encoder.compress(data)
+        if data:
+            yield data
+    if encoder is not None:
+        yield encoder.flush()
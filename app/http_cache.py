@@ -0,0 +1,111 @@
+import gzip
+import hashlib
+from datetime import datetime
+from functools import wraps
+
+from flask import current_app, request
+from werkzeug.http import is_resource_modified
+
+from app.models import KST
+
+# 압축할 응답 Content-Type (이미지 등 이미 압축된 형식은 제외)
+COMPRESSIBLE_MIMETYPES = ("application/json", "application/x-ndjson", "text/csv")
+
+
+def _last_modified(values):
+    """검증 값 중 가장 늦은 updated_at (DB에는 KST 기준 naive datetime으로 저장됨)"""
+    times = [value for value in values if isinstance(value, datetime)]
+    if not times:
+        return None
+    latest = max(times)
+    return latest.replace(tzinfo=KST) if latest.tzinfo is None else latest
+
+
+def cache_policy(validator=None, max_age=0, private=False):
+    """
+    조회 API의 HTTP 캐시 정책 (뷰 바로 위에 선언)
+    validator(**kwargs): 응답에 쓰이는 행들의 max(updated_at) / 개수를 가벼운 쿼리 한 번으로 반환
+      → 값으로 ETag / Last-Modified를 만들고, 조건부 요청이 일치하면 뷰를 실행하지 않고 304
+      (개수는 max(updated_at)에 드러나지 않는 행 삭제를 구분, None을 반환하면 검증 없이 뷰 실행)
+    validator가 없으면 응답 본문 해시로 ETag를 만들어 전송량만 줄임 (조회 캐시가 있는 경로)
+    max_age: 재검증 없이 재사용할 초 (0이면 매번 재검증), private: 브라우저에만 저장 (유저별 응답)
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = last_modified = None
+            if validator is not None:
+                values = validator(**kwargs)
+                if values is not None:
+                    values = tuple(values)
+                    # 같은 데이터라도 API 버전(응답 형식)이 바뀌면 다른 ETag
+                    key = repr((request.full_path, current_app.config["API_VERSION"], values))
+                    etag = hashlib.sha1(key.encode("utf-8")).hexdigest()
+                    last_modified = _last_modified(values)
+                    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+                        response = current_app.response_class(status=304)
+                        response.set_etag(etag)
+                        _set_cache_headers(response, last_modified, max_age, private)
+                        return response
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+            if etag is not None:
+                response.set_etag(etag)
+            elif response.get_etag()[0] is None:
+                response.add_etag()
+            _set_cache_headers(response, last_modified, max_age, private)
+            return response.make_conditional(request)
+
+        return wrapper
+
+    return decorator
+
+
+def _set_cache_headers(response, last_modified, max_age, private):
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.private = private or None
+    response.cache_control.public = not private or None
+    if max_age:
+        response.cache_control.max_age = max_age
+    else:
+        response.cache_control.no_cache = True  # 저장은 하되 쓰기 전에 매번 재검증
+
+
+def compress(response):
+    """
+    HTTP_COMPRESS_MIN_BYTES 이상인 JSON / CSV 응답을 클라이언트가 허용하면 gzip으로 압축
+    스트리밍 응답은 그대로 전달 (내보내기는 gzip=1 옵션 사용)
+    압축본은 원본과 바이트가 다르므로 ETag를 약한 ETag로 바꿈 (nginx gzip과 같은 방식)
+    """
+    min_bytes = current_app.config["HTTP_COMPRESS_MIN_BYTES"]
+    if (
+        not min_bytes
+        or response.status_code != 200
+        or response.is_streamed
+        or response.direct_passthrough
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+    body = response.get_data()
+    if len(body) < min_bytes:
+        return response
+
+    response.vary.add("Accept-Encoding")
+    if not request.accept_encodings["gzip"]:  # 품질 값 (없거나 q=0이면 0)
+        return response
+    response.set_data(gzip.compress(body, compresslevel=current_app.config["HTTP_COMPRESS_LEVEL"]))
+    response.headers["Content-Encoding"] = "gzip"
+    etag, weak = response.get_etag()
+    if etag is not None and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_app(app):
+    """모든 응답에 압축 적용"""
+    app.after_request(compress)
@@ -0,0 +1,260 @@
+import fcntl
+import glob
+import hashlib
+import json
+import os
+import secrets
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import Response, send_file
+from werkzeug.http import parse_date, unquote_etag
+
+from app.image_proxy import open_upstream
+
+# 캐시에 저장할 외부 서버 응답 헤더 (파일 응답 시 그대로 복원)
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control")
+
+
+def enabled(config):
+    """IMAGE_CACHE_DIR가 비어 있으면 캐시를 사용하지 않음"""
+    return bool(config.get("IMAGE_CACHE_DIR"))
+
+
+def _key(image_id, url):
+    """이미지 id + URL 기준 캐시 키 (URL이 바뀌면 다른 항목이 됨)"""
+    return f"{image_id}-{hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]}"
+
+
+def _meta_path(config, key):
+    return os.path.join(config["IMAGE_CACHE_DIR"], f"{key}.json")
+
+
+def _write_atomic(directory, path, data):
+    """임시 파일에 쓴 뒤 os.replace로 교체 (여러 워커가 동시에 써도 반쯤 쓴 파일이 보이지 않음)"""
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        _unlink(tmp_path)
+        raise
+
+
+def _unlink(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+@contextmanager
+def _file_lock(path, blocking=True):
+    """워커 프로세스 간 잠금 (flock), 비차단 모드에서 잠금 실패 시 False"""
+    with open(path, "a") as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _read_meta(config, key):
+    try:
+        with open(_meta_path(config, key), "rb") as f:
+            meta = json.loads(f.read())
+    except (FileNotFoundError, ValueError):
+        return None
+    meta["path"] = os.path.join(config["IMAGE_CACHE_DIR"], meta["file"])
+    return meta if os.path.exists(meta["path"]) else None
+
+
+def lookup(config, image_id, url):
+    """
+    캐시 항목 조회, 없으면 None
+    조회된 항목은 수정 시간을 갱신하여 LRU 순서를 앞으로 당김
+    """
+    key = _key(image_id, url)
+    meta = _read_meta(config, key)
+    if meta is not None:
+        try:
+            os.utime(_meta_path(config, key))
+        except FileNotFoundError:
+            return None
+    return meta
+
+
+def is_stale(config, meta):
+    """마지막 확인 후 IMAGE_CACHE_REVALIDATE_SECONDS가 지나면 원본 서버에 재검증 필요"""
+    return time.time() - meta["checked_at"] > config["IMAGE_CACHE_REVALIDATE_SECONDS"]
+
+
+def fill(config, image_id, url, meta=None):
+    """
+    원본 서버에서 이미지를 받아 캐시에 저장하고 항목 반환
+    기존 항목이 있으면 ETag/Last-Modified로 조건부 요청하여 304면 그대로 재사용
+    캐시할 수 없으면(크기 초과, 원본 오류) 기존 항목 또는 None 반환
+    requests 예외는 기존 항목이 없을 때만 호출자에게 전달
+    """
+    directory = config["IMAGE_CACHE_DIR"]
+    os.makedirs(directory, exist_ok=True)
+    key = _key(image_id, url)
+
+    # 같은 이미지를 여러 워커가 동시에 받지 않도록 키 단위로 잠금
+    with _file_lock(os.path.join(directory, f"{key}.lock")):
+        current = _read_meta(config, key)
+        if current is not None and not is_stale(config, current):
+            return current  # 잠금을 기다리는 동안 다른 워커가 채움
+        meta = current or meta
+
+        headers = {}
+        if meta is not None:
+            if meta["headers"].get("ETag"):
+                headers["If-None-Match"] = meta["headers"]["ETag"]
+            if meta["headers"].get("Last-Modified"):
+                headers["If-Modified-Since"] = meta["headers"]["Last-Modified"]
+
+        try:
+            upstream = open_upstream(url, config, headers)
+        except Exception:
+            if meta is not None:
+                return meta  # 원본 서버 장애 시 기존 항목으로 응답
+            raise
+
+        try:
+            if upstream.status_code == 304 and meta is not None:
+                meta["checked_at"] = time.time()
+                _store_meta(config, key, meta)
+                return meta
+            if upstream.status_code != 200:
+                return meta
+
+            # 본문을 메모리에 모으지 않고 임시 파일로 바로 기록
+            limit = config["IMAGE_CACHE_MAX_BYTES"]
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            size = 0
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    for chunk in upstream.iter_content(config["IMAGE_PROXY_CHUNK_SIZE"]):
+                        size += len(chunk)
+                        if size > limit:
+                            raise OverflowError
+                        f.write(chunk)
+            except OverflowError:
+                _unlink(tmp_path)
+                return meta
+            except BaseException:
+                _unlink(tmp_path)
+                raise
+        finally:
+            upstream.close()
+
+        # 항목마다 새 파일명을 쓰므로 읽는 중인 기존 파일은 메타 교체 후에 삭제
+        file_name = f"{key}.{secrets.token_hex(4)}.bin"
+        os.replace(tmp_path, os.path.join(directory, file_name))
+        new_meta = {
+            "image_id": image_id,
+            "url": url,
+            "file": file_name,
+            "size": size,
+            "headers": {
+                name: upstream.headers[name] for name in STORED_HEADERS if name in upstream.headers
+            },
+            "checked_at": time.time(),
+        }
+        _store_meta(config, key, new_meta)
+        if meta is not None and meta["file"] != file_name:
+            _unlink(os.path.join(directory, meta["file"]))
+
+    evict(config)
+    return _read_meta(config, key)
+
+
+def _store_meta(config, key, meta):
+    data = {name: value for name, value in meta.items() if name != "path"}
+    _write_atomic(config["IMAGE_CACHE_DIR"], _meta_path(config, key), json.dumps(data).encode("utf-8"))
+
+
+def evict(config):
+    """
+    전체 크기가 IMAGE_CACHE_MAX_BYTES를 넘으면 가장 오래 조회되지 않은 항목부터 삭제
+    다른 워커가 정리 중이면 건너뜀
+    """
+    directory = config["IMAGE_CACHE_DIR"]
+    with _file_lock(os.path.join(directory, ".evict.lock"), blocking=False) as locked:
+        if not locked:
+            return
+        entries = []
+        for meta_path in glob.glob(os.path.join(directory, "*.json")):
+            try:
+                with open(meta_path, "rb") as f:
+                    meta = json.loads(f.read())
+                entries.append((os.stat(meta_path).st_mtime, meta_path, meta))
+            except (FileNotFoundError, ValueError):
+                continue
+
+        total = sum(meta["size"] for _, _, meta in entries)
+        for _, meta_path, meta in sorted(entries, key=lambda entry: entry[0]):
+            if total <= config["IMAGE_CACHE_MAX_BYTES"]:
+                break
+            _unlink(meta_path)
+            _unlink(os.path.join(directory, meta["file"]))
+            total -= meta["size"]
+
+
+def invalidate(config, image_id):
+    """이미지 id에 해당하는 모든 캐시 파일 삭제 (URL과 무관)"""
+    if not enabled(config):
+        return
+    for path in glob.glob(os.path.join(config["IMAGE_CACHE_DIR"], f"{image_id}-*")):
+        _unlink(path)
+
+
+def warm(config, image_id, url):
+    """새로 등록된 이미지를 백그라운드 스레드에서 미리 캐시에 저장"""
+    if not enabled(config):
+        return
+
+    def run():
+        try:
+            fill(config, image_id, url)
+        except Exception:
+            pass  # 미리 받기 실패는 첫 조회 때 다시 시도
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def serve(config, meta):
+    """
+    캐시 파일로 응답 (본문을 파이썬으로 읽지 않음)
+    IMAGE_CACHE_ACCEL_PREFIX가 설정되어 있으면 nginx X-Accel-Redirect로 전송을 넘김
+    """
+    headers = meta["headers"]
+    prefix = config.get("IMAGE_CACHE_ACCEL_PREFIX")
+    if prefix:
+        response = Response(status=200, content_type=headers.get("Content-Type"))
+        response.headers["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + meta["file"]
+        if "ETag" in headers:
+            response.headers["ETag"] = headers["ETag"]
+        if "Last-Modified" in headers:
+            response.headers["Last-Modified"] = headers["Last-Modified"]
+    else:
+        # Range / If-None-Match / If-Modified-Since 처리는 send_file이 담당
+        etag, weak = unquote_etag(headers.get("ETag"))
+        response = send_file(
+            meta["path"],
+            mimetype=headers.get("Content-Type") or "application/octet-stream",
+            conditional=True,
+            etag=etag if etag and not weak else False,
+            last_modified=parse_date(headers.get("Last-Modified")),
+        )
+    if "Cache-Control" in headers:
+        response.headers["Cache-Control"] = headers["Cache-Control"]
+    return response
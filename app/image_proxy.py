@@ -0,0 +1,104 @@
+import os
+import threading
+from time import perf_counter
+
+from app.metrics import add_upstream_time
+
+# 클라이언트 요청에서 외부 서버로 그대로 전달할 헤더 (부분 요청 / 조건부 요청)
+FORWARD_REQUEST_HEADERS = ("Range", "If-Range", "If-None-Match", "If-Modified-Since")
+
+# 외부 서버 응답에서 클라이언트로 그대로 전달할 헤더 (길이 / 범위 / 캐시 관련)
+PASSTHROUGH_RESPONSE_HEADERS = (
+    "Content-Type",
+    "Content-Length",
+    "Content-Encoding",
+    "Content-Range",
+    "Accept-Ranges",
+    "ETag",
+    "Last-Modified",
+    "Cache-Control",
+    "Expires",
+)
+
+# 클라이언트에게 그대로 중계할 외부 서버 상태 코드
+PASSTHROUGH_STATUS = (200, 206, 304)
+
+_session = None  # 워커 프로세스 공용 세션
+_session_pid = None  # 세션을 만든 프로세스 id (fork 감지용)
+_session_lock = threading.Lock()
+
+
+def get_session(pool_maxsize):
+    """
+    워커 프로세스마다 하나씩 keep-alive 연결 풀을 가진 세션 반환
+    (gunicorn fork 이후에는 부모의 소켓을 공유하지 않도록 새로 생성)
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                import requests  # 앱 시작 시간을 줄이기 위해 첫 외부 요청 때 불러옴
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session, _session_pid = session, pid
+    return _session
+
+
+def request_error():
+    """
+    외부 요청 실패 예외의 기본 클래스 (requests.exceptions.RequestException)
+    except 절의 식은 예외가 난 뒤에 평가되므로 requests를 미리 불러오지 않음
+    """
+    import requests
+
+    return requests.exceptions.RequestException
+
+
+def forward_headers(headers):
+    """클라이언트 요청 헤더 중 외부 서버로 전달할 항목만 추림"""
+    return {name: headers[name] for name in FORWARD_REQUEST_HEADERS if name in headers}
+
+
+def passthrough_headers(upstream):
+    """외부 서버 응답 헤더 중 클라이언트로 전달할 항목만 추림"""
+    return [
+        (name, upstream.headers[name])
+        for name in PASSTHROUGH_RESPONSE_HEADERS
+        if name in upstream.headers
+    ]
+
+
+def open_upstream(url, config, headers=None):
+    """
+    외부 URL에 스트리밍 모드로 요청 (본문은 아직 읽지 않음)
+    연결/읽기 제한 시간은 config에서 가져오고, 응답 헤더까지 걸린 시간은 요청 지표에 누적
+    """
+    session = get_session(config["IMAGE_PROXY_POOL_MAXSIZE"])
+    started = perf_counter()
+    try:
+        return session.get(
+            url,
+            headers=headers or {},
+            stream=True,
+            timeout=(config["IMAGE_PROXY_CONNECT_TIMEOUT"], config["IMAGE_PROXY_READ_TIMEOUT"]),
+        )
+    finally:
+        add_upstream_time(perf_counter() - started)
+
+
+def iter_upstream(upstream, chunk_size):
+    """
+    외부 서버 응답 본문을 받은 즉시 청크 단위로 내보냄
+    Content-Length/Content-Encoding을 그대로 전달하므로 압축은 풀지 않음
+    """
+    try:
+        for chunk in upstream.raw.stream(chunk_size, decode_content=False):
+            if chunk:
+                yield chunk
+    finally:
+        upstream.close()  # 연결을 풀로 반환
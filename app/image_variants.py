@@ -0,0 +1,265 @@
+import atexit
+import glob
+import hashlib
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from flask import send_file
+from werkzeug.http import parse_date
+
+from app.image_cache import _file_lock, _unlink
+
+try:
+    import PIL  # 선택 의존성 (없으면 원본 그대로 중계), PIL.Image는 변환 프로세스에서만 불러옴
+except ImportError:
+    PIL = None
+
+# 출력 형식별 Pillow 저장 형식과 Content-Type
+FORMATS = {
+    "webp": ("WEBP", "image/webp"),
+    "jpeg": ("JPEG", "image/jpeg"),
+    "png": ("PNG", "image/png"),
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+_inflight = {}  # 변환 중인 변형 키 -> Future (같은 워커 안의 중복 요청은 결과를 함께 기다림)
+_inflight_lock = threading.Lock()
+_failures = {}  # 변환에 실패한 변형 키 -> (만료 시각, 실패 이유), 만료 전에는 다시 변환하지 않음
+
+STALE_TMP_SECONDS = 3600  # 이보다 오래된 .tmp 파일은 비정상 종료로 남은 것으로 보고 삭제
+
+
+def enabled(config):
+    """Pillow가 없거나 IMAGE_VARIANT_DIR가 비어 있으면 변형 이미지를 만들지 않음"""
+    return PIL is not None and bool(config.get("IMAGE_VARIANT_DIR"))
+
+
+def parse_params(args, config):
+    """
+    w / format 쿼리 문자열을 (너비, 형식)으로 변환, 둘 다 없으면 None
+    너비는 허용된 너비 중 요청 이상인 가장 작은 값으로 올려서 변형 종류 수를 제한 (없으면 원본 크기)
+    잘못된 값이면 ValueError
+    """
+    width = args.get("w")
+    output_format = args.get("format")
+    if width is None and output_format is None:
+        return None
+
+    if width is not None:
+        if not width.isdigit() or int(width) == 0:
+            raise ValueError(f"유효하지 않은 w 값입니다: {width}")
+        widths = sorted(config["IMAGE_VARIANT_WIDTHS"])
+        width = next((allowed for allowed in widths if allowed >= int(width)), widths[-1])
+
+    output_format = (output_format or config["IMAGE_VARIANT_DEFAULT_FORMAT"]).lower()
+    output_format = "jpeg" if output_format == "jpg" else output_format
+    if output_format not in FORMATS:
+        raise ValueError(f"유효하지 않은 format 값입니다: {output_format}")
+    return width, output_format
+
+
+def _key(image_id, source, width, output_format):
+    """
+    이미지 id + 원본 캐시 파일 기준 변형 키
+    원본을 다시 받으면 캐시 파일 이름이 바뀌므로 이전 변형은 더 이상 쓰이지 않고 LRU로 정리됨
+    """
+    digest = hashlib.sha1(source["file"].encode("utf-8")).hexdigest()[:16]
+    return f"{image_id}-{digest}-w{width or 0}.{output_format}"
+
+
+def _get_executor(config):
+    """
+    워커 프로세스마다 하나씩 만드는 변환용 프로세스 풀
+    요청 스레드가 도는 프로세스를 fork하지 않도록 spawn 사용
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=config["IMAGE_VARIANT_PROCESSES"],
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            atexit.register(_executor.shutdown, wait=False, cancel_futures=True)
+        return _executor
+
+
+def _reset_executor():
+    global _executor
+    with _executor_lock:
+        broken, _executor = _executor, None
+    if broken is not None:
+        broken.shutdown(wait=False, cancel_futures=True)
+
+
+def render(source_path, target_path, width, output_format, quality, max_pixels):
+    """
+    원본 파일을 너비에 맞춰 줄이고 다시 인코딩 (프로세스 풀에서 실행)
+    비율 유지, 확대하지 않음 / 결과 파일 크기 반환
+    """
+    from PIL import Image as PILImage, ImageOps
+
+    PILImage.MAX_IMAGE_PIXELS = max_pixels  # 압축 폭탄 방지 (초과 시 DecompressionBombError)
+    pil_format = FORMATS[output_format][0]
+    with PILImage.open(source_path) as image:
+        if width:
+            image.draft("RGB", (width, width))  # JPEG는 디코딩 단계에서 미리 축소 (1/2, 1/4, 1/8)
+        image = ImageOps.exif_transpose(image)  # 회전 정보 반영
+        if width and image.width > width:
+            image = image.resize((width, max(1, round(image.height * width / image.width))), PILImage.LANCZOS)
+        if pil_format == "JPEG" and image.mode != "RGB":
+            image = image.convert("RGB")
+        elif image.mode not in ("RGB", "RGBA", "L", "LA"):
+            image = image.convert("RGBA")
+        options = {"optimize": True} if pil_format == "PNG" else {"quality": quality}
+        image.save(target_path, pil_format, **options)
+    return os.path.getsize(target_path)
+
+
+def _build(config, key, source, width, output_format):
+    """변형 파일을 만들어 경로 반환 (워커 프로세스 간에는 키 단위 파일 잠금으로 한 번만 변환)"""
+    directory = config["IMAGE_VARIANT_DIR"]
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, key)
+    with _file_lock(f"{path}.lock"):
+        if os.path.exists(path):
+            return path  # 잠금을 기다리는 동안 다른 워커가 만듦
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        os.close(fd)
+        future = None
+        try:
+            future = _get_executor(config).submit(
+                render, source["path"], tmp_path, width, output_format,
+                config["IMAGE_VARIANT_QUALITY"], config["IMAGE_VARIANT_MAX_PIXELS"],
+            )
+            future.result(timeout=config["IMAGE_VARIANT_TIMEOUT"])
+            os.replace(tmp_path, path)
+        except BrokenProcessPool:
+            _reset_executor()  # 변환 프로세스가 비정상 종료되면 다음 요청 때 풀을 새로 만듦
+            _unlink(tmp_path)
+            raise
+        except BaseException:
+            # 시간 초과여도 변환 프로세스는 계속 실행되며 임시 파일을 다시 만들 수 있으므로 끝난 뒤에도 삭제
+            if future is not None:
+                future.cancel()
+                future.add_done_callback(lambda _: _unlink(tmp_path))
+            _unlink(tmp_path)
+            raise
+    evict(config)
+    return path
+
+
+def get(config, image_id, source, width, output_format):
+    """
+    변형 파일 경로 반환 (없으면 만들어서 저장)
+    조회된 파일은 수정 시간을 갱신하여 LRU 순서를 앞으로 당김
+    변환 실패(이미지가 아님, 크기 초과, 시간 초과)는 예외로 전달
+    실패한 키는 IMAGE_VARIANT_FAILURE_TTL초 동안 기억하여 다시 변환하지 않고 바로 RuntimeError
+    (실패 예외 객체는 여러 스레드에서 다시 raise하면 __traceback__을 공유하므로 이유만 보관하고 매번 새 예외 생성)
+    """
+    key = _key(image_id, source, width, output_format)
+    path = os.path.join(config["IMAGE_VARIANT_DIR"], key)
+    try:
+        os.utime(path)
+        return path
+    except FileNotFoundError:
+        pass
+
+    # 최근에 실패한 변형은 다시 변환하지 않음, 같은 워커의 다른 스레드가 변환 중이면 그 결과를 기다림
+    with _inflight_lock:
+        expires_at, reason = _failures.get(key, (0, None))
+        if reason is not None and expires_at > time.monotonic():
+            raise RuntimeError(f"최근 변환에 실패한 변형입니다: {reason}")
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+    if not leader:
+        error = future.exception()  # 대기 (실패해도 같은 예외 객체를 raise하지 않음)
+        if error is not None:
+            raise RuntimeError(f"변형 변환에 실패했습니다: {error!r}")
+        return future.result()
+
+    try:
+        path = _build(config, key, source, width, output_format)
+        future.set_result(path)
+        return path
+    except Exception as e:
+        now = time.monotonic()
+        with _inflight_lock:
+            for expired in [k for k, (expires_at, _) in _failures.items() if expires_at <= now]:
+                del _failures[expired]
+            _failures[key] = (now + config["IMAGE_VARIANT_FAILURE_TTL"], repr(e))
+        future.set_exception(e)
+        raise
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+
+
+def evict(config):
+    """
+    전체 크기가 IMAGE_VARIANT_MAX_BYTES를 넘으면 가장 오래 조회되지 않은 변형부터 삭제
+    STALE_TMP_SECONDS보다 오래된 임시 파일도 삭제, 다른 워커가 정리 중이면 건너뜀
+    """
+    directory = config["IMAGE_VARIANT_DIR"]
+    with _file_lock(os.path.join(directory, ".evict.lock"), blocking=False) as locked:
+        if not locked:
+            return
+        stale_before = time.time() - STALE_TMP_SECONDS
+        for path in glob.glob(os.path.join(directory, "*.tmp")):
+            try:
+                if os.stat(path).st_mtime < stale_before:
+                    _unlink(path)
+            except FileNotFoundError:
+                continue
+        entries = []
+        for path in glob.glob(os.path.join(directory, "*-w*.*")):
+            if path.endswith((".lock", ".tmp")):
+                continue
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size))
+
+        total = sum(size for _, _, size in entries)
+        for _, path, size in sorted(entries):
+            if total <= config["IMAGE_VARIANT_MAX_BYTES"]:
+                break
+            _unlink(path)
+            _unlink(f"{path}.lock")
+            total -= size
+
+
+def invalidate(config, image_id):
+    """이미지 id에 해당하는 모든 변형 파일 삭제"""
+    if not config.get("IMAGE_VARIANT_DIR"):
+        return
+    for path in glob.glob(os.path.join(config["IMAGE_VARIANT_DIR"], f"{image_id}-*")):
+        _unlink(path)
+
+
+def serve(path, output_format, source):
+    """
+    변형 파일로 응답 (조건부 요청은 send_file이 처리, 캐시 정책은 원본 헤더를 따름)
+    LRU 갱신으로 파일 수정 시간이 바뀌므로 ETag / Last-Modified는 변형 키와 원본 기준
+    """
+    response = send_file(
+        path,
+        mimetype=FORMATS[output_format][1],
+        conditional=True,
+        etag=os.path.basename(path),
+        last_modified=parse_date(source["headers"].get("Last-Modified")) or source.get("checked_at"),
+    )
+    if "Cache-Control" in source["headers"]:
+        response.headers["Cache-Control"] = source["headers"]["Cache-Control"]
+    return response
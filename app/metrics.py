@@ -0,0 +1,281 @@
+import glob
+import json
+import logging
+import os
+import secrets
+import tempfile
+import threading
+import time
+from time import perf_counter
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import Pool
+
+from config import db
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+MAX_RECORDED_STATEMENTS = 50  # 느린 요청 로그에 남길 SQL 최대 개수
+
+# 지표 이름 -> (설명, 버킷)
+HISTOGRAMS = {
+    "http_request_duration_seconds": ("요청 처리 시간 (뷰 반환까지)", LATENCY_BUCKETS),
+    "db_statements_per_request": ("요청당 SQL 실행 횟수", COUNT_BUCKETS),
+    "db_statement_seconds_per_request": ("요청당 SQL 실행 시간 합계", LATENCY_BUCKETS),
+    "db_pool_wait_seconds_per_request": ("요청당 커넥션 풀 대기 시간 합계", LATENCY_BUCKETS),
+    "upstream_fetch_seconds_per_request": ("요청당 외부 이미지 서버 응답 대기 시간 합계", LATENCY_BUCKETS),
+}
+
+
+class Registry:
+    """
+    워커 프로세스별 지표 저장소
+    주기적으로 METRICS_DIR/<pid>-<토큰>.json에 기록하고, /metrics는 모든 워커 파일을 합산
+    """
+
+    def __init__(self, directory, flush_interval):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.pid = os.getpid()
+        self.path = os.path.join(directory, f"{self.pid}-{secrets.token_hex(4)}.json")
+        self.lock = threading.Lock()
+        self.histograms = {}  # (이름, 라벨 튜플) -> [버킷별 개수..., 합계, 개수]
+        self.counters = {}  # (이름, 라벨 튜플) -> 값
+        self.last_flush = 0.0
+        os.makedirs(directory, exist_ok=True)
+
+    def observe(self, name, labels, value):
+        buckets = HISTOGRAMS[name][1]
+        with self.lock:
+            data = self.histograms.get((name, labels))
+            if data is None:
+                data = self.histograms[(name, labels)] = [0] * (len(buckets) + 2)
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    data[index] += 1
+            data[-2] += value
+            data[-1] += 1
+
+    def inc(self, name, labels, value=1):
+        with self.lock:
+            self.counters[(name, labels)] = self.counters.get((name, labels), 0) + value
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "pid": self.pid,
+                "histograms": [[name, list(labels), list(data)] for (name, labels), data in self.histograms.items()],
+                "counters": [[name, list(labels), value] for (name, labels), value in self.counters.items()],
+                "gauges": pool_gauges(),
+            }
+
+    def maybe_flush(self):
+        """마지막 기록 후 flush_interval이 지났으면 파일로 기록 (임시 파일 + os.replace)"""
+        now = time.monotonic()
+        if now - self.last_flush < self.flush_interval:
+            return
+        self.last_flush = now
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, self.path)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry(config):
+    """현재 워커의 지표 저장소 (fork 이후에는 새로 생성)"""
+    global _registry
+    if _registry is None or _registry.pid != os.getpid():
+        with _registry_lock:
+            if _registry is None or _registry.pid != os.getpid():
+                _registry = Registry(config["METRICS_DIR"], config["METRICS_FLUSH_INTERVAL"])
+    return _registry
+
+
+def pool_gauges():
+    """현재 워커의 DB 커넥션 풀 사용 현황"""
+    try:
+        pool = db.engine.pool
+    except RuntimeError:
+        return {}
+    gauges = {}
+    for name, attribute in (("db_pool_size", "size"), ("db_pool_checked_out", "checkedout"), ("db_pool_overflow", "overflow")):
+        method = getattr(pool, attribute, None)
+        if method is not None:
+            gauges[name] = method()
+    return gauges
+
+
+def _state():
+    """현재 요청의 측정 값 (요청 밖이면 None)"""
+    if not has_request_context():
+        return None
+    return g.get("_metrics")
+
+
+def add_upstream_time(seconds):
+    """외부 이미지 서버 응답 대기 시간 누적 (image_proxy에서 호출)"""
+    state = _state()
+    if state is not None:
+        state["upstream_time"] += seconds
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _before_orm_execute(orm_execute_state):
+    # 커넥션을 받기 전 시각 (이미 커넥션이 있으면 before_cursor_execute에서 지움)
+    state = _state()
+    if state is not None and state["checkout_started"] is None:
+        state["checkout_started"] = perf_counter()
+
+
+@event.listens_for(Pool, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    state = _state()
+    if state is not None and state["checkout_started"] is not None:
+        state["pool_wait"] += perf_counter() - state["checkout_started"]
+        state["checkout_started"] = None
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    state = _state()
+    if state is not None:
+        state["checkout_started"] = None
+        conn.info.setdefault("metrics_started", []).append(perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("metrics_started")
+    state = _state()
+    if state is None or not started:
+        return
+    elapsed = perf_counter() - started.pop()
+    state["sql_count"] += 1
+    state["sql_time"] += elapsed
+    if len(state["statements"]) < MAX_RECORDED_STATEMENTS:
+        state["statements"].append((elapsed, " ".join(statement.split())[:300]))
+
+
+def init_app(app):
+    """요청 전후 측정 훅 등록"""
+
+    @app.before_request
+    def start_request_metrics():
+        g._metrics = {
+            "started": perf_counter(),
+            "sql_count": 0,
+            "sql_time": 0.0,
+            "statements": [],
+            "pool_wait": 0.0,
+            "checkout_started": None,
+            "upstream_time": 0.0,
+        }
+
+    @app.after_request
+    def record_request_metrics(response):
+        state = g.pop("_metrics", None)
+        if state is None:
+            return response
+        duration = perf_counter() - state["started"]
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        labels = (("endpoint", endpoint), ("method", request.method))
+
+        registry = get_registry(app.config)
+        registry.inc("http_requests_total", labels + (("status", str(response.status_code)),))
+        registry.observe("http_request_duration_seconds", labels, duration)
+        registry.observe("db_statements_per_request", labels, state["sql_count"])
+        registry.observe("db_statement_seconds_per_request", labels, state["sql_time"])
+        registry.observe("db_pool_wait_seconds_per_request", labels, state["pool_wait"])
+        if state["upstream_time"]:
+            registry.observe("upstream_fetch_seconds_per_request", labels, state["upstream_time"])
+        registry.maybe_flush()
+
+        if duration * 1000 >= app.config["SLOW_REQUEST_THRESHOLD_MS"]:
+            slowest = sorted(state["statements"], reverse=True)[:5]
+            logger.warning(
+                "slow request %s %s: %.1fms (sql %d statements %.1fms, pool wait %.1fms, upstream %.1fms)%s",
+                request.method, request.path, duration * 1000, state["sql_count"], state["sql_time"] * 1000,
+                state["pool_wait"] * 1000, state["upstream_time"] * 1000,
+                "".join(f"\n  {elapsed * 1000:.1f}ms {statement}" for elapsed, statement in slowest),
+            )
+        return response
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels):
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}" if labels else ""
+
+
+def render(config):
+    """
+    모든 워커의 지표를 합산하여 Prometheus 텍스트 형식으로 반환
+    히스토그램 / 카운터는 종료된 워커 파일까지 합산, 게이지는 살아 있는 워커만 pid 라벨로 출력
+    """
+    registry = get_registry(config)
+    registry.last_flush = 0.0
+    registry.maybe_flush()
+
+    histograms = {}
+    counters = {}
+    gauges = []
+    for path in glob.glob(os.path.join(config["METRICS_DIR"], "*.json")):
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+        except (FileNotFoundError, ValueError):
+            continue
+        for name, labels, data in snapshot["histograms"]:
+            key = (name, tuple(tuple(label) for label in labels))
+            merged = histograms.setdefault(key, [0] * len(data))
+            for index, value in enumerate(data):
+                merged[index] += value
+        for name, labels, value in snapshot["counters"]:
+            key = (name, tuple(tuple(label) for label in labels))
+            counters[key] = counters.get(key, 0) + value
+        if _alive(snapshot["pid"]):
+            gauges.extend((name, snapshot["pid"], value) for name, value in snapshot["gauges"].items())
+
+    lines = ["# HELP http_requests_total 엔드포인트별 응답 수", "# TYPE http_requests_total counter"]
+    for (name, labels), value in sorted(counters.items()):
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+
+    for metric, (description, buckets) in HISTOGRAMS.items():
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} histogram")
+        for (name, labels), data in sorted(histograms.items()):
+            if name != metric:
+                continue
+            for bound, value in zip(buckets, data):
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', bound),))} {value}")
+            lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {data[-1]}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {data[-2]}")
+            lines.append(f"{name}_count{_format_labels(labels)} {data[-1]}")
+
+    for metric in ("db_pool_size", "db_pool_checked_out", "db_pool_overflow"):
+        lines.append(f"# TYPE {metric} gauge")
+        for name, pid, value in sorted(gauges):
+            if name == metric:
+                lines.append(f"{name}{_format_labels((('pid', pid),))} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
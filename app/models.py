@@ -6,6 +6,15 @@ from config import db
 
 KST = ZoneInfo("Asia/Seoul")  # 한국 표준시 설정
 
+
+def parse_datetime(value):
+    """ISO 8601 문자열을 DB에 저장된 형식(KST 기준 naive datetime)으로 변환 (조회 필터용)"""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(KST).replace(tzinfo=None)
+    return parsed
+
+
 class BaseModel(db.Model):  #기본 베이스
     __abstract__ = True
     id = db.Column(db.Integer, primary_key=True)  #기본키 
@@ -46,13 +55,11 @@ class User(BaseModel):  #User (기본모델을 가져옴(상속))
         return {
             "id": self.id,
             "name": self.name,
-            "age": self.age.value if hasattr(self.age, "value") else self.age,
-            "gender": (
-                self.gender.value if hasattr(self.gender, "value") else self.gender
-            ),
+            "age": self.age,
+            "gender": self.gender,
             "email": self.email,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
         }
 
 class Image(BaseModel):  #image 
@@ -61,13 +68,17 @@ class Image(BaseModel):  #image
     type = db.Column(db.Enum(ImageStatus), nullable=False)  #이미지 유형 (image status = main, sub)
     questions = db.relationship("Question", back_populates="image") #Question 테이블 참조 1:N관계 
 
+    __table_args__ = (
+        db.Index("ix_images_type", "type"),  #type(main/sub)으로 조회
+    )
+
     def to_dict(self): #images클래스에서 가져와 id, url, type, 생성시간, 수정시간을 json화
         return {
             "id": self.id,
             "url": self.url,
-            "type": self.type.value if hasattr(self.type, "value") else self.type,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
+            "type": self.type,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
         }
 
 
@@ -78,7 +89,11 @@ class Question(BaseModel): #Question
     sqe = db.Column(db.Integer, nullable=False)  #질문순서
     image_id = db.Column(db.Integer, db.ForeignKey("images.id"), nullable=False)  #image테이블 id와 foreignkey 관계 not null
     image = db.relationship("Image", back_populates="questions") #image테이블 참조 1:N관계 
-    choices = db.relationship("Choices", backref="question", lazy="dynamic")
+    choices = db.relationship("Choices", backref="question", order_by="Choices.sqe")  #선택지 (sqe 순서, eager loading 가능)
+
+    __table_args__ = (
+        db.Index("ix_questions_is_active_sqe", "is_active", "sqe"),  #활성 질문을 순서대로 조회
+    )
 
     def to_dict(self):  #Question테이블에서 가져와 id, title, 활성상태, 순서, image, 생성시간, 수정시간 json화 
         return {
@@ -87,8 +102,8 @@ class Question(BaseModel): #Question
             "is_active": self.is_active,
             "sqe": self.sqe,
             "image": self.image.to_dict() if self.image else None,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
         }
 
 
@@ -100,6 +115,10 @@ class Choices(BaseModel): #Choices
 
     question_id = db.Column(db.Integer, db.ForeignKey("questions.id")) #Question테이블 id와 foreignkey관계 
 
+    __table_args__ = (
+        db.Index("ix_choices_question_id_sqe", "question_id", "sqe"),  #질문별 선택지를 순서대로 조회
+    )
+
     def to_dict(self):  #choices테이블에서 가져와 id, content, 활성상태, 순서, 질문id, 생성시간, 수정시간 json화 
         return {
             "id": self.id,
@@ -107,8 +126,8 @@ class Choices(BaseModel): #Choices
             "is_active": self.is_active,
             "sqe": self.sqe,
             "question_id": self.question_id,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
         }
 
 
@@ -116,13 +135,86 @@ class Answer(BaseModel):  #Answer
     __tablename__ = "answers" #테이블 = answers
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"))  #user_id와 Foreignkey관게
     choice_id = db.Column(db.Integer, db.ForeignKey("choices.id"))  #choice_id와 Foreignkey관계
+    question_id = db.Column(db.Integer, db.ForeignKey("questions.id"))  #선택지의 질문 id (유저당 질문 하나에 답변 하나)
+
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "question_id", name="uq_answers_user_id_question_id"),  #upsert 충돌 기준
+        db.Index("ix_answers_user_id_choice_id", "user_id", "choice_id"),  #(user_id, choice_id)로 조회/수정
+        db.Index("ix_answers_choice_id", "choice_id"),  #선택지 기준 집계/조인
+        db.Index("ix_answers_created_at", "created_at"),  #기간(월) 단위 보관/내보내기 범위 조회
+    )
 
     def to_dict(self):  #Answer테이블에서 가져와 id, user_id, choice_id, 생성시간, 수정시간 json화 
         return {
             "id": self.id,
             "user_id": self.user_id,
+            "question_id": self.question_id,
             "choice_id": self.choice_id,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
         }
-    
+
+
+class AnswerSubmission(BaseModel):  #AnswerSubmission (답변 제출 멱등키)
+    __tablename__ = "answer_submissions" #테이블 = answer_submissions
+    idempotency_key = db.Column(db.String(64), unique=True, nullable=False)  #클라이언트가 보낸 Idempotency-Key
+    result = db.Column(db.JSON, nullable=False)  #최초 처리 결과 (재시도 시 그대로 반환)
+
+
+class AnswerSpoolOffset(BaseModel):  #AnswerSpoolOffset (스풀 파일별 DB 반영 위치)
+    __tablename__ = "answer_spool_offsets" #테이블 = answer_spool_offsets
+    spool_name = db.Column(db.String(100), unique=True, nullable=False)  #스풀 파일 이름
+    position = db.Column(db.BigInteger, nullable=False, default=0)  #answers에 반영된 마지막 바이트 위치
+
+
+class AnswerStat(BaseModel):  #AnswerStat (선택지 x 나이 x 성별 답변 수 집계)
+    __tablename__ = "answer_stats" #테이블 = answer_stats
+    question_id = db.Column(db.Integer, db.ForeignKey("questions.id"), index=True)  #조회용 질문 id
+    choice_id = db.Column(db.Integer, db.ForeignKey("choices.id"), nullable=False)  #선택지 id
+    age = db.Column(db.Enum(AgeStatus), nullable=False)  #응답자 나이대
+    gender = db.Column(db.Enum(GenderStatus), nullable=False)  #응답자 성별
+    count = db.Column(db.Integer, nullable=False, default=0)  #답변 수
+    version = db.Column(db.Integer, nullable=False, default=0)  #변경할 때마다 1씩 증가 (결과 응답 ETag용)
+
+    __table_args__ = (
+        db.UniqueConstraint("choice_id", "age", "gender", name="uq_answer_stats_choice_age_gender"),
+    )
+
+
+class AnswerPeriod(BaseModel):  #AnswerPeriod (월 단위 답변 보관 기록)
+    __tablename__ = "answer_periods" #테이블 = answer_periods
+    period = db.Column(db.String(7), unique=True, nullable=False)  #기간 (YYYY-MM, KST 기준 created_at)
+    status = db.Column(db.String(20), nullable=False)  #archiving(파일 저장 후 answers에서 삭제 중) / archived
+    file = db.Column(db.String(255), nullable=False)  #보관 파일 이름 (ANSWER_ARCHIVE_DIR 기준)
+    row_count = db.Column(db.Integer, nullable=False)  #보관한 답변 수
+    max_answer_id = db.Column(db.Integer, nullable=False)  #보관한 답변의 최대 id (이 id까지만 삭제)
+    loaded_at = db.Column(db.DateTime)  #answers_archive에 다시 불러온 시각 (없으면 불러오지 않음)
+
+
+class AnswerPeriodStat(BaseModel):  #AnswerPeriodStat (보관한 기간의 선택지 x 나이 x 성별 답변 수, 집계 재계산용)
+    __tablename__ = "answer_period_stats" #테이블 = answer_period_stats
+    period = db.Column(db.String(7), nullable=False)  #기간 (YYYY-MM)
+    question_id = db.Column(db.Integer, index=True)  #질문 id (보관한 질문에는 새 답변을 받지 않음)
+    choice_id = db.Column(db.Integer, nullable=False)  #선택지 id (보관 데이터이므로 외래키 없음)
+    age = db.Column(db.Enum(AgeStatus), nullable=False)  #응답자 나이대
+    gender = db.Column(db.Enum(GenderStatus), nullable=False)  #응답자 성별
+    count = db.Column(db.Integer, nullable=False, default=0)  #보관한 답변 수
+
+    __table_args__ = (
+        db.UniqueConstraint("period", "choice_id", "age", "gender", name="uq_answer_period_stats_key"),
+    )
+
+
+class AnswerArchive(db.Model):  #AnswerArchive (보관 파일에서 다시 불러온 답변, 리포트용)
+    __tablename__ = "answers_archive" #테이블 = answers_archive (MySQL은 period 기준 LIST 파티션)
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)  #원래 answers.id
+    period = db.Column(db.String(7), primary_key=True)  #기간 (파티션 키는 기본키에 포함되어야 함)
+    user_id = db.Column(db.Integer, nullable=False)  #유저 id (보관 데이터이므로 외래키 없음)
+    question_id = db.Column(db.Integer)  #질문 id
+    choice_id = db.Column(db.Integer, nullable=False)  #선택지 id
+    created_at = db.Column(db.DateTime, nullable=False)  #답변 생성시간
+    updated_at = db.Column(db.DateTime, nullable=False)  #답변 수정시간
+
+    __table_args__ = (
+        db.Index("ix_answers_archive_period_question_id", "period", "question_id"),  #기간별 질문 집계
+    )
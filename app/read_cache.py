@@ -0,0 +1,99 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, request
+
+from app import content_version
+
+
+class ReadCache:
+    """
+    워커 프로세스별 조회 결과 캐시 (TTL + 최대 항목 수, LRU)
+    설문 내용 버전이 바뀌면 다음 조회 때 모든 항목을 버림
+    """
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> (만료 시각, 값)
+        self.version = None
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_or_load(self, key, loader):
+        version = content_version.current()
+        now = time.monotonic()
+        with self.lock:
+            if version != self.version:
+                # 다른 워커(또는 이 워커)에서 내용이 바뀜
+                if self.entries:
+                    self.invalidations += 1
+                self.entries.clear()
+                self.version = version
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        value = loader()
+
+        with self.lock:
+            # 조회 중 버전이 바뀌었으면 저장하지 않음
+            if self.version == version:
+                self.entries[key] = (now + self.ttl, value)
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def stats(self):
+        with self.lock:
+            return {
+                "pid": os.getpid(),
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """현재 워커의 캐시 (설정값으로 처음 한 번 생성)"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                config = current_app.config
+                _cache = ReadCache(config["READ_CACHE_MAX_ENTRIES"], config["READ_CACHE_TTL"])
+    return _cache
+
+
+def cached(view):
+    """
+    조회 API 응답(본문, 상태 코드)을 요청 경로 기준으로 캐시하는 데코레이터
+    abort로 발생한 오류 응답은 캐시하지 않음
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        def load():
+            response = current_app.make_response(view(*args, **kwargs))
+            return response.get_data(), response.status_code, response.mimetype
+
+        body, status, mimetype = get_cache().get_or_load(request.full_path, load)
+        return current_app.response_class(body, status=status, mimetype=mimetype)
+
+    return wrapper
@@ -0,0 +1,154 @@
+import random
+import threading
+import time
+
+from flask import current_app, g, request
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+
+from app import content_version
+from config import db
+
+SAFE_METHODS = ("GET", "HEAD")  # 복제본으로 보낼 수 있는 요청
+PRIMARY_COOKIE = "db_primary_until"  # 쓰기 직후 조회를 primary로 보낼 기한 (유닉스 시간)
+
+
+class ReplicaSet:
+    """
+    워커별 복제본 상태 관리
+    주기적으로 SELECT 1(MySQL이면 복제 지연까지) 점검, 실패한 복제본은 점검 간격을 두 배씩 늘리며 제외
+    정상 복제본이 없으면 None을 돌려주어 primary 사용
+    """
+
+    def __init__(self, keys, config):
+        self.keys = keys
+        self.interval = config["REPLICA_HEALTH_INTERVAL"]
+        self.max_backoff = config["REPLICA_MAX_BACKOFF"]
+        self.max_lag = config["REPLICA_MAX_LAG_SECONDS"]
+        self.lock = threading.Lock()
+        self.state = {
+            key: {"healthy": True, "failures": 0, "next_check": 0.0, "lag": None, "error": None}
+            for key in keys
+        }
+
+    def choose(self):
+        """정상 복제본 중 하나의 bind 이름 (점검할 때가 된 복제본은 먼저 점검)"""
+        now = time.monotonic()
+        due = [key for key in self.keys if self.state[key]["next_check"] <= now]
+        # 한 스레드만 점검하고 나머지는 마지막 상태를 그대로 사용
+        if due and self.lock.acquire(blocking=False):
+            try:
+                for key in due:
+                    self.check(key)
+            finally:
+                self.lock.release()
+        healthy = [key for key in self.keys if self.state[key]["healthy"]]
+        return random.choice(healthy) if healthy else None
+
+    def check(self, key):
+        try:
+            with db.engines[key].connect() as connection:
+                connection.execute(text("SELECT 1"))
+                lag = _replication_lag(connection)
+        except SQLAlchemyError as e:
+            self.mark_down(key, str(e.orig if getattr(e, "orig", None) else e))
+            return
+        if lag is not None and (lag == float("inf") or lag > self.max_lag):
+            self.mark_down(key, "복제 지연 초과" if lag != float("inf") else "복제 중지", lag)
+            return
+        self.state[key].update(
+            healthy=True, failures=0, next_check=time.monotonic() + self.interval, lag=lag, error=None
+        )
+
+    def mark_down(self, key, error, lag=None):
+        state = self.state[key]
+        state["failures"] += 1
+        backoff = min(self.interval * 2 ** (state["failures"] - 1), self.max_backoff)
+        state.update(healthy=False, next_check=time.monotonic() + backoff, lag=lag, error=error)
+
+    def status(self):
+        now = time.monotonic()
+        return {
+            key: {
+                "healthy": state["healthy"],
+                "failures": state["failures"],
+                "lag_seconds": state["lag"],
+                "next_check_in": round(max(state["next_check"] - now, 0), 1),
+                "error": state["error"],
+            }
+            for key, state in self.state.items()
+        }
+
+
+def _replication_lag(connection):
+    """
+    MySQL 복제 지연(초), 복제가 멈췄으면 inf
+    MySQL이 아니거나 복제 상태를 볼 수 없으면(권한 없음 / 단독 서버) None
+    """
+    if connection.dialect.name != "mysql":
+        return None
+    for statement in ("SHOW REPLICA STATUS", "SHOW SLAVE STATUS"):  # 8.0.22 이전은 SLAVE
+        try:
+            row = connection.execute(text(statement)).mappings().first()
+        except SQLAlchemyError:
+            connection.rollback()
+            continue
+        if row is None:
+            return None
+        lag = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+        return float("inf") if lag is None else float(lag)
+    return None
+
+
+def get_replicas():
+    return current_app.extensions.get("replicas")
+
+
+def primary_required():
+    """
+    조회라도 primary를 써야 하는 경우
+    - 이 클라이언트가 REPLICA_READ_AFTER_WRITE_SECONDS 안에 쓰기 요청을 보냄 (쿠키)
+    - 설문 내용이 방금 바뀜: 복제본의 오래된 내용이 조회 캐시에 들어가지 않도록 모든 워커가 primary 사용
+    """
+    window = current_app.config["REPLICA_READ_AFTER_WRITE_SECONDS"]
+    try:
+        if float(request.cookies.get(PRIMARY_COOKIE, 0)) > time.time():
+            return True
+    except ValueError:
+        pass
+    return time.time_ns() - content_version.current()[1] < window * 1_000_000_000
+
+
+def init_app(app):
+    """복제본이 설정되어 있으면 요청별 라우팅과 장애 감지 등록"""
+    keys = sorted(key for key in app.config.get("SQLALCHEMY_BINDS") or {} if key.startswith("replica_"))
+    if not keys:
+        return
+    replicas = app.extensions["replicas"] = ReplicaSet(keys, app.config)
+
+    with app.app_context():
+        for key in keys:
+            # 요청 중 복제본 연결이 끊기면 바로 제외 (다음 요청부터 primary / 다른 복제본 사용)
+            def mark_down_on_error(context, key=key):
+                if context.is_disconnect or isinstance(context.sqlalchemy_exception, OperationalError):
+                    replicas.mark_down(key, str(context.original_exception))
+
+            event.listen(db.engines[key], "handle_error", mark_down_on_error)
+
+    @app.before_request
+    def route_reads_to_replica():
+        if request.method not in SAFE_METHODS or primary_required():
+            return
+        key = replicas.choose()
+        if key is not None:
+            g.db_replica = db.engines[key]
+
+    @app.after_request
+    def remember_write(response):
+        # 쓰기에 성공한 클라이언트는 잠시 동안 자신이 쓴 내용을 primary에서 읽음
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            window = app.config["REPLICA_READ_AFTER_WRITE_SECONDS"]
+            response.set_cookie(
+                PRIMARY_COOKIE, str(int(time.time() + window) + 1), max_age=window + 1, httponly=True, samesite="Lax"
+            )
+        return response
@@ -1,5 +1,8 @@
-from flask import jsonify
+from flask import jsonify, current_app, Response
 from flask_smorest import Blueprint
+from app.read_cache import get_cache
+from app import metrics
+from app.replicas import get_replicas
 
 api_bp = Blueprint('api', __name__)  # 블루프린트 생성
 
@@ -9,3 +12,28 @@ def index():
     API 연결 상태 확인
     """
     return jsonify({"message": "Success Connect"}), 200
+
+
+@api_bp.route('/cache/stats')
+def cache_stats():
+    """
+    조회 캐시 적중/실패 횟수 (요청을 처리한 워커 기준)
+    """
+    return jsonify(get_cache().stats()), 200
+
+
+@api_bp.route('/db/replicas')
+def replica_status():
+    """
+    읽기 전용 복제본 상태 (요청을 처리한 워커 기준)
+    """
+    replicas = get_replicas()
+    return jsonify(replicas.status() if replicas else {}), 200
+
+
+@api_bp.route('/metrics')
+def prometheus_metrics():
+    """
+    Prometheus 형식 지표 (모든 gunicorn 워커 합산)
+    """
+    return Response(metrics.render(current_app.config), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,73 @@
+import codecs
+import re
+from datetime import date
+from enum import Enum
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson  # 선택 의존성 (없으면 표준 json 사용)
+except ImportError:
+    orjson = None
+
+# orjson과 표준 json의 실수 표기가 다른 경우 (1e16 / 1e+16, 0.00001 / 1e-05)
+# 문자열 안에서 걸리면 표준 json으로 다시 만들 뿐이므로 결과는 항상 같음
+_FLOAT_MISMATCH = re.compile(rb"\d[eE][-\d]|0\.0000")
+
+
+def _escape_non_ascii(error):
+    """ASCII 밖 문자를 표준 json(ensure_ascii)과 같은 \\uXXXX 형식으로 변환 (BMP 문자만)"""
+    return "".join(f"\\u{ord(char):04x}" for char in error.object[error.start:error.end]), error.end
+
+
+codecs.register_error("json_ascii", _escape_non_ascii)
+
+
+def rows_as_dicts(result):
+    """
+    컬럼 튜플 조회 결과를 {컬럼 이름: 값} 리스트로 변환 (ORM 객체를 만들지 않음)
+    Enum / datetime은 그대로 두고 JSON 인코딩 시 변환
+    """
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+
+class JSONProvider(DefaultJSONProvider):
+    """
+    Flask 기본 JSON 프로바이더와 같은 바이트를 만들되, 가능하면 orjson으로 인코딩
+    - Enum은 value, date / datetime은 isoformat()으로 인코딩 (to_dict와 같은 형식)
+    - ensure_ascii 이스케이프, 정렬된 키, 압축 구분자까지 기존 jsonify 결과와 동일
+    - 들여쓰기(디버그 모드), 문자열이 아닌 키, 64비트 초과 정수, BMP 밖 문자 등은 표준 json 사용
+    - NaN / Infinity는 orjson이 null로 인코딩 (표준 json 결과도 유효한 JSON이 아님)
+    """
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, Enum):
+            return o.value
+        if isinstance(o, date):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj, **kwargs):
+        # jsonify(압축 출력)와 같은 인자일 때만 orjson 사용
+        if orjson is not None and kwargs == {"separators": (",", ":")}:
+            body = self._fast_dumps(obj)
+            if body is not None:
+                return body.decode("utf-8")
+        return super().dumps(obj, **kwargs)
+
+    def _fast_dumps(self, obj):
+        """orjson으로 인코딩, 표준 json과 결과가 달라질 수 있으면 None"""
+        try:
+            body = orjson.dumps(obj, default=self.default, option=orjson.OPT_SORT_KEYS if self.sort_keys else 0)
+        except TypeError:
+            return None
+        if _FLOAT_MISMATCH.search(body) or b"\x7f" in body:
+            return None
+        if body.isascii() or not self.ensure_ascii:
+            return body
+        text = body.decode("utf-8")
+        if max(text) > "\uffff":
+            return None  # 표준 json은 서로게이트 쌍(😀)으로 이스케이프
+        return text.encode("ascii", "json_ascii")
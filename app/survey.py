@@ -0,0 +1,66 @@
+import hashlib
+import threading
+
+from flask import current_app
+from sqlalchemy.orm import joinedload, selectinload
+
+from app import content_version
+from app.models import Choices, Question
+
+# 현재 설문 JSON 스냅샷 (한 번 만든 dict는 수정하지 않고 새 dict로 교체, 읽는 쪽은 잠금 없이 참조 하나만 사용)
+_cache = {"version": None, "body": None, "etag": None}
+_lock = threading.Lock()
+
+
+def load_survey():
+    """
+    활성 질문 전체를 sqe 순서로, 이미지 URL과 활성 선택지(sqe 순서)까지 한 번에 로딩
+    질문 + 이미지(JOIN) 1번, 선택지(SELECT IN) 1번으로 설문 크기와 무관하게 쿼리 2개
+    """
+    questions = (
+        Question.query
+        .filter(Question.is_active.is_(True))
+        .options(
+            joinedload(Question.image),
+            selectinload(Question.choices.and_(Choices.is_active.is_(True))),
+        )
+        .order_by(Question.sqe, Question.id)
+        .all()
+    )
+    return {
+        "questions": [
+            {
+                "id": question.id,
+                "title": question.title,
+                "sqe": question.sqe,
+                "image": {"id": question.image.id, "url": question.image.url} if question.image else None,
+                "choices": [
+                    {"id": choice.id, "content": choice.content, "sqe": choice.sqe}
+                    for choice in question.choices
+                ],
+            }
+            for question in questions
+        ]
+    }
+
+
+def get_payload():
+    """
+    직렬화된 설문 JSON과 ETag 반환
+    설문 내용 버전이 바뀌었을 때만 다시 만들고, 그 외에는 메모리에 둔 결과를 재사용
+    """
+    global _cache
+    cached = _cache
+    version = content_version.current()
+    if cached["version"] == version:
+        return cached
+
+    with _lock:
+        cached = _cache
+        if cached["version"] == version:
+            return cached
+        # 버전을 먼저 읽고 조회하므로, 조회 중 변경이 생겨도 다음 요청에서 다시 만듦
+        body = current_app.json.dumps(load_survey()).encode("utf-8") + b"\n"
+        cached = {"version": version, "body": body, "etag": hashlib.sha1(body).hexdigest()}
+        _cache = cached  # 참조 교체 한 번으로 공개 (body / etag가 섞여 보이지 않음)
+    return cached
@@ -0,0 +1,24 @@
+from sqlalchemy.dialects import mysql, sqlite
+
+from config import db
+
+
+def upsert(model, rows, index_elements, update):
+    """
+    DB 고유의 upsert 문장 생성
+    (MySQL: INSERT ... ON DUPLICATE KEY UPDATE, SQLite: INSERT ... ON CONFLICT DO UPDATE)
+
+    index_elements: 충돌을 판단하는 고유 제약 컬럼 이름 리스트 (SQLite용)
+    update: 컬럼 이름 -> 함수(inserted) dict, inserted는 새로 넣으려던 값을 가리킴
+    """
+    dialect = db.session.get_bind(mapper=model).dialect.name
+    if dialect == "mysql":
+        stmt = mysql.insert(model).values(rows)
+        return stmt.on_duplicate_key_update({name: fn(stmt.inserted) for name, fn in update.items()})
+    if dialect == "sqlite":
+        stmt = sqlite.insert(model).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=index_elements,
+            set_={name: fn(stmt.excluded) for name, fn in update.items()},
+        )
+    raise RuntimeError(f"upsert is not supported for {dialect} (supported: mysql, sqlite)")
@@ -0,0 +1,159 @@
+import codecs
+import csv
+import json
+import logging
+from datetime import datetime
+from itertools import islice
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
+
+from config import db
+from app.models import KST, AgeStatus, GenderStatus, User
+
+FORMATS = ("csv", "ndjson")
+FIELDS = ("name", "age", "gender", "email")
+NAME_MAX_LENGTH = User.__table__.c.name.type.length
+EMAIL_MAX_LENGTH = User.__table__.c.email.type.length
+INSERT_RETRIES = 3  # 같은 이메일이 동시에 가입되어 묶음 INSERT가 실패했을 때 다시 검사하는 횟수
+
+logger = logging.getLogger(__name__)
+
+
+def read_records(stream, input_format):
+    """
+    바이너리 스트림에서 (행 번호, dict 또는 None) 을 하나씩 읽음 (파일 전체를 메모리에 올리지 않음)
+    CSV는 헤더 행 기준 (행 번호는 헤더 다음부터 1), NDJSON은 빈 줄 무시, 해석할 수 없는 줄은 None
+    CSV 헤더에 필요한 컬럼이 없으면 첫 행을 읽을 때 ValueError
+    """
+    lines = codecs.getreader("utf-8-sig")(stream)
+    if input_format == "csv":
+        reader = csv.DictReader(lines)
+        missing = [field for field in FIELDS if field not in (reader.fieldnames or ())]
+        if missing:
+            raise ValueError(f"CSV 헤더에 {', '.join(missing)} 컬럼이 없습니다.")
+        for number, record in enumerate(reader, start=1):
+            yield number, record
+        return
+
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield number, record if isinstance(record, dict) else None
+
+
+def _validate(record):
+    """한 행 검사, 저장할 값 dict 또는 오류 메시지 반환"""
+    if record is None:
+        return "Invalid data: row must be a JSON object"
+    values = {field: str(record.get(field) or "").strip() for field in FIELDS}
+    missing = [field for field in FIELDS if not values[field]]
+    if missing:
+        return f"Invalid data: {', '.join(missing)} required"
+    if len(values["name"]) > NAME_MAX_LENGTH:
+        return f"Invalid name: up to {NAME_MAX_LENGTH} characters"
+    if len(values["email"]) > EMAIL_MAX_LENGTH or "@" not in values["email"]:
+        return f"Invalid email: {values['email']}"
+    if values["age"] not in AgeStatus.__members__:
+        return f"Invalid age: {values['age']}"
+    if values["gender"] not in GenderStatus.__members__:
+        return f"Invalid gender: {values['gender']}"
+    return {
+        "name": values["name"],
+        "age": AgeStatus[values["age"]],
+        "gender": GenderStatus[values["gender"]],
+        "email": values["email"],
+    }
+
+
+def _existing(emails):
+    """이메일 목록 중 이미 가입된 것 {소문자 이메일: id} (unique 인덱스로 한 번에 조회)"""
+    rows = db.session.execute(select(User.id, User.email).where(User.email.in_(emails)))
+    return {email.lower(): user_id for user_id, email in rows}
+
+
+def _import_batch(batch, started_after_id):
+    """
+    한 묶음 검사 + 저장 후 행별 결과 리스트 반환 (커밋 포함)
+    - 형식 / Enum 검사, 묶음 안 중복 이메일 (대소문자 무시)
+    - 이미 가입된 이메일은 IN 조회 한 번으로 확인: 가져오기 시작 후 생긴 유저면 파일 안 중복(duplicate), 아니면 exists
+    - 나머지를 다중 행 INSERT 한 번으로 저장하고 이메일로 id 조회
+    """
+    results = {}
+    valid = {}  # 소문자 이메일 -> (행 번호, 값)
+    for number, record in batch:
+        values = _validate(record)
+        if isinstance(values, str):
+            results[number] = {"row": number, "status": "invalid", "msg": values}
+            continue
+        key = values["email"].lower()
+        if key in valid:
+            results[number] = {"row": number, "status": "duplicate", "email": values["email"], "first_row": valid[key][0]}
+            continue
+        valid[key] = (number, values)
+
+    for attempt in range(INSERT_RETRIES):
+        pending = dict(valid)
+        for key, user_id in _existing([values["email"] for _, values in pending.values()]).items():
+            number, values = pending.pop(key)
+            status = "duplicate" if user_id > started_after_id else "exists"
+            results[number] = {"row": number, "status": status, "email": values["email"], "user_id": user_id}
+        if not pending:
+            break
+        now = datetime.now(tz=KST)
+        try:
+            db.session.execute(
+                insert(User), [{**values, "created_at": now, "updated_at": now} for _, values in pending.values()]
+            )
+            created = _existing([values["email"] for _, values in pending.values()])
+            db.session.commit()
+        except IntegrityError:
+            # 검사 후 INSERT 전에 같은 이메일이 가입됨 → 롤백 후 다시 검사
+            db.session.rollback()
+            if attempt == INSERT_RETRIES - 1:
+                raise
+            continue
+        for key, (number, values) in pending.items():
+            results[number] = {"row": number, "status": "created", "user_id": created[key]}
+        break
+    return [results[number] for number, _ in batch]
+
+
+def import_users(records, batch_rows):
+    """
+    (행 번호, dict) 이터레이터를 batch_rows개씩 저장하면서 행별 결과를 하나씩 반환
+    마지막에 {"summary": {상태: 개수}, "complete": True} 반환 / 메모리 사용량은 묶음 크기에만 비례
+    첫 결과를 반환하기 전(헤더, 첫 묶음)의 오류는 그대로 전달 (호출자가 응답을 시작하기 전에 4xx / 5xx로 응답)
+    이후 읽기 / 저장 오류는 {"status": "error", "after_row": 마지막으로 처리한 행, "msg"} 와
+    {"summary": ..., "complete": False}를 반환하고 멈춤 (앞 묶음은 이미 커밋됨, after_row 다음 행부터 다시 가져오면 됨)
+    """
+    started_after_id = db.session.execute(select(func.max(User.id))).scalar() or 0
+    db.session.commit()
+    summary = {"created": 0, "exists": 0, "duplicate": 0, "invalid": 0}
+    records = iter(records)
+    started = False
+    after_row = 0
+    while True:
+        try:
+            batch = list(islice(records, batch_rows))
+            results = _import_batch(batch, started_after_id) if batch else []
+        except Exception as e:
+            if not started:
+                raise
+            db.session.rollback()
+            logger.exception("user import stopped after row %d", after_row)
+            yield {"status": "error", "after_row": after_row, "msg": str(e)}
+            yield {"summary": summary, "complete": False}
+            return
+        if not batch:
+            break
+        for result in results:
+            summary[result["status"]] += 1
+            started = True
+            yield result
+        after_row = batch[-1][0]
+    yield {"summary": summary, "complete": True}
@@ -1,40 +1,127 @@
-from flask import jsonify, request, abort
+from flask import jsonify, request, abort, current_app, stream_with_context
 from flask_smorest import Blueprint
-from ..models import Answer, db
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, OperationalError, TimeoutError as PoolTimeoutError
+from ..models import Answer, AnswerSubmission, db
+from ..answer_ingest import insert_answers, parse_items, replace_answers, validate_items
+from ..serializers import rows_as_dicts
+from .. import admission, answer_archive, answer_spool, answer_stats, exports
 
 answer_bp = Blueprint("Answer", __name__, url_prefix="/submit")
 
 @answer_bp.route("/", methods=["POST"])
+@admission.limit("submit")
 def create_answers():
     """
     답변 생성 API
+    전체 항목을 한 번에 검증하고 다중 행 INSERT로 저장
+    Idempotency-Key 헤더가 있으면 같은 키로 재시도할 때 저장된 결과를 그대로 반환
+    스풀 모드에서는 스풀 파일에 기록한 뒤 바로 202 응답 (DB 저장은 백그라운드)
     """
     try:
         # 요청으로부터 JSON 데이터 가져오기
         data = request.get_json()
+        if not isinstance(data, list):
+            return jsonify({"msg": "Invalid data: a list of answers is required"}), 400
+
+        idempotency_key = request.headers.get("Idempotency-Key")
+        if idempotency_key and len(idempotency_key) > 64:
+            return jsonify({"msg": "Invalid Idempotency-Key: up to 64 characters"}), 400
+
+        if current_app.config["ANSWER_INGEST_MODE"] == "spool":
+            # 형식만 검사하고 스풀에 기록 (존재 여부 검증은 백그라운드 저장 시)
+            parsed, errors = parse_items(data)
+            if not parsed:
+                return jsonify({"msg": "Invalid data: no valid answers", "errors": errors}), 400
+            items = [{"userId": user_id, "choiceId": choice_id} for _, user_id, choice_id in parsed]
+            answer_spool.get_spool(current_app._get_current_object()).append(items, idempotency_key)
+            return jsonify({"msg": "Accepted answers.", "queued": len(items), "errors": errors}), 202
+
+        # 같은 키로 이미 처리된 요청이면 저장된 결과 반환
+        if idempotency_key:
+            submission = AnswerSubmission.query.filter_by(idempotency_key=idempotency_key).first()
+            if submission:
+                return jsonify(submission.result), 200
+
+        # userId와 choiceId 유효성 검사 (항목별 오류 수집)
+        rows, errors = validate_items(data)
+        if not rows:
+            return jsonify({"msg": "Invalid data: no valid answers", "errors": errors}), 400
+
+        # 유효한 답변을 한 번에 저장 후 커밋 (INSERT를 바로 실행하므로 중복 충돌은 커밋 전에도 발생)
+        try:
+            result = {
+                "msg": "Successfully created answers.",
+                "created": insert_answers(rows),
+                "errors": errors,
+            }
+            if idempotency_key:
+                db.session.add(AnswerSubmission(idempotency_key=idempotency_key, result=result))
+            db.session.commit()
+        except IntegrityError:
+            # 같은 키로 동시에 들어온 재시도가 먼저 커밋된 경우
+            db.session.rollback()
+            if idempotency_key:
+                submission = AnswerSubmission.query.filter_by(idempotency_key=idempotency_key).first()
+                if submission:
+                    return jsonify(submission.result), 200
+            # 같은 유저의 같은 질문 답변이 동시에 저장된 경우 (uq_answers_user_id_question_id)
+            return jsonify({"msg": "Conflict: some questions were answered concurrently, please retry"}), 409
 
-        # 데이터를 순회하며 각 답변을 데이터베이스에 추가
-        for answer in data:
-            user_id = answer.get("userId")
-            choice_id = answer.get("choiceId")
+        # 성공 응답 반환
+        return jsonify(result), 201
 
-            # userId와 choiceId 유효성 검사
-            if not user_id or not choice_id:
-                return jsonify({"msg": "Invalid data: userId and choiceId are required"}), 400
+    except (OperationalError, PoolTimeoutError):
+        raise  # DB 잠금 / 연결 오류, 커넥션 풀 대기 초과 → 503
 
-            # Answer 객체 생성 및 데이터베이스에 추가
-            new_answer = Answer(user_id=user_id, choice_id=choice_id)
-            db.session.add(new_answer)
+    except Exception as e:
+        # 에러 처리
+        db.session.rollback()
+        abort(500, description=f"An error occurred while creating answers: {str(e)}")
+
+@answer_bp.route("/<int:user_id>", methods=["PUT"])
+@admission.limit("submit")
+def replace_user_answers(user_id):
+    """
+    유저 답변 일괄 수정 API
+    [{"choiceId": ...}] 목록의 질문별 답변을 한 트랜잭션, 한 문장의 upsert로 교체 (없던 질문은 추가)
+    저장된 행을 다시 조회하지 않고 항목별 결과(created / updated / unchanged)를 반환
+    """
+    try:
+        data = request.get_json()
+        if not isinstance(data, list) or not data:
+            return jsonify({"msg": "Invalid data: a list of answers is required"}), 400
+
+        answers, errors = replace_answers(user_id, data)
+        if answers is None:
+            return jsonify({"msg": f"Not found user_id: {user_id}"}), 404
+        if not answers:
+            db.session.rollback()
+            return jsonify({"msg": "Invalid data: no valid answers", "errors": errors}), 400
 
-        # 데이터베이스 커밋
         db.session.commit()
+        return jsonify({"msg": "Successfully saved answers.", "answers": answers, "errors": errors}), 200
 
-        # 성공 응답 반환
-        return jsonify({"msg": "Successfully created answers."}), 201
+    except (OperationalError, PoolTimeoutError):
+        raise  # DB 잠금 / 연결 오류, 커넥션 풀 대기 초과 → 503
 
     except Exception as e:
         # 에러 처리
-        abort(500, description=f"An error occurred while creating answers: {str(e)}")
+        db.session.rollback()
+        abort(500, description=f"An error occurred while saving answers: {str(e)}")
+
+@answer_bp.route("/status", methods=["GET"])
+def get_submit_status():
+    """
+    답변 저장 큐 상태 조회 API (스풀 대기 답변 수, 반영 지연 시간)
+    """
+    try:
+        return jsonify(answer_spool.status(current_app.config)), 200
+    except (OperationalError, PoolTimeoutError):
+        raise  # DB 잠금 / 연결 오류, 커넥션 풀 대기 초과 → 503
+    except Exception as e:
+        # 에러 처리
+        abort(500, description=f"An error occurred while fetching submit status: {str(e)}")
 
 @answer_bp.route("/<int:user_id>/<int:choice_id>", methods=["GET"])
 def get_answers(user_id, choice_id):
@@ -43,15 +130,20 @@ def get_answers(user_id, choice_id):
     """
     try:
         # 주어진 user_id와 choice_id로 답변 조회
-        answers = Answer.query.filter_by(user_id=user_id, choice_id=choice_id).all()
+        answers = rows_as_dicts(db.session.execute(
+            select(Answer.id, Answer.user_id, Answer.choice_id, Answer.created_at, Answer.updated_at)
+            .where(Answer.user_id == user_id, Answer.choice_id == choice_id)
+        ))
 
         # 답변이 없으면 메시지 반환
         if not answers:
             return jsonify({"msg": "No found data"}), 404
 
-        # 결과를 JSON 형태로 반환
-        result = [answer.to_dict() for answer in answers]
-        return jsonify(result), 200
+        # 결과를 JSON 형태로 반환 (datetime은 JSON 프로바이더가 isoformat으로 변환)
+        return jsonify(answers), 200
+
+    except (OperationalError, PoolTimeoutError):
+        raise  # DB 잠금 / 연결 오류, 커넥션 풀 대기 초과 → 503
 
     except Exception as e:
         # 에러 처리
@@ -72,18 +164,71 @@ def update_answer(user_id, choice_id):
 
         # 요청 데이터 가져오기
         data = request.get_json()
+        before = (answer.user_id, answer.choice_id)
 
         # Answer 객체의 속성 업데이트
         for key, value in data.items():
-            if hasattr(answer, key):  # answer 객체에 해당 속성이 존재하는지 확인
+            if hasattr(answer, key) and key != "question_id":  # 속성이 존재하는지 확인 (question_id는 선택지에서 결정)
                 setattr(answer, key, value)  # 해당 속성 값 업데이트
 
-        # 데이터베이스에 변경사항 커밋
-        db.session.commit()
+        try:
+            # user_id / choice_id가 바뀌면 질문 id와 결과 집계도 옮김 (같은 트랜잭션)
+            after = (int(answer.user_id), int(answer.choice_id))
+            if after != before:
+                # 바뀐 값을 flush하기 전에 조회 (없는 user / choice면 FK 오류 대신 404)
+                with db.session.no_autoflush:
+                    new_rows = answer_stats.describe([after])
+                    old_rows = answer_stats.describe([before])
+                if not new_rows:
+                    db.session.rollback()
+                    return jsonify({"msg": "Not found user_id or choice_id"}), 404
+                # 보관한 질문으로 옮기면 보관된 답변과 중복될 수 있으므로 거절
+                question_id = new_rows[0]["question_id"]
+                moved = not old_rows or (old_rows[0]["user_id"], old_rows[0]["question_id"]) != (after[0], question_id)
+                if moved and question_id is not None and answer_archive.archived_questions([question_id]):
+                    db.session.rollback()
+                    return jsonify({"msg": f"Conflict: question_id {question_id} is archived"}), 409
+                answer.question_id = new_rows[0]["question_id"]
+                deltas = answer_stats.count(old_rows, -1)
+                deltas.update(answer_stats.count(new_rows))
+                answer_stats.apply(deltas)
+
+            # 데이터베이스에 변경사항 커밋
+            db.session.commit()
+        except IntegrityError:
+            # 바뀐 유저가 그 질문에 이미 답한 경우 (uq_answers_user_id_question_id)
+            db.session.rollback()
+            return jsonify({"msg": "Conflict: the user already answered this question"}), 409
 
         # 수정된 객체를 JSON으로 반환
         return jsonify(answer.to_dict()), 200
 
+    except (OperationalError, PoolTimeoutError):
+        raise  # DB 잠금 / 연결 오류, 커넥션 풀 대기 초과 → 503
+
     except Exception as e:
         # 에러 처리
-        abort(500, description=f"An error occurred while updating the answer: {str(e)}")
\ No newline at end of file
+        abort(500, description=f"An error occurred while updating the answer: {str(e)}")
+
+@answer_bp.route("/admin/export", methods=["GET"])
+def export_answers():
+    """
+    답변 분석용 내보내기 API (답변 + 유저 나이/성별 + 질문/선택지 내용, 스트리밍)
+    format=csv | ndjson, gzip=1, created_from / created_to (ISO 8601), question_id=1,2, active_only=1
+    """
+    output_format = request.args.get("format", "csv")
+    if output_format not in exports.FORMATS:
+        return jsonify({"msg": f"Invalid format: {output_format}"}), 400
+    try:
+        filters = exports.answer_filters(request.args)
+    except ValueError as e:
+        return jsonify({"msg": str(e)}), 400
+
+    compress = request.args.get("gzip", "").lower() in ("1", "true", "yes")
+    filename = f"answers.{output_format}" + (".gz" if compress else "")
+    response = current_app.response_class(
+        stream_with_context(exports.generate(filters, output_format, compress)),
+        mimetype="application/gzip" if compress else exports.MIMETYPES[output_format],
+    )
+    response.headers["Content-Disposition"] = f"attachment; filename={filename}"
+    return response
@@ -1,34 +1,32 @@
 from flask import jsonify, abort, request
 from flask_smorest import Blueprint
+from sqlalchemy import select
 from app.models import db, Choices
+from app.serializers import rows_as_dicts
+from app.read_cache import cached
+from app.http_cache import cache_policy
+from app.views.questions import CONTENT_MAX_AGE
 
 choices_bp = Blueprint("choices", __name__, url_prefix="/choice")
 
 @choices_bp.route("/<int:question_id>", methods=["GET"])
+@cache_policy(max_age=CONTENT_MAX_AGE)
+@cached
 def get_choices_by_question(question_id):
     """
     특정 질문의 선택지 리스트 반환
     """
     try:
-        # 특정 질문의 선택지 필터링
-        choices = Choices.query.filter_by(question_id=question_id).all()
+        # 특정 질문의 선택지 필터링 (필요한 컬럼만 튜플로 조회)
+        choices = rows_as_dicts(db.session.execute(
+            select(Choices.id, Choices.content, Choices.is_active).where(Choices.question_id == question_id)
+        ))
         
         # 선택지 리스트가 비어있으면 404 반환
         if not choices:
             return jsonify({"message": f"ID {question_id}의 선택지를 찾을 수 없습니다."}), 404
 
-        # 선택지 데이터를 JSON으로 변환
-        result = {
-            "choices": [
-                {
-                    "id": choice.id,
-                    "content": choice.content,
-                    "is_active": choice.is_active,
-                }
-                for choice in choices
-            ]
-        }
-        return jsonify(result), 200
+        return jsonify({"choices": choices}), 200
 
     except Exception as e:
         # 에러 처리
@@ -1,9 +1,17 @@
-import requests
-from flask import request, jsonify, abort, Response
+from flask import request, jsonify, abort, Response, current_app
 from flask_smorest import Blueprint
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import OperationalError, SQLAlchemyError, TimeoutError as PoolTimeoutError
 from flask.views import MethodView
 from app.models import db, Image, ImageStatus
+from app import admission, image_cache, image_variants
+from app.image_proxy import (
+    PASSTHROUGH_STATUS,
+    forward_headers,
+    iter_upstream,
+    open_upstream,
+    passthrough_headers,
+    request_error,
+)
 
 # Blueprint 생성
 images_bp = Blueprint("images", __name__, url_prefix="/image")
@@ -21,41 +29,77 @@ def get_main_image():
 
 
 @images_bp.route("/<int:image_id>", methods=["GET"])
+@admission.limit("image")
 def get_image_by_id(image_id):
     """
     특정 이미지를 조회하고, Flask가 중계(proxy)하도록 설정
+    로컬 캐시에 있으면 캐시 파일로 바로 응답
+    w / format 쿼리가 있으면 줄이고 다시 인코딩한 변형 이미지로 응답 (예: ?w=320&format=webp)
     """
+    config = current_app.config
+    try:
+        variant = image_variants.parse_params(request.args, config)
+    except ValueError as e:
+        abort(400, description=str(e))
+
     try:
         # 이미지 ID로 데이터 조회
         image = Image.query.get(image_id)
         if not image:
             abort(404, description=f"ID {image_id}의 이미지를 찾을 수 없습니다.")
-        
-        # 외부 이미지 요청을 Flask가 중계
-        return proxy_image(image.url)
+        image_url = image.url
+        # 원본 서버를 기다리는 동안 DB 커넥션을 잡고 있지 않도록 바로 반환
+        db.session.close()
+    except (OperationalError, PoolTimeoutError):
+        raise  # DB 잠금 / 연결 오류, 커넥션 풀 대기 초과 → 503
     except SQLAlchemyError as e:
         abort(500, description=f"이미지 조회 중 오류가 발생했습니다: {str(e)}")
 
+    if image_cache.enabled(config):
+        try:
+            cached = image_cache.lookup(config, image_id, image_url)
+            if cached is None or image_cache.is_stale(config, cached):
+                # 캐시에 없거나 오래된 항목이면 원본 서버에서 받거나 재검증
+                cached = image_cache.fill(config, image_id, image_url, cached)
+        except request_error():
+            cached = None
+        if cached is not None:
+            if variant is not None and image_variants.enabled(config):
+                # 캐시된 원본으로 변형 이미지 생성 (변환할 수 없으면 원본으로 응답)
+                try:
+                    return image_variants.serve(image_variants.get(config, image_id, cached, *variant), variant[1], cached)
+                except Exception as e:
+                    current_app.logger.warning("image variant failed: id=%s params=%s: %r", image_id, variant, e)
+            return image_cache.serve(config, cached)
+
+    # 캐시할 수 없으면 외부 이미지 요청을 Flask가 중계
+    return proxy_image(image_url)
+
 
 def proxy_image(image_url):
     """
     외부 이미지 URL을 Flask가 중계하여 반환
+    (워커 공용 연결 풀 사용, 본문은 메모리에 모으지 않고 청크 단위로 스트리밍)
     """
+    config = current_app.config
     try:
-        # 외부 URL로 이미지 요청
-        response = requests.get(image_url, stream=True)
-        if response.status_code == 200:
-            # 성공 시 이미지 데이터를 반환
-            return Response(
-                response.content,
-                content_type=response.headers.get("Content-Type"),
-                status=response.status_code
-            )
-        else:
-            abort(502, description="외부 서버에서 이미지를 가져오는 데 실패했습니다.")
-    except requests.exceptions.RequestException as e:
+        # 외부 URL로 이미지 요청 (Range / 조건부 요청 헤더 전달)
+        upstream = open_upstream(image_url, config, forward_headers(request.headers))
+    except request_error() as e:
         abort(502, description=f"이미지 요청 중 오류가 발생했습니다: {str(e)}")
 
+    if upstream.status_code not in PASSTHROUGH_STATUS:
+        upstream.close()
+        abort(502, description="외부 서버에서 이미지를 가져오는 데 실패했습니다.")
+
+    # 성공 시 받은 청크를 바로 클라이언트로 전달
+    return Response(
+        iter_upstream(upstream, config["IMAGE_PROXY_CHUNK_SIZE"]),
+        status=upstream.status_code,
+        headers=passthrough_headers(upstream),
+        direct_passthrough=True,
+    )
+
 #이미지 생성
 @images_bp.route("/", methods=["POST"])
 def create_image():
@@ -74,6 +118,9 @@ def create_image():
         new_image = Image(url=url, type=ImageStatus[image_type])
         db.session.add(new_image)
         db.session.commit()
+
+        # 새 이미지를 백그라운드에서 미리 캐시
+        image_cache.warm(current_app.config, new_image.id, new_image.url)
         return jsonify({
             "message": f"ID {new_image.id} 이미지가 성공적으로 생성되었습니다.",
             "image": new_image.to_dict(),
@@ -93,6 +140,10 @@ def delete_image(image_id):
         # 이미지 삭제
         db.session.delete(image)
         db.session.commit()
+
+        # 캐시된 이미지 파일과 변형 이미지도 함께 삭제
+        image_cache.invalidate(current_app.config, image_id)
+        image_variants.invalidate(current_app.config, image_id)
         return jsonify({"message": f"ID {image_id}의 이미지가 삭제되었습니다."}), 200
     except SQLAlchemyError as e:
         db.session.rollback()
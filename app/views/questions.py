@@ -1,37 +1,59 @@
-from flask import request, jsonify
+from flask import request, jsonify, current_app
 from flask_smorest import Blueprint, abort
+from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 from app.models import db, Question, Image, Choices
+from app.serializers import rows_as_dicts
+from app.survey import get_payload
+from app.read_cache import cached
+from app.http_cache import cache_policy
+
+# 설문 내용 조회의 브라우저 / nginx 재사용 시간 (초), 수정 내용은 최대 이 시간 뒤 반영
+CONTENT_MAX_AGE = 10
 
 # Blueprint 생성
 questions_bp = Blueprint("questions", __name__)
 
 @questions_bp.route("/question", methods=["GET"])
+@cache_policy(max_age=CONTENT_MAX_AGE)
+@cached
 def get_all_questions():
 
     try:
-        questions = Question.query.all()
-        result = [
-            {
-                "id": question.id,
-                "title": question.title,
-                "is_active": question.is_active,
-                "sqe": question.sqe,
-                "image_id": question.image_id,
-            }
-            for question in questions
-        ]
+        # 필요한 컬럼만 튜플로 조회 (ORM 객체 생성 없음)
+        result = rows_as_dicts(db.session.execute(
+            select(Question.id, Question.title, Question.is_active, Question.sqe, Question.image_id)
+        ))
         return jsonify(result), 200
     except SQLAlchemyError as e:
         abort(500, message=f"질문 조회 중 오류가 발생했습니다: {str(e)}")
 
+@questions_bp.route("/survey", methods=["GET"])
+@cache_policy(max_age=CONTENT_MAX_AGE)
+def get_survey():
+    """
+    설문 전체(활성 질문 + 이미지 URL + 활성 선택지)를 한 번에 반환
+    ETag가 같으면 304 응답
+    """
+    try:
+        payload = get_payload()
+    except SQLAlchemyError as e:
+        abort(500, message=f"설문 조회 중 오류가 발생했습니다: {str(e)}")
+    response = current_app.response_class(payload["body"], mimetype="application/json")
+    response.set_etag(payload["etag"])
+    return response.make_conditional(request)
+
 @questions_bp.route("/questions/count", methods=["GET"])
+@cache_policy(max_age=CONTENT_MAX_AGE)
+@cached
 def count_questions():
     """질문 개수 확인"""
     total_questions = Question.query.count()
     return jsonify({"total": total_questions}), 200
 
 @questions_bp.route("/question/<int:question_id>", methods=["GET"])
+@cache_policy(max_age=CONTENT_MAX_AGE)
+@cached
 def get_question(question_id):
     """특정 질문 가져오기"""
     question = Question.query.get(question_id)
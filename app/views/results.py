@@ -0,0 +1,95 @@
+from flask import jsonify
+from flask_smorest import Blueprint, abort
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+from app.models import db, AnswerStat, Choices, Question
+from app.http_cache import cache_policy
+
+# Blueprint 생성
+results_bp = Blueprint("results", __name__, url_prefix="/results")
+
+
+def _results(question_ids=None):
+    """
+    질문별 선택지 답변 수 (나이 / 성별 분포 포함)
+    answer_stats 집계 테이블만 읽으므로 답변 수와 무관하게 조회 비용이 일정함
+    (answers에서 보관 파일로 옮긴 기간의 답변도 포함)
+    """
+    stmt = (
+        select(
+            Choices.question_id, Choices.id, Choices.content, Choices.sqe,
+            AnswerStat.age, AnswerStat.gender, AnswerStat.count,
+        )
+        .outerjoin(AnswerStat, AnswerStat.choice_id == Choices.id)
+        .order_by(Choices.question_id, Choices.sqe, Choices.id)
+    )
+    if question_ids is not None:
+        stmt = stmt.where(Choices.question_id.in_(question_ids))
+
+    questions = {}
+    for question_id, choice_id, content, sqe, age, gender, count in db.session.execute(stmt):
+        question = questions.setdefault(question_id, {"question_id": question_id, "total": 0, "choices": {}})
+        choice = question["choices"].setdefault(choice_id, {
+            "choice_id": choice_id,
+            "content": content,
+            "sqe": sqe,
+            "total": 0,
+            "by_age": {},
+            "by_gender": {},
+            "breakdown": [],
+        })
+        if not count:
+            continue
+        question["total"] += count
+        choice["total"] += count
+        choice["by_age"][age.value] = choice["by_age"].get(age.value, 0) + count
+        choice["by_gender"][gender.value] = choice["by_gender"].get(gender.value, 0) + count
+        choice["breakdown"].append({"age": age.value, "gender": gender.value, "count": count})
+
+    return [
+        {**question, "choices": list(question["choices"].values())}
+        for question in questions.values()
+    ]
+
+
+def _results_version(question_id=None):
+    """
+    결과 응답의 검증 값: 집계 / 선택지 행의 max(updated_at)과 개수, 집계 행의 sum / max(version) (쿼리 한 번)
+    updated_at은 초 단위라 같은 초 안의 답변 수 변경을 놓칠 수 있으므로 version으로 구분
+    (답변 수가 바뀌면 sum(version)이, 집계를 다시 만들면 max(version)이 커짐)
+    """
+    stats = [AnswerStat.question_id == question_id] if question_id is not None else []
+    choices = [Choices.question_id == question_id] if question_id is not None else []
+    return db.session.execute(select(
+        select(func.max(AnswerStat.updated_at)).where(*stats).scalar_subquery(),
+        select(func.count(AnswerStat.id)).where(*stats).scalar_subquery(),
+        select(func.sum(AnswerStat.version)).where(*stats).scalar_subquery(),
+        select(func.max(AnswerStat.version)).where(*stats).scalar_subquery(),
+        select(func.max(Choices.updated_at)).where(*choices).scalar_subquery(),
+        select(func.count(Choices.id)).where(*choices).scalar_subquery(),
+    )).one()
+
+
+@results_bp.route("/", methods=["GET"])
+@cache_policy(_results_version, max_age=5)
+def get_all_results():
+    """전체 질문의 선택지별 답변 수"""
+    try:
+        return jsonify(_results()), 200
+    except SQLAlchemyError as e:
+        abort(500, message=f"결과 조회 중 오류가 발생했습니다: {str(e)}")
+
+
+@results_bp.route("/<int:question_id>", methods=["GET"])
+@cache_policy(_results_version, max_age=5)
+def get_question_results(question_id):
+    """특정 질문의 선택지별 답변 수 (나이 / 성별 분포)"""
+    try:
+        results = _results([question_id])
+        if not results:
+            if not db.session.get(Question, question_id):
+                abort(404, message=f"ID {question_id}의 질문을 찾을 수 없습니다.")
+            results = [{"question_id": question_id, "total": 0, "choices": []}]
+        return jsonify(results[0]), 200
+    except SQLAlchemyError as e:
+        abort(500, message=f"결과 조회 중 오류가 발생했습니다: {str(e)}")
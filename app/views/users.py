@@ -1,13 +1,20 @@
-from flask import request, jsonify
+import gzip
+from functools import partial
+from flask import request, jsonify, current_app, stream_with_context
 from flask_smorest import Blueprint, abort
-from sqlalchemy.exc import SQLAlchemyError
-from app.models import db, User, AgeStatus, GenderStatus
+from sqlalchemy import and_, select, true
+from sqlalchemy.exc import IntegrityError, OperationalError, SQLAlchemyError, TimeoutError as PoolTimeoutError
+from app.models import db, User, Answer, Question, AgeStatus, GenderStatus, parse_datetime
+from app.serializers import rows_as_dicts
+from app import admission, user_import
+from app.http_cache import cache_policy
 
 # Blueprint 생성
 users_bp = Blueprint("users", __name__)
 
 # 유저 생성/signup
 @users_bp.route("/signup", methods=["POST"])
+@admission.limit("signup")
 def signup():
     try:
         # 요청 데이터 받아오기
@@ -43,7 +50,12 @@ def signup():
             gender=gender_status
         )
         db.session.add(new_user)  # 세션에 추가
-        db.session.commit()  # 데이터베이스에 커밋
+        try:
+            db.session.commit()  # 데이터베이스에 커밋
+        except IntegrityError:
+            # 중복 체크 후 커밋 전에 같은 이메일이 가입된 경우 (email unique 제약)
+            db.session.rollback()
+            return jsonify({'message': '이미 존재하는 계정입니다.'}), 400
 
         # 성공 메시지 반환
         return jsonify({
@@ -51,6 +63,9 @@ def signup():
             'user_id': new_user.id
         }), 201
 
+    except (OperationalError, PoolTimeoutError):
+        raise  # DB 잠금 / 연결 오류, 커넥션 풀 대기 초과 → 503
+
     except SQLAlchemyError as e:
         # 데이터베이스 관련 오류 처리
         db.session.rollback()  # 트랜잭션 롤백
@@ -60,24 +75,222 @@ def signup():
         # 그 외 예상치 못한 오류 처리
         return jsonify({'message': f'예상치 못한 오류가 발생했습니다: {str(e)}'}), 500
 
+# 유저 일괄 가입
+@users_bp.route("/users/import", methods=["POST"])
+@admission.limit("import")
+def import_users():
+    """
+    유저 일괄 가입 (CSV 헤더: name,age,gender,email 또는 NDJSON, Content-Encoding: gzip 가능)
+    형식은 format 쿼리 또는 Content-Type(text/csv, application/x-ndjson)으로 지정
+    요청 본문을 읽으면서 USER_IMPORT_BATCH_ROWS개씩 검사 / 저장하고 행별 결과를 NDJSON으로 바로 응답
+    (created / exists / duplicate / invalid, 마지막 줄은 summary)
+    헤더와 첫 묶음은 응답을 시작하기 전에 처리 (헤더 누락 / 압축 / 인코딩 오류는 400)
+    도중에 실패하면 error 줄과 complete가 false인 summary 줄로 끝남
+    """
+    input_format = request.args.get("format") or {
+        "text/csv": "csv",
+        "application/x-ndjson": "ndjson",
+    }.get(request.mimetype)
+    if input_format not in user_import.FORMATS:
+        return jsonify({"message": "format은 csv 또는 ndjson이어야 합니다."}), 400
+
+    stream = request.stream
+    if request.headers.get("Content-Encoding", "").lower() == "gzip":
+        stream = gzip.GzipFile(fileobj=stream, mode="rb")
+    dumps = partial(current_app.json.dumps, separators=(",", ":"))
+    batch_rows = current_app.config["USER_IMPORT_BATCH_ROWS"]
+
+    results = user_import.import_users(user_import.read_records(stream, input_format), batch_rows)
+    try:
+        first = next(results)
+    except (ValueError, OSError, EOFError) as e:  # 헤더 누락, 인코딩 / gzip 오류
+        db.session.rollback()
+        return jsonify({"message": f"가져올 수 없는 파일입니다: {str(e)}"}), 400
+
+    def generate():
+        yield dumps(first) + "\n"
+        for result in results:
+            yield dumps(result) + "\n"
+
+    return current_app.response_class(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+# 목록 조회에서 읽는 컬럼 (ORM 객체를 만들지 않고 튜플로 조회, User.to_dict()와 같은 키)
+USER_COLUMNS = (User.id, User.name, User.age, User.gender, User.email, User.created_at, User.updated_at)
+DEFAULT_PAGE_LIMIT = 100  # limit 생략 시 페이지 크기
+MAX_PAGE_LIMIT = 1000  # 페이지 최대 크기
+EXPORT_BATCH_SIZE = 1000  # 스트리밍 시 서버 측 커서에서 한 번에 가져오는 행 수
+
+
+def _user_filters(args):
+    """
+    쿼리 문자열의 age, gender, created_from, created_to 필터를 조건 리스트로 변환
+    잘못된 값이면 ValueError
+    """
+    filters = []
+    if args.get("age"):
+        if args["age"] not in AgeStatus.__members__:
+            raise ValueError(f"유효하지 않은 age 값입니다: {args['age']}")
+        filters.append(User.age == AgeStatus[args["age"]])
+    if args.get("gender"):
+        if args["gender"] not in GenderStatus.__members__:
+            raise ValueError(f"유효하지 않은 gender 값입니다: {args['gender']}")
+        filters.append(User.gender == GenderStatus[args["gender"]])
+    if args.get("created_from"):
+        filters.append(User.created_at >= parse_datetime(args["created_from"]))
+    if args.get("created_to"):
+        filters.append(User.created_at < parse_datetime(args["created_to"]))
+    return filters
+
+
+def _int_arg(args, name, default):
+    """정수 쿼리 문자열 값 (없으면 기본값, 정수가 아니면 ValueError)"""
+    value = args.get(name)
+    if value is None:
+        return default
+    if not value.strip().isdigit():
+        raise ValueError(f"유효하지 않은 {name} 값입니다: {value}")
+    return int(value)
+
+
+def _stream_users(filters, output_format):
+    """
+    서버 측 커서(yield_per)로 유저를 읽으면서 JSON 배열 또는 NDJSON으로 바로 내보냄
+    테이블 크기와 무관하게 메모리 사용량이 일정함
+    """
+    dumps = partial(current_app.json.dumps, separators=(",", ":"))
+    stmt = select(*USER_COLUMNS).where(*filters).order_by(User.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+    def generate():
+        result = db.session.execute(stmt)
+        keys = list(result.keys())
+        first = True
+        if output_format == "json":
+            yield "["
+        for rows in result.partitions():
+            users = [dict(zip(keys, row)) for row in rows]
+            if output_format == "ndjson":
+                yield "".join(dumps(user) + "\n" for user in users)
+            else:
+                chunk = dumps(users)[1:-1]  # 배치 단위로 한 번에 인코딩 후 대괄호 제거
+                yield chunk if first else "," + chunk
+                first = False
+        if output_format == "json":
+            yield "]\n"
+
+    mimetype = "application/x-ndjson" if output_format == "ndjson" else "application/json"
+    return current_app.response_class(stream_with_context(generate()), mimetype=mimetype)
+
+
 #전체 유저 조회
 @users_bp.route("/users", methods=["GET"])
 def get_all_users():
+    """
+    유저 목록 조회
+    limit 또는 after가 있으면 id 기준 커서 페이지네이션 ({"users": [...], "next_after": id})
+    없으면 기존과 같은 JSON 배열을 스트리밍으로 반환
+    필터: age, gender, created_from, created_to (ISO 8601)
+    """
+    try:
+        filters = _user_filters(request.args)
+        if "limit" not in request.args and "after" not in request.args:
+            return _stream_users(filters, "json")
+
+        limit = _int_arg(request.args, "limit", DEFAULT_PAGE_LIMIT)
+        after = _int_arg(request.args, "after", 0)
+        if not 1 <= limit <= MAX_PAGE_LIMIT:
+            raise ValueError(f"limit은 1~{MAX_PAGE_LIMIT} 사이여야 합니다.")
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
     try:
-        users = User.query.all()
-        return jsonify([user.to_dict() for user in users]), 200
+        # 다음 페이지가 있는지 알기 위해 한 행 더 조회
+        rows = rows_as_dicts(db.session.execute(
+            select(*USER_COLUMNS).where(User.id > after, *filters).order_by(User.id).limit(limit + 1)
+        ))
+        users = rows[:limit]
+        next_after = users[-1]["id"] if len(rows) > limit else None
+        return jsonify({"users": users, "next_after": next_after}), 200
+    except (OperationalError, PoolTimeoutError):
+        raise  # DB 잠금 / 연결 오류, 커넥션 풀 대기 초과 → 503
     except SQLAlchemyError as e:
         abort(500, message=f"유저 조회 중 오류가 발생했습니다: {str(e)}")
 
+#전체 유저 내보내기
+@users_bp.route("/users/export", methods=["GET"])
+def export_users():
+    """
+    전체 유저를 스트리밍으로 내보내기 (format=json | ndjson, 필터는 목록 조회와 동일)
+    """
+    output_format = request.args.get("format", "json")
+    if output_format not in ("json", "ndjson"):
+        return jsonify({"message": f"유효하지 않은 format 값입니다: {output_format}"}), 400
+    try:
+        filters = _user_filters(request.args)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    return _stream_users(filters, output_format)
+
+def _user_version(user_id):
+    """유저 조회 응답의 검증 값 (없는 유저면 None → 뷰에서 404)"""
+    updated_at = db.session.execute(select(User.updated_at).where(User.id == user_id)).scalar()
+    return None if updated_at is None else (updated_at,)
+
 #특정 유저 조회
 @users_bp.route("/users/<int:user_id>", methods=["GET"])
+@cache_policy(_user_version, private=True)
 def get_user_by_id(user_id):
     try:
         user = User.query.get(user_id)
         if not user:
             abort(404, message=f"ID {user_id}의 유저를 찾을 수 없습니다.")
         return jsonify(user.to_dict()), 200
+    except (OperationalError, PoolTimeoutError):
+        raise  # DB 잠금 / 연결 오류, 커넥션 풀 대기 초과 → 503
     except SQLAlchemyError as e:
         abort(500, message=f"유저 조회 중 오류가 발생했습니다: {str(e)}")
 
+#유저 설문 진행 상황 조회
+@users_bp.route("/users/<int:user_id>/progress", methods=["GET"])
+def get_user_progress(user_id):
+    """
+    유저의 설문 진행 상황 (답한 질문과 선택지, 남은 질문, sqe 기준 다음 질문)
+    users → 활성 질문 → 답변 LEFT JOIN 한 번으로 계산
+    (answers에서 보관한 질문은 보관 전에 비활성화되므로 answers만 읽어도 됨)
+    (유저가 없으면 행 0개, 활성 질문이 없으면 질문 컬럼이 NULL인 행 1개)
+    """
+    try:
+        rows = db.session.execute(
+            select(Question.id, Question.sqe, Question.title, Answer.choice_id)
+            .select_from(User)
+            .outerjoin(Question, Question.is_active == true())
+            .outerjoin(Answer, and_(Answer.user_id == User.id, Answer.question_id == Question.id))
+            .where(User.id == user_id)
+            .order_by(Question.sqe)
+        ).all()
+    except (OperationalError, PoolTimeoutError):
+        raise  # DB 잠금 / 연결 오류, 커넥션 풀 대기 초과 → 503
+    except SQLAlchemyError as e:
+        abort(500, message=f"유저 조회 중 오류가 발생했습니다: {str(e)}")
+
+    if not rows:
+        abort(404, message=f"ID {user_id}의 유저를 찾을 수 없습니다.")
+
+    answered = []
+    remaining = []
+    for question_id, sqe, title, choice_id in rows:
+        if question_id is None:
+            continue
+        if choice_id is None:
+            remaining.append({"question_id": question_id, "sqe": sqe, "title": title})
+        else:
+            answered.append({"question_id": question_id, "sqe": sqe, "choice_id": choice_id})
+    return jsonify({
+        "user_id": user_id,
+        "total": len(answered) + len(remaining),
+        "answered": answered,
+        "remaining": remaining,
+        "next_question": remaining[0] if remaining else None,
+        "completed": not remaining,
+    }), 200
+
     return new_user
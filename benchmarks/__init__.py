@@ -0,0 +1,4 @@
+"""
+로컬 성능 측정 스크립트 모음
+예) python -m benchmarks.answers_bulk
+"""
@@ -0,0 +1,97 @@
+"""
+유입 제어 효과 확인: 제출(POST /submit, /signup) 폭주 중 조회 API 지연 시간 비교
+gunicorn(gthread)을 유입 제어를 끈 상태 / 켠 상태로 차례로 띄우고,
+엔드포인트별 상태 코드 분포와 지연 시간 출력
+쓰기 클라이언트는 스레드마다 다른 IP(X-Forwarded-For)로 요청하여 IP별 한도도 실제처럼 적용
+
+실행: python -m benchmarks.admission [--writers 64] [--readers 4] [--duration 10] [--database-url URL]
+"""
+import argparse
+import random
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+
+import requests
+
+from benchmarks.concurrency import start_server
+from benchmarks.load import OPERATIONS, percentile, seed
+
+WRITE_MIX = {"POST /submit": 3, "POST /signup": 1}
+READ_MIX = {"GET /users/<id>": 1, "GET /submit/<user_id>/<choice_id>": 1, "GET /question/<id>": 1}
+
+
+def clients(base_url, ctx, mix, concurrency, deadline, samples, statuses, lock):
+    """mix 비율로 deadline까지 요청하는 클라이언트 스레드들 (스레드마다 IP 하나)"""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+
+    def client(ip):
+        session = requests.Session()
+        session.headers["X-Forwarded-For"] = ip
+        while time.monotonic() < deadline:
+            name = random.choices(names, weights)[0]
+            method, path, body = OPERATIONS[name](ctx)
+            started = time.perf_counter()
+            try:
+                status = session.request(method, base_url + path, json=body, timeout=30).status_code
+            except requests.RequestException:
+                status = "error"
+            with lock:
+                samples[name].append(time.perf_counter() - started)
+                statuses[name][status] += 1
+
+    return [
+        threading.Thread(target=client, args=(f"10.{n // 65536}.{n // 256 % 256}.{n % 256}",))
+        for n in (random.randrange(1, 2 ** 24) for _ in range(concurrency))
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="기본값: 임시 SQLite 파일")
+    parser.add_argument("--writers", type=int, default=64, help="동시에 제출하는 클라이언트 수")
+    parser.add_argument("--readers", type=int, default=4, help="동시에 조회하는 클라이언트 수")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=16, help="워커당 스레드 수 (DB 커넥션 풀 크기)")
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    for enabled in ("0", "1"):
+        directory = tempfile.mkdtemp(prefix="oz_form_admission_")
+        database_url = args.database_url or f"sqlite:///{directory}/bench.db"
+        _, ctx = seed(database_url, users=2000, questions=10, choices_per_question=4, images=1,
+                      origin_url="http://127.0.0.1:9")
+        process, base_url = start_server(
+            database_url, directory, ["-k", "gthread"], args.workers, args.concurrency,
+            ADMISSION_ENABLED=enabled, ADMISSION_DIR=f"{directory}/admission",
+        )
+        samples, statuses, lock = defaultdict(list), defaultdict(Counter), threading.Lock()
+        deadline = time.monotonic() + args.duration
+        threads = (
+            clients(base_url, ctx, WRITE_MIX, args.writers, deadline, samples, statuses, lock)
+            + clients(base_url, ctx, READ_MIX, args.readers, deadline, samples, statuses, lock)
+        )
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            process.terminate()
+            process.wait()
+
+        print(f"\n==== admission {'on' if enabled == '1' else 'off'} (writers={args.writers}, readers={args.readers}) ====")
+        print(f"{'endpoint':<36} {'req':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}  status")
+        for name in sorted(samples):
+            values = sorted(samples[name])
+            codes = ", ".join(f"{code}: {count}" for code, count in sorted(statuses[name].items(), key=str))
+            print(
+                f"{name:<36} {len(values):>6} {percentile(values, 0.5) * 1000:>9.1f} "
+                f"{percentile(values, 0.95) * 1000:>9.1f} {percentile(values, 0.99) * 1000:>9.1f}  {codes}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+답변 보관(flask answers archive) 동작 확인
+- 활성 질문의 답변이 있는 기간은 보관하지 않음
+- 보관 후에도 /results 합계와 집계 재계산(flask results rebuild --check)이 그대로
+- 보관한 질문에 다시 답변하면 오류 (/submit, PUT /submit/<user>, 관리자 수정), 진행 상황의 남은 질문에도 나오지 않음
+실행: python -m benchmarks.answer_archive [--users 50]
+"""
+import argparse
+import sys
+import tempfile
+from datetime import datetime
+
+from sqlalchemy import update
+
+from app import answer_archive
+from app.models import Answer, Question
+from benchmarks.common import make_app, seed_survey
+from config import db
+
+PERIOD = "2025-01"
+
+
+def check(label, condition):
+    print(f"{'ok  ' if condition else 'FAIL'} {label}")
+    return condition
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50)
+    args = parser.parse_args()
+
+    app = make_app(ANSWER_ARCHIVE_DIR=tempfile.mkdtemp(prefix="oz_form_archive_"), ANSWER_ARCHIVE_FORMAT="csv.gz")
+    client = app.test_client()
+    with app.app_context():
+        user_ids, choices = seed_survey(users=args.users, questions=3, choices_per_question=3)
+    archived_question, live_question, _ = choices
+    for i, user_id in enumerate(user_ids):
+        client.post("/submit/", json=[
+            {"userId": user_id, "choiceId": choices[question_id][i % len(choices[question_id])]}
+            for question_id in (archived_question, live_question)
+        ])
+    before = client.get("/results/").get_json()
+    passed = True
+
+    # 첫 번째 질문의 답변을 지난 기간으로 옮김
+    with app.app_context():
+        db.session.execute(
+            update(Answer).where(Answer.question_id == archived_question).values(created_at=datetime(2025, 1, 15))
+        )
+        db.session.commit()
+        try:
+            answer_archive.archive(app.config, PERIOD, log=lambda *a: None)
+            refused = False
+        except ValueError:
+            refused = True
+        passed &= check("활성 질문의 답변이 있는 기간은 보관하지 않음", refused and Answer.query.count() == 2 * len(user_ids))
+
+        db.session.execute(update(Question).where(Question.id == archived_question).values(is_active=False))
+        db.session.commit()
+        archived = answer_archive.archive(app.config, PERIOD, log=lambda *a: None)
+    passed &= check(f"질문 비활성화 후 보관 ({archived}개)", archived == len(user_ids))
+    passed &= check("보관 후에도 /results 합계가 같음", client.get("/results/").get_json() == before)
+
+    user_id = user_ids[0]
+    choice_id = choices[archived_question][1]
+    response = client.post("/submit/", json=[{"userId": user_id, "choiceId": choice_id}])
+    passed &= check(
+        f"보관한 질문에 다시 답변(/submit) → {response.status_code}",
+        response.status_code == 400 and "Archived" in response.get_json()["errors"][0]["msg"],
+    )
+    response = client.put(f"/submit/{user_id}", json=[{"choiceId": choice_id}])
+    passed &= check(f"보관한 질문에 다시 답변(PUT /submit/<user>) → {response.status_code}", response.status_code == 400)
+    response = client.put(f"/submit/admin/{user_id}/{choices[live_question][0]}", json={"choice_id": choice_id})
+    passed &= check(f"관리자 수정으로 보관한 질문에 옮기기 → {response.status_code}", response.status_code == 409)
+    passed &= check("다시 답변해도 /results 합계가 같음", client.get("/results/").get_json() == before)
+
+    progress = client.get(f"/users/{user_id}/progress").get_json()
+    passed &= check(
+        "진행 상황의 남은 질문에 보관한 질문이 없음",
+        archived_question not in [question["question_id"] for question in progress["remaining"]],
+    )
+
+    result = app.test_cli_runner().invoke(args=["results", "rebuild", "--check"])
+    passed &= check(f"flask results rebuild --check: {result.output.strip().splitlines()[-1]}", result.exit_code == 0)
+
+    print()
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
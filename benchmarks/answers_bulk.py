@@ -0,0 +1,89 @@
+"""
+POST /submit 저장 경로 비교: 객체별 session.add (기존) vs 일괄 검증 + 다중 행 INSERT
+실행: python -m benchmarks.answers_bulk [--database-url URL] [--sizes 10,100,1000,10000]
+"""
+import argparse
+import json
+import random
+import time
+
+from app.answer_ingest import insert_answers, validate_items
+from app.models import Answer, Choices
+from benchmarks.common import make_app, seed_survey
+from config import db
+
+
+def make_batch(size, users, choices):
+    """
+    설문 한 번 제출과 같은 모양의 답변 묶음 생성
+    유저당 질문 하나에 답변 하나만 저장되므로 아직 답하지 않은 유저(users 이터레이터)를 차례로 사용
+    """
+    questions = list(choices)
+    batch = []
+    while len(batch) < size:
+        user_id = next(users)
+        batch.extend(
+            {"userId": user_id, "choiceId": random.choice(choices[question_id])}
+            for question_id in questions[:size - len(batch)]
+        )
+    return batch
+
+
+def per_object(batch):
+    """기존 방식: 항목마다 Answer 객체 생성 후 add"""
+    for answer in batch:
+        choice = db.session.get(Choices, answer["choiceId"])
+        db.session.add(Answer(user_id=answer["userId"], choice_id=choice.id, question_id=choice.question_id))
+    db.session.commit()
+
+
+def bulk(batch):
+    """새 방식: 집합 기반 검증 + 다중 행 INSERT"""
+    rows, _ = validate_items(batch)
+    insert_answers(rows)
+    db.session.commit()
+
+
+def measure(fn, batches, repeat):
+    """반복마다 새 묶음으로 측정한 최고 처리량 (rows/s)"""
+    batch = iter(batches)
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(next(batch))
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return len(batches[0]) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", help="기본값: 임시 SQLite 파일")
+    parser.add_argument("--sizes", default="10,100,1000,10000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    questions = 10
+    app = make_app(args.database_url)
+    results = []
+    with app.app_context():
+        # 측정마다 답하지 않은 유저를 쓰므로 필요한 만큼 생성 (방식 2개 x 반복 횟수)
+        needed = sum(-(-size // questions) for size in sizes) * 2 * args.repeat
+        user_ids, choices = seed_survey(users=needed, questions=questions)
+        users = iter(user_ids)
+        print(f"{'batch':>8} {'per-object rows/s':>18} {'bulk rows/s':>14} {'speedup':>8}")
+        for size in sizes:
+            legacy = measure(per_object, [make_batch(size, users, choices) for _ in range(args.repeat)], args.repeat)
+            fast = measure(bulk, [make_batch(size, users, choices) for _ in range(args.repeat)], args.repeat)
+            results.append({"batch": size, "per_object_rows_per_sec": legacy, "bulk_rows_per_sec": fast})
+            print(f"{size:>8} {legacy:>18,.0f} {fast:>14,.0f} {fast / legacy:>7.1f}x")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
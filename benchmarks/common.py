@@ -0,0 +1,78 @@
+import os
+import tempfile
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from app import create_app
+from app.models import KST, AgeStatus, Choices, GenderStatus, Image, ImageStatus, Question, User
+from config import db
+
+
+def make_app(database_url=None, **config):
+    """
+    벤치마크용 앱 생성
+    database_url이 없으면 임시 디렉토리의 SQLite 파일 사용 (스키마는 매번 새로 생성)
+    이미지 캐시 / 변형 이미지 / 스풀 / 버전 파일도 실행마다 새 임시 디렉토리 사용
+    유입 제어는 한 IP에서 몰아서 보내는 부하 테스트와 맞지 않으므로 기본으로 끔
+    """
+    directory = tempfile.mkdtemp(prefix="oz_form_bench_")
+    if database_url is None:
+        database_url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    app = create_app({
+        "SQLALCHEMY_DATABASE_URI": database_url,
+        "IMAGE_CACHE_DIR": os.path.join(directory, "image_cache"),
+        "IMAGE_VARIANT_DIR": os.path.join(directory, "image_variants"),
+        "ANSWER_SPOOL_DIR": os.path.join(directory, "answer_spool"),
+        "CONTENT_VERSION_PATH": os.path.join(directory, "content_version"),
+        "ADMISSION_DIR": os.path.join(directory, "admission"),
+        "ADMISSION_ENABLED": False,
+        **config,
+    })
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    return app
+
+
+def seed_survey(users=1000, questions=10, choices_per_question=4, image_url="http://127.0.0.1/image.png"):
+    """
+    설문 데이터 생성 (앱 컨텍스트 안에서 호출)
+    반환: (유저 id 리스트, 질문 id별 선택지 id 리스트)
+    """
+    now = datetime.now(tz=KST)
+    stamps = {"created_at": now, "updated_at": now}
+    ages = list(AgeStatus)
+    genders = list(GenderStatus)
+
+    image = Image(url=image_url, type=ImageStatus.sub)
+    db.session.add(image)
+    db.session.flush()
+
+    db.session.execute(insert(Question), [
+        {"title": f"질문 {n}", "sqe": n, "image_id": image.id, "is_active": True, **stamps}
+        for n in range(1, questions + 1)
+    ])
+    question_ids = [question.id for question in Question.query.order_by(Question.sqe)]
+    db.session.execute(insert(Choices), [
+        {"content": f"선택지 {n}", "sqe": n, "question_id": question_id, "is_active": True, **stamps}
+        for question_id in question_ids
+        for n in range(1, choices_per_question + 1)
+    ])
+    db.session.execute(insert(User), [
+        {
+            "name": f"user{n}",
+            "email": f"user{n}@example.com",
+            "age": ages[n % len(ages)],
+            "gender": genders[n % len(genders)],
+            **stamps,
+        }
+        for n in range(users)
+    ])
+    db.session.commit()
+
+    user_ids = [row[0] for row in db.session.query(User.id).order_by(User.id)]
+    choices = {}
+    for choice_id, question_id in db.session.query(Choices.id, Choices.question_id).order_by(Choices.id):
+        choices.setdefault(question_id, []).append(choice_id)
+    return user_ids, choices
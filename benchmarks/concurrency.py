@@ -0,0 +1,129 @@
+"""
+gunicorn 워커 방식 비교: sync (기존 launch.sh) vs gthread (gunicorn.conf.py)
+느린 로컬 이미지 서버를 두고 /image/<id> 프록시 요청을 많이 띄운 상태에서
+가벼운 GET /question의 지연 시간과 처리량이 어떻게 달라지는지 측정
+
+실행: python -m benchmarks.concurrency [--origin-delay 1.0] [--proxies 64] [--readers 4] [--duration 15]
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+from benchmarks.load import print_report, run, seed, summarize
+from benchmarks.stub_origin import StubOrigin
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (이름, gunicorn 추가 인자, 워커당 동시 처리 수)
+MODES = [
+    ("sync", ["-k", "sync", "--threads", "1"], 1),
+    ("gthread", ["-k", "gthread"], None),
+]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(database_url, directory, extra_args, workers, concurrency, **extra_env):
+    """gunicorn 실행 후 응답할 때까지 대기 (extra_env: 추가 환경 변수)"""
+    port = free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "IMAGE_CACHE_DIR": "",  # 매 요청이 원본 서버까지 가도록 캐시 끔
+        "METRICS_DIR": os.path.join(directory, "metrics"),
+        "ANSWER_SPOOL_DIR": os.path.join(directory, "answer_spool"),
+        "CONTENT_VERSION_PATH": os.path.join(directory, "content_version"),
+        "ADMISSION_ENABLED": "0",  # 워커 방식만 비교
+        "WEB_CONCURRENCY": str(workers),
+        "WORKER_CONCURRENCY": str(concurrency),
+        **extra_env,
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "-b", f"127.0.0.1:{port}", *extra_args, "wsgi:app"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            requests.get(base_url + "/questions/count", timeout=1)
+            return process, base_url
+        except requests.RequestException:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("gunicorn이 30초 안에 시작되지 않았습니다.")
+
+
+def measure(base_url, ctx, proxies, readers, duration):
+    """프록시 요청과 질문 조회를 동시에 실행하여 각각의 결과 반환"""
+    results = {}
+
+    def load(name, mix, concurrency):
+        results[name] = run(base_url, ctx, mix, concurrency, duration)
+
+    threads = [
+        threading.Thread(target=load, args=("proxy", {"GET /image/<id>": 1}, proxies)),
+        threading.Thread(target=load, args=("read", {"GET /question": 1}, readers)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    samples, errors = {}, {}
+    for result_samples, result_errors, _ in results.values():
+        samples.update(result_samples)
+        errors.update(result_errors)
+    return summarize(samples, errors, max(elapsed for _, _, elapsed in results.values()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--origin-delay", type=float, default=1.0, help="로컬 이미지 서버 응답 지연(초)")
+    parser.add_argument("--proxies", type=int, default=64, help="동시에 /image/<id>를 요청하는 클라이언트 수")
+    parser.add_argument("--readers", type=int, default=4, help="동시에 GET /question을 요청하는 클라이언트 수")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=32, help="gthread 워커당 스레드 수")
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="oz_form_concurrency_")
+    database_url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    origin = StubOrigin(size=50 * 1024, delay=args.origin_delay).start()
+    _, ctx = seed(database_url, users=100, questions=10, choices_per_question=4, images=20, origin_url=origin.url)
+
+    report = {}
+    for name, extra_args, concurrency in MODES:
+        process, base_url = start_server(
+            database_url, directory, extra_args, args.workers, concurrency or args.concurrency
+        )
+        try:
+            endpoints, total = measure(base_url, ctx, args.proxies, args.readers, args.duration)
+        finally:
+            process.terminate()
+            process.wait()
+        report[name] = {"endpoints": endpoints, "total": total}
+        print(f"\n==== {name} (workers={args.workers}, concurrency={concurrency or args.concurrency}) ====")
+        print_report(endpoints, total)
+    origin.stop()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "modes": report}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+조회 API의 조건부 요청 / 압축 확인 + 전송 크기 / 지연 시간 비교
+- cache_policy를 선언한 경로: ETag / Cache-Control, If-None-Match / If-Modified-Since에 304
+- validator가 있는 경로(/results)는 304일 때 검증 쿼리 한 번만 실행하고 뷰는 실행하지 않음
+- 답변이 저장되면 ETag가 바뀜 (updated_at이 같은 초여도), Accept-Encoding: gzip이면 큰 JSON을 압축
+실행: python -m benchmarks.http_cache [--questions 30] [--choices 5] [--requests 200]
+"""
+import argparse
+import gzip
+import sys
+import time
+
+from collections import Counter
+
+from sqlalchemy import event, select, update
+
+from app import answer_stats
+from app.models import AnswerStat
+from benchmarks.common import make_app, seed_survey
+from config import db
+
+
+def check(label, condition):
+    print(f"{'ok  ' if condition else 'FAIL'} {label}")
+    return condition
+
+
+def timed(client, path, headers, repeat):
+    """repeat번 요청의 평균 지연 시간(ms)과 마지막 응답"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        response = client.get(path, headers=headers)
+    return response, (time.perf_counter() - started) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=30)
+    parser.add_argument("--choices", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    app = make_app()
+    with app.app_context():
+        user_ids, choices = seed_survey(users=10, questions=args.questions, choices_per_question=args.choices)
+        statements = []
+        event.listen(db.engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+    client = app.test_client()
+    question_id = next(iter(choices))
+    passed = True
+
+    for path in ["/survey", "/question", f"/question/{question_id}", f"/choice/{question_id}", "/results/",
+                 f"/results/{question_id}", f"/users/{user_ids[0]}"]:
+        response = client.get(path)
+        again = client.get(path, headers={"If-None-Match": response.headers.get("ETag", "")})
+        passed &= check(
+            f"{path}: ETag + Cache-Control({response.headers.get('Cache-Control')}), If-None-Match → 304",
+            response.status_code == 200 and again.status_code == 304 and not again.data,
+        )
+
+    full = client.get("/results/")
+    statements.clear()
+    not_modified = client.get("/results/", headers={"If-None-Match": full.headers["ETag"]})
+    passed &= check(f"/results/ 304는 검증 쿼리 {len(statements)}개만 실행", len(statements) == 1)
+    passed &= check(
+        "If-Modified-Since도 304",
+        client.get("/results/", headers={"If-Modified-Since": full.headers["Last-Modified"]}).status_code == 304,
+    )
+
+    compressed = client.get("/results/", headers={"Accept-Encoding": "gzip"})
+    passed &= check(
+        "Accept-Encoding: gzip → 압축 + Vary + 약한 ETag, 압축 해제하면 원본과 같음",
+        compressed.headers.get("Content-Encoding") == "gzip" and "Accept-Encoding" in compressed.headers.get("Vary", "")
+        and compressed.headers["ETag"].startswith("W/") and gzip.decompress(compressed.data) == full.data,
+    )
+    passed &= check(
+        "압축본 ETag로 조건부 요청해도 304",
+        client.get("/results/", headers={"If-None-Match": compressed.headers["ETag"]}).status_code == 304,
+    )
+
+    client.post("/submit/", json=[{"userId": user_ids[0], "choiceId": choices[question_id][0]}])
+    changed = client.get("/results/", headers={"If-None-Match": full.headers["ETag"]})
+    passed &= check("답변 저장 후에는 새 ETag로 200", changed.status_code == 200 and changed.headers["ETag"] != full.headers["ETag"])
+
+    # 같은 초 안에 답변 수만 바뀐 경우 (updated_at을 되돌려도 ETag가 바뀌어야 함)
+    with app.app_context():
+        stat = db.session.execute(select(AnswerStat).limit(1)).scalar_one()
+        key, updated_at = (stat.question_id, stat.choice_id, stat.age, stat.gender), stat.updated_at
+        answer_stats.apply(Counter({key: 1}))
+        db.session.execute(update(AnswerStat).where(AnswerStat.id == stat.id).values(updated_at=updated_at))
+        db.session.commit()
+    same_second = client.get("/results/", headers={"If-None-Match": changed.headers["ETag"]})
+    passed &= check("updated_at이 같아도 답변 수가 바뀌면 새 ETag로 200", same_second.status_code == 200)
+    changed = same_second
+
+    print()
+    print(f"{'GET /results/':<24} {'bytes':>10} {'ms':>8}")
+    for label, headers in [
+        ("full", {}),
+        ("gzip", {"Accept-Encoding": "gzip"}),
+        ("304", {"If-None-Match": changed.headers["ETag"]}),
+    ]:
+        response, ms = timed(client, "/results/", headers, args.requests)
+        print(f"{label:<24} {len(response.data):>10,} {ms:>8.2f}")
+
+    print()
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+변형 이미지(?w=&format=) 동작 확인 + 전송 크기 / 지연 시간 비교
+로컬에서 만든 이미지 파일을 가짜 원본 서버(StubOrigin)로 제공하고 Flask 테스트 클라이언트로 호출
+- 허용 너비로 올림, 요청 형식으로 다시 인코딩, 비율 유지
+- 같은 변형 동시 요청은 한 번만 변환, 조건부 요청 304
+- 이미지가 아닌 원본은 원본 그대로 응답, 잘못된 파라미터는 400
+- 변환 실패 / 시간 초과한 변형은 잠시 다시 변환하지 않음, 시간 초과 후에도 임시 파일이 남지 않음
+- 변형 저장소 크기 제한(LRU), 이미지 삭제 시 변형도 삭제
+실행: python -m benchmarks.image_variants [--width 3000 --height 2000]
+(Pillow 필요)
+"""
+import argparse
+import glob
+import io
+import os
+import sys
+import threading
+import time
+
+from PIL import Image as PILImage
+
+from app import image_variants
+from benchmarks.common import make_app
+from benchmarks.stub_origin import StubOrigin
+
+
+def check(label, condition):
+    print(f"{'ok  ' if condition else 'FAIL'} {label}")
+    return condition
+
+
+def fixture(width, height, image_format="JPEG"):
+    """노이즈가 섞인 그라데이션 이미지 (압축이 잘 되지 않는 실제 사진 크기에 가깝게)"""
+    gradient = PILImage.linear_gradient("L").resize((width, height)).convert("RGB")
+    noise = PILImage.effect_noise((width, height), 64).convert("RGB")
+    image = PILImage.blend(gradient, noise, 0.5)
+    buffer = io.BytesIO()
+    image.save(buffer, image_format, quality=95)
+    return buffer.getvalue()
+
+
+def register(client, url):
+    return client.post("/image/", json={"url": url, "type": "sub"}).get_json()["image"]["id"]
+
+
+def timed(client, path, headers=None):
+    started = time.perf_counter()
+    response = client.get(path, headers=headers)
+    return response, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--width", type=int, default=3000)
+    parser.add_argument("--height", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    photo = StubOrigin(body=fixture(args.width, args.height), content_type="image/jpeg").start()
+    broken = StubOrigin(size=64 * 1024).start()  # PNG 헤더만 있는 가짜 이미지
+    app = make_app(IMAGE_VARIANT_MAX_BYTES=2 * 1024 * 1024)
+    config = app.config
+    client = app.test_client()
+    passed = True
+
+    image_id = register(client, f"{photo.url}/photo.jpg")
+    original, original_ms = timed(client, f"/image/{image_id}")
+    response, cold_ms = timed(client, f"/image/{image_id}?w=300&format=webp")
+    variant = PILImage.open(io.BytesIO(response.data))
+    passed &= check(
+        "w=300 → 허용 너비 320으로 올리고 webp로 인코딩, 비율 유지",
+        response.status_code == 200 and response.mimetype == "image/webp" and variant.format == "WEBP"
+        and variant.size == (320, args.height * 320 // args.width),
+    )
+    warm, warm_ms = timed(client, f"/image/{image_id}?w=300&format=webp")
+    passed &= check("두 번째 요청은 저장된 변형 파일로 응답", warm.data == response.data)
+    not_modified = client.get(f"/image/{image_id}?w=300&format=webp", headers={"If-None-Match": warm.headers["ETag"]})
+    passed &= check("ETag 조건부 요청은 304", not_modified.status_code == 304)
+    jpeg = client.get(f"/image/{image_id}?w=640&format=jpg")
+    passed &= check("format=jpg → image/jpeg", jpeg.mimetype == "image/jpeg")
+    passed &= check("잘못된 w는 400", client.get(f"/image/{image_id}?w=abc").status_code == 400)
+    passed &= check("지원하지 않는 format은 400", client.get(f"/image/{image_id}?format=tiff").status_code == 400)
+
+    # 같은 변형을 동시에 요청해도 변환은 한 번 (워커 안에서는 Future 공유, 워커 간에는 파일 잠금)
+    builds = []
+    build = image_variants._build
+    image_variants._build = lambda *a, **kw: builds.append(a[1]) or build(*a, **kw)
+    statuses = []
+    threads = [
+        threading.Thread(target=lambda: statuses.append(app.test_client().get(f"/image/{image_id}?w=960").status_code))
+        for _ in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    image_variants._build = build
+    passed &= check(
+        f"동시 요청 {args.concurrency}개 → 변환 {len(builds)}번",
+        len(builds) == 1 and statuses == [200] * args.concurrency,
+    )
+
+    broken_id = register(client, f"{broken.url}/broken.png")
+    response = client.get(f"/image/{broken_id}?w=320")
+    passed &= check(
+        "이미지가 아닌 원본은 변환하지 않고 원본으로 응답",
+        response.status_code == 200 and response.mimetype == "image/png" and len(response.data) == len(broken.body),
+    )
+
+    builds.clear()
+    image_variants._build = lambda *a, **kw: builds.append(a[1]) or build(*a, **kw)
+    again = client.get(f"/image/{broken_id}?w=320")
+    passed &= check("실패한 변형은 다시 변환하지 않고 원본으로 응답", again.status_code == 200 and not builds)
+
+    timeout, config["IMAGE_VARIANT_TIMEOUT"] = config["IMAGE_VARIANT_TIMEOUT"], 0.001
+    timed_out = client.get(f"/image/{image_id}?w=1280&format=png")
+    client.get(f"/image/{image_id}?w=1280&format=png")
+    config["IMAGE_VARIANT_TIMEOUT"] = timeout
+    image_variants._build = build
+    deadline = time.monotonic() + 30
+    while glob.glob(os.path.join(config["IMAGE_VARIANT_DIR"], "*.tmp")) and time.monotonic() < deadline:
+        time.sleep(0.1)
+    passed &= check(
+        f"시간 초과 → 원본으로 응답, 변환 {len(builds)}번, 변환이 끝난 뒤 임시 파일 없음",
+        timed_out.mimetype == "image/jpeg" and len(builds) == 1
+        and not glob.glob(os.path.join(config["IMAGE_VARIANT_DIR"], "*.tmp")),
+    )
+
+    stale = os.path.join(config["IMAGE_VARIANT_DIR"], "stale.tmp")
+    open(stale, "w").close()
+    os.utime(stale, (0, 0))
+    image_variants.evict(config)
+    passed &= check("오래된 임시 파일은 정리할 때 삭제", not os.path.exists(stale))
+
+    for width in config["IMAGE_VARIANT_WIDTHS"]:
+        client.get(f"/image/{image_id}?w={width}&format=png")
+    total = sum(os.path.getsize(path) for path in glob.glob(os.path.join(config["IMAGE_VARIANT_DIR"], "*-w*.*"))
+                if not path.endswith(".lock"))
+    passed &= check(
+        f"변형 저장소 크기 제한 ({total:,} <= {config['IMAGE_VARIANT_MAX_BYTES']:,} bytes)",
+        total <= config["IMAGE_VARIANT_MAX_BYTES"],
+    )
+
+    client.delete(f"/image/{image_id}")
+    passed &= check(
+        "이미지 삭제 시 변형 파일도 삭제",
+        not glob.glob(os.path.join(config["IMAGE_VARIANT_DIR"], f"{image_id}-*")),
+    )
+
+    print()
+    print(f"{'':<24} {'bytes':>12} {'ms':>10}")
+    print(f"{'original (cached)':<24} {len(original.data):>12,} {original_ms:>10.1f}")
+    print(f"{'w=320 webp (first)':<24} {len(warm.data):>12,} {cold_ms:>10.1f}")
+    print(f"{'w=320 webp (stored)':<24} {len(warm.data):>12,} {warm_ms:>10.1f}")
+
+    photo.stop()
+    broken.stop()
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""
+전체 API 부하 테스트
+로컬 DB(SQLite 또는 로컬 MySQL)에 설문/유저 데이터를 만들고, 로컬 이미지 서버를 띄운 뒤
+트래픽 조합(mix)에 따라 모든 API를 호출하여 엔드포인트별 p50/p95/p99 지연 시간과 초당 요청 수를 기록
+
+실행 예)
+  python -m benchmarks.load --mix respondent --concurrency 16 --duration 30 --output results/main.json
+  python -m benchmarks.load --mix all --compare results/main.json
+  python -m benchmarks.load --url http://127.0.0.1:8000 --database-url mysql+pymysql://... (이미 띄운 서버 대상)
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from itertools import count
+
+import requests
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from app.models import Image, ImageStatus
+from benchmarks.common import make_app, seed_survey
+from benchmarks.stub_origin import StubOrigin
+from config import db
+
+
+class QuietHandler(WSGIRequestHandler):
+    """요청마다 출력되는 접근 로그 끄기"""
+
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+class Context:
+    """시드 데이터 정보 (요청 생성에 사용)"""
+
+    def __init__(self, user_ids, choices, image_ids):
+        self.user_ids = user_ids
+        self.choices = choices  # question_id -> [choice_id]
+        self.question_ids = list(choices)
+        self.image_ids = image_ids
+        self.emails = count()
+        self.run_id = f"{os.getpid()}{int(time.time())}"
+
+    def question_id(self):
+        return random.choice(self.question_ids)
+
+    def answer(self):
+        question_id = self.question_id()
+        return random.choice(self.user_ids), random.choice(self.choices[question_id])
+
+
+# 엔드포인트별 요청 생성 함수: (메서드, 경로, JSON 본문)
+OPERATIONS = {
+    "GET /": lambda ctx: ("GET", "/", None),
+    "GET /survey": lambda ctx: ("GET", "/survey", None),
+    "GET /question": lambda ctx: ("GET", "/question", None),
+    "GET /question/<id>": lambda ctx: ("GET", f"/question/{ctx.question_id()}", None),
+    "GET /questions/count": lambda ctx: ("GET", "/questions/count", None),
+    "GET /choice/<question_id>": lambda ctx: ("GET", f"/choice/{ctx.question_id()}", None),
+    "GET /image/main": lambda ctx: ("GET", "/image/main", None),
+    "GET /image/<id>": lambda ctx: ("GET", f"/image/{random.choice(ctx.image_ids)}", None),
+    "POST /signup": lambda ctx: ("POST", "/signup", {
+        "name": "load",
+        "age": random.choice(["teen", "twenty", "thirty", "fourty", "fifty"]),
+        "gender": random.choice(["male", "female"]),
+        "email": f"load{ctx.run_id}-{next(ctx.emails)}@example.com",
+    }),
+    "POST /submit": lambda ctx: ("POST", "/submit/", [
+        {"userId": random.choice(ctx.user_ids), "choiceId": random.choice(choice_ids)}
+        for choice_ids in ctx.choices.values()
+    ]),
+    "GET /submit/<user_id>/<choice_id>": lambda ctx: ("GET", "/submit/%d/%d" % ctx.answer(), None),
+    "GET /users": lambda ctx: ("GET", f"/users?limit=100&after={random.choice(ctx.user_ids)}", None),
+    "GET /users/<id>": lambda ctx: ("GET", f"/users/{random.choice(ctx.user_ids)}", None),
+    "GET /users/<id>/progress": lambda ctx: ("GET", f"/users/{random.choice(ctx.user_ids)}/progress", None),
+    "GET /results/<question_id>": lambda ctx: ("GET", f"/results/{ctx.question_id()}", None),
+}
+
+# 트래픽 조합: 엔드포인트별 가중치
+MIXES = {
+    # 설문 응답자 흐름 (가입 → 설문 조회 → 이미지 → 제출)
+    "respondent": {
+        "GET /": 2, "POST /signup": 5, "GET /survey": 20, "GET /question": 5, "GET /question/<id>": 10,
+        "GET /questions/count": 5, "GET /choice/<question_id>": 10, "GET /image/main": 5,
+        "GET /image/<id>": 20, "POST /submit": 5, "GET /users/<id>/progress": 10,
+    },
+    # 조회 위주 (대시보드 / 관리자 화면 포함)
+    "read": {
+        "GET /survey": 25, "GET /question": 10, "GET /question/<id>": 15, "GET /choice/<question_id>": 15,
+        "GET /image/<id>": 15, "GET /results/<question_id>": 10, "GET /users": 5, "GET /users/<id>": 5,
+    },
+    # 캠페인 마감 직전 제출 폭주
+    "write": {"POST /signup": 30, "POST /submit": 70},
+    # 모든 엔드포인트 동일 비중
+    "all": {name: 1 for name in OPERATIONS},
+}
+
+
+def seed(database_url, users, questions, choices_per_question, images, origin_url):
+    """DB를 새로 만들고 설문 / 유저 / 이미지 데이터 생성"""
+    app = make_app(database_url)
+    with app.app_context():
+        user_ids, choices = seed_survey(
+            users=users, questions=questions, choices_per_question=choices_per_question,
+            image_url=f"{origin_url}/question.png",
+        )
+        db.session.add(Image(url=f"{origin_url}/main.png", type=ImageStatus.main))
+        db.session.add_all(Image(url=f"{origin_url}/{n}.png", type=ImageStatus.sub) for n in range(images))
+        db.session.commit()
+        image_ids = [image.id for image in Image.query.filter_by(type=ImageStatus.sub)]
+    return app, Context(user_ids, choices, image_ids)
+
+
+def run(base_url, ctx, mix, concurrency, duration):
+    """concurrency개 스레드로 duration초 동안 요청, 엔드포인트별 (지연 시간, 상태) 기록"""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    samples = defaultdict(list)
+    errors = defaultdict(int)
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def worker():
+        session = requests.Session()
+        local = defaultdict(list)
+        local_errors = defaultdict(int)
+        while time.monotonic() < deadline:
+            name = random.choices(names, weights)[0]
+            method, path, body = OPERATIONS[name](ctx)
+            started = time.perf_counter()
+            try:
+                response = session.request(method, base_url + path, json=body, timeout=30)
+                response.content  # 본문까지 모두 받은 시점까지 측정
+                failed = response.status_code >= 500
+            except requests.RequestException:
+                failed = True
+            local[name].append(time.perf_counter() - started)
+            if failed:
+                local_errors[name] += 1
+        with lock:
+            for name, values in local.items():
+                samples[name].extend(values)
+            for name, value in local_errors.items():
+                errors[name] += value
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, errors, time.monotonic() - started
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples, errors, elapsed):
+    endpoints = {}
+    for name in sorted(samples):
+        values = sorted(samples[name])
+        endpoints[name] = {
+            "requests": len(values),
+            "errors": errors.get(name, 0),
+            "rps": round(len(values) / elapsed, 2),
+            "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(values, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+        }
+    every = sorted(value for values in samples.values() for value in values)
+    total = {
+        "requests": len(every),
+        "errors": sum(errors.values()),
+        "rps": round(len(every) / elapsed, 2),
+        "p50_ms": round(percentile(every, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(every, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(every, 0.99) * 1000, 2),
+    }
+    return endpoints, total
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(endpoints, total, previous=None):
+    header = f"{'endpoint':<36} {'req':>7} {'err':>5} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, row in [*endpoints.items(), ("TOTAL", total)]:
+        line = (
+            f"{name:<36} {row['requests']:>7} {row['errors']:>5} {row['rps']:>9.1f} "
+            f"{row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f}"
+        )
+        before = (previous or {}).get(name)
+        if before:
+            line += f"   (rps {before['rps']:.1f} -> {row['rps']:.1f}, p95 {before['p95_ms']:.2f} -> {row['p95_ms']:.2f})"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="기본값: 임시 SQLite 파일")
+    parser.add_argument("--url", help="이미 실행 중인 서버 주소 (생략하면 앱을 스레드 서버로 직접 띄움)")
+    parser.add_argument("--mix", choices=sorted(MIXES), default="respondent")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--choices", type=int, default=4, help="질문당 선택지 수")
+    parser.add_argument("--images", type=int, default=20)
+    parser.add_argument("--image-size", type=int, default=200 * 1024)
+    parser.add_argument("--origin-delay", type=float, default=0.0, help="로컬 이미지 서버 응답 지연(초)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    origin = StubOrigin(args.image_size, args.origin_delay).start()
+    app, ctx = seed(args.database_url, args.users, args.questions, args.choices, args.images, origin.url)
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        server = make_server("127.0.0.1", 0, app, threaded=True, request_handler=QuietHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+
+    samples, errors, elapsed = run(base_url, ctx, MIXES[args.mix], args.concurrency, args.duration)
+    if server is not None:
+        server.shutdown()
+    origin.stop()
+
+    endpoints, total = summarize(samples, errors, elapsed)
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            saved = json.load(f)
+        previous = {**saved["endpoints"], "TOTAL": saved["total"]}
+    print_report(endpoints, total, previous)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump({
+                "meta": {
+                    "commit": git_commit(),
+                    "finished_at": datetime.now(timezone.utc).isoformat(),
+                    "mix": args.mix,
+                    "concurrency": args.concurrency,
+                    "duration": round(elapsed, 3),
+                    "database": "sqlite" if args.database_url is None else args.database_url.split(":")[0],
+                    "server": args.url or "werkzeug threaded",
+                    "seed": {
+                        "users": args.users, "questions": args.questions,
+                        "choices": args.choices, "images": args.images,
+                    },
+                },
+                "endpoints": endpoints,
+                "total": total,
+            }, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
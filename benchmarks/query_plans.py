@@ -0,0 +1,157 @@
+"""
+조회 API가 실행하는 모든 쿼리의 실행 계획 검사
+대량의 가짜 데이터를 로컬 DB에 만든 뒤 각 API를 호출하면서 실행된 SQL을 모아
+EXPLAIN 결과에 허용되지 않은 전체 스캔이 있으면 종료 코드 1로 실패
+
+실행: python -m benchmarks.query_plans [--database-url URL] [--users N] [--answers N]
+(--database-url을 생략하면 임시 SQLite 파일 사용, MySQL은 비어 있는 스키마를 지정)
+"""
+import argparse
+import random
+import re
+from datetime import datetime
+
+from sqlalchemy import event, insert, text
+
+from app.models import KST, AgeStatus, Answer, GenderStatus, Image, ImageStatus, User
+from benchmarks.common import make_app, seed_survey
+from config import db
+
+# API 호출 목록: (이름, 메서드, 경로 템플릿, 요청 본문, 기대 상태 코드, 전체 스캔을 허용할 테이블)
+# 전체 목록을 돌려주는 API는 테이블 스캔이 정상이므로 해당 테이블만 허용
+# 상태 코드가 다르면 검사하려던 경로(검증 / 저장)가 실행되지 않은 것이므로 실패
+CALLS = [
+    ("index", "GET", "/", None, 200, set()),
+    ("question list", "GET", "/question", None, 200, {"questions"}),
+    ("question count", "GET", "/questions/count", None, 200, {"questions"}),
+    ("question", "GET", "/question/{question_id}", None, 200, set()),
+    ("survey", "GET", "/survey", None, 200, set()),
+    ("choices", "GET", "/choice/{question_id}", None, 200, set()),
+    ("main image", "GET", "/image/main", None, 200, set()),
+    ("users page", "GET", "/users?limit=100&after={user_id}", None, 200, set()),
+    ("user", "GET", "/users/{user_id}", None, 200, set()),
+    ("user progress", "GET", "/users/{user_id}/progress", None, 200, set()),
+    ("answers", "GET", "/submit/{user_id}/{choice_id}", None, 200, set()),
+    ("update answer", "PUT", "/submit/admin/{user_id}/{choice_id}", {}, 200, set()),
+    ("submit", "POST", "/submit/", [{"userId": "{new_user_id}", "choiceId": "{choice_id}"}], 201, set()),
+    ("replace answers", "PUT", "/submit/{user_id}", [{"choiceId": "{choice_id}"}], 200, set()),
+    ("results", "GET", "/results/{question_id}", None, 200, set()),
+    ("signup", "POST", "/signup", {"name": "plan", "age": "teen", "gender": "male", "email": "plan@example.com"},
+     201, set()),
+]
+
+
+def seed(users, answers):
+    """대량 가짜 데이터 생성 (앱 컨텍스트 안에서 호출)"""
+    user_ids, choices = seed_survey(users=users, questions=30, choices_per_question=5)
+    now = datetime.now(tz=KST)
+    db.session.execute(insert(Image), [
+        {"url": f"http://127.0.0.1/{n}.png", "type": ImageStatus.sub, "created_at": now, "updated_at": now}
+        for n in range(2000)
+    ])
+    db.session.add(Image(url="http://127.0.0.1/main.png", type=ImageStatus.main))
+    # 유저당 질문 하나에 답변 하나: (유저, 질문) 조합을 중복 없이 뽑음
+    question_ids = list(choices)
+    pairs = random.sample(range(len(user_ids) * len(question_ids)), min(answers, len(user_ids) * len(question_ids)))
+    for start in range(0, len(pairs), 10000):
+        db.session.execute(insert(Answer), [
+            {"user_id": user_ids[pair // len(question_ids)], "question_id": question_ids[pair % len(question_ids)],
+             "choice_id": random.choice(choices[question_ids[pair % len(question_ids)]]),
+             "created_at": now, "updated_at": now}
+            for pair in pairs[start:start + 10000]
+        ])
+    # 아직 답변이 없는 유저 (POST /submit이 검증 후 저장까지 실행되도록)
+    new_user = User(name="plan", age=AgeStatus.teen, gender=GenderStatus.male, email="plan-new@example.com")
+    db.session.add(new_user)
+    db.session.commit()
+    answer = db.session.execute(text("SELECT user_id, choice_id FROM answers LIMIT 1")).one()
+    question_id = next(iter(choices))
+    return {
+        "user_id": answer.user_id,
+        "choice_id": answer.choice_id,
+        "question_id": question_id,
+        "new_user_id": new_user.id,
+    }
+
+
+def fill(value, ids):
+    """요청 경로/본문의 {user_id} 등을 실제 id로 치환"""
+    if isinstance(value, str):
+        filled = value.format(**ids)
+        return int(filled) if re.fullmatch(r"\{\w+\}", value) else filled
+    if isinstance(value, list):
+        return [fill(item, ids) for item in value]
+    if isinstance(value, dict):
+        return {key: fill(item, ids) for key, item in value.items()}
+    return value
+
+
+def full_scans(connection, statement, parameters):
+    """EXPLAIN 결과에서 전체 스캔하는 테이블 이름 목록"""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+        # "SCAN users" = 전체 스캔, "SEARCH users USING INDEX ..." = 인덱스 검색
+        # "SCAN CONSTANT ROW" = FROM 없는 SELECT (스칼라 서브쿼리만 있는 경우)
+        return [
+            match.group(1)
+            for row in rows
+            for match in [re.match(r"SCAN (?!CONSTANT ROW)(\w+)(?! USING INTEGER PRIMARY KEY)", row[-1])]
+            if match
+        ]
+    if dialect == "mysql":
+        rows = connection.exec_driver_sql("EXPLAIN " + statement, parameters).mappings().all()
+        return [row["table"] for row in rows if row["type"] in ("ALL", "index")]
+    raise RuntimeError(f"EXPLAIN is not supported for {dialect} (supported: mysql, sqlite)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", help="기본값: 임시 SQLite 파일")
+    parser.add_argument("--users", type=int, default=50000)
+    parser.add_argument("--answers", type=int, default=200000)
+    args = parser.parse_args()
+
+    app = make_app(args.database_url, IMAGE_CACHE_DIR="")
+    with app.app_context():
+        ids = seed(args.users, args.answers)
+        engine = db.engine
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    client = app.test_client()
+    failures = 0
+    for name, method, path, body, status, allowed in CALLS:
+        captured.clear()
+        response = client.open(fill(path, ids), method=method, json=fill(body, ids))
+        statements = list(captured)
+        if response.status_code != status:
+            failures += 1
+            print(f"FAIL {name} ({method} {path}): status {response.status_code}, expected {status}")
+            continue
+        failed = 0
+        with engine.connect() as connection:
+            for statement, parameters in statements:
+                scans = [table for table in full_scans(connection, statement, parameters) if table not in allowed]
+                if scans:
+                    failed += 1
+                    print(f"FAIL {name} ({method} {path}): full scan on {', '.join(scans)}")
+                    print(f"     {' '.join(statement.split())}")
+        if not failed:
+            print(f"ok   {name}: {len(statements)} statements, status {response.status_code}")
+        failures += failed
+    event.remove(engine, "before_cursor_execute", capture)
+
+    if failures:
+        print(f"{failures} calls failed or statements use a full table scan")
+        raise SystemExit(1)
+    print("no unexpected full table scans")
+
+
+if __name__ == "__main__":
+    main()
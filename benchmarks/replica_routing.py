@@ -0,0 +1,90 @@
+"""
+읽기 / 쓰기 분리 동작 확인 (SQLite 파일 두 개를 primary / 복제본 대용으로 사용)
+- GET은 복제본, 쓰기는 primary, 쓰기 직후 같은 클라이언트의 조회는 primary
+- 복제본에 연결할 수 없으면 primary로 대체
+실행: python -m benchmarks.replica_routing
+      python -m benchmarks.replica_routing --database-url mysql+pymysql://.../primary --replica-url mysql+pymysql://.../replica
+      (MySQL은 실제 복제 구성이거나, 같은 스키마 / 데이터의 다른 DB를 대용으로 사용)
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+
+from app import create_app
+from benchmarks.common import make_app, seed_survey
+
+WINDOW = 1  # 테스트용 쓰기 후 primary 유지 시간(초)
+
+
+def check(label, condition):
+    print(f"{'ok  ' if condition else 'FAIL'} {label}")
+    return condition
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="primary (기본값: 임시 SQLite 파일)")
+    parser.add_argument("--replica-url", help="복제본 대용 DB (기본값: primary SQLite 파일 복사본)")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="oz_form_replica_")
+    primary_url = args.database_url or f"sqlite:///{os.path.join(directory, 'primary.db')}"
+    replica_url = args.replica_url or f"sqlite:///{os.path.join(directory, 'replica.db')}"
+
+    # primary에 데이터를 만들고 복제본에 복사한 뒤, 복제본 쪽 이름만 바꿔서 어느 DB에서 읽었는지 구분
+    app = make_app(primary_url)
+    with app.app_context():
+        user_ids, _ = seed_survey(users=10, questions=2)
+    if args.replica_url is None:
+        shutil.copy(os.path.join(directory, "primary.db"), os.path.join(directory, "replica.db"))
+    replica_engine = create_engine(replica_url)
+    with replica_engine.begin() as connection:
+        connection.execute(text("UPDATE users SET name = 'from-replica' WHERE id = :id"), {"id": user_ids[0]})
+    replica_engine.dispose()
+
+    passed = True
+    settings = {
+        "SQLALCHEMY_DATABASE_URI": primary_url,
+        "REPLICA_DATABASE_URLS": [replica_url],
+        "REPLICA_READ_AFTER_WRITE_SECONDS": WINDOW,
+        "CONTENT_VERSION_PATH": os.path.join(directory, "content_version"),
+        "ANSWER_SPOOL_DIR": os.path.join(directory, "answer_spool"),
+        "IMAGE_CACHE_DIR": "",
+        "METRICS_DIR": os.path.join(directory, "metrics"),
+    }
+    open(settings["CONTENT_VERSION_PATH"], "w").close()
+    app = create_app(settings)
+    time.sleep(WINDOW + 0.1)  # 설문 내용 변경 직후 구간(모든 조회가 primary) 지나기
+
+    client = app.test_client()
+    name = client.get(f"/users/{user_ids[0]}").get_json()["name"]
+    passed &= check("GET은 복제본에서 조회", name == "from-replica")
+
+    response = client.post("/signup", json={"name": "new", "age": "teen", "gender": "male", "email": "new@example.com"})
+    new_id = response.get_json()["user_id"]
+    passed &= check("쓰기는 primary에 저장 (복제본에는 없음)", response.status_code == 201)
+    passed &= check("쓰기 직후 같은 클라이언트 조회는 primary", client.get(f"/users/{new_id}").status_code == 200)
+    passed &= check("다른 클라이언트 조회는 복제본", app.test_client().get(f"/users/{new_id}").status_code == 404)
+    time.sleep(WINDOW + 1)
+    passed &= check("기한이 지나면 다시 복제본", client.get(f"/users/{new_id}").status_code == 404)
+
+    broken = create_app({**settings, "REPLICA_DATABASE_URLS": ["sqlite:////nonexistent/oz_form/replica.db"]})
+    broken_client = broken.test_client()
+    response = broken_client.get(f"/users/{user_ids[0]}")
+    passed &= check(
+        "복제본 장애 시 primary로 대체",
+        response.status_code == 200 and response.get_json()["name"] != "from-replica",
+    )
+    status = broken_client.get("/db/replicas").get_json()
+    passed &= check("장애 복제본은 점검 대상에서 제외", status["replica_0"]["healthy"] is False)
+
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
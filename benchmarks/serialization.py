@@ -0,0 +1,127 @@
+"""
+목록 API 직렬화 CPU 시간 비교: ORM 객체 + dict 수작업 변환 + 표준 json (기존) vs 컬럼 튜플 조회 + JSON 프로바이더 (현재)
+두 방식의 응답 본문이 바이트 단위로 같은지도 확인
+실행: python -m benchmarks.serialization [--database-url URL] [--rows 10000]
+"""
+import argparse
+import inspect
+import json
+import time
+from datetime import datetime
+
+from flask import jsonify
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import insert
+
+from app.models import KST, Choices, Question, User
+from app.views.choices import get_choices_by_question
+from app.views.questions import get_all_questions
+from app.views.users import get_all_users
+from benchmarks.common import make_app, seed_survey
+from config import db
+
+
+def legacy_questions():
+    questions = Question.query.all()
+    return jsonify([
+        {"id": q.id, "title": q.title, "is_active": q.is_active, "sqe": q.sqe, "image_id": q.image_id}
+        for q in questions
+    ])
+
+
+def legacy_choices(question_id):
+    choices = Choices.query.filter_by(question_id=question_id).all()
+    return jsonify({"choices": [{"id": c.id, "content": c.content, "is_active": c.is_active} for c in choices]})
+
+
+def legacy_users():
+    def to_dict(user):
+        return {
+            "id": user.id,
+            "name": user.name,
+            "age": user.age.value if hasattr(user.age, "value") else user.age,
+            "gender": user.gender.value if hasattr(user.gender, "value") else user.gender,
+            "email": user.email,
+            "created_at": user.created_at.isoformat(),
+            "updated_at": user.updated_at.isoformat(),
+        }
+    return jsonify([to_dict(user) for user in User.query.all()])
+
+
+def body(response):
+    response = response[0] if isinstance(response, tuple) else response
+    return b"".join(response.iter_encoded())
+
+
+def measure(app, path, fn, repeat):
+    """fn 호출 + 본문 생성까지의 최소 CPU 시간(초)과 본문"""
+    best = None
+    for _ in range(repeat):
+        with app.test_request_context(path):
+            started = time.process_time()
+            data = body(fn())
+            elapsed = time.process_time() - started
+            db.session.remove()  # 다음 반복이 identity map을 재사용하지 않도록
+        best = elapsed if best is None else min(best, elapsed)
+    return best, data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", help="기본값: 임시 SQLite 파일")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    app = make_app(args.database_url)
+    current_json = app.json
+    with app.app_context():
+        # 유저 rows명, 질문 rows개, 첫 질문의 선택지 rows개
+        _, choices = seed_survey(users=args.rows, questions=1, choices_per_question=args.rows)
+        question_id = next(iter(choices))
+        image_id = db.session.get(Question, question_id).image_id
+        now = datetime.now(tz=KST)
+        db.session.execute(insert(Question), [
+            {"title": f"질문 {n}", "sqe": n, "image_id": image_id, "is_active": True, "created_at": now, "updated_at": now}
+            for n in range(2, args.rows + 1)
+        ])
+        db.session.commit()
+
+    # 캐시 정책 / 조회 캐시 데코레이터를 모두 벗긴 뷰 본문 (캐시 적중을 재지 않도록)
+    questions_view = inspect.unwrap(get_all_questions)
+    choices_view = inspect.unwrap(get_choices_by_question)
+    cases = [
+        ("GET /question", "/question", legacy_questions, questions_view),
+        ("GET /choice/<id>", f"/choice/{question_id}", lambda: legacy_choices(question_id),
+         lambda: choices_view(question_id)),
+        ("GET /users", "/users", legacy_users, get_all_users),
+    ]
+
+    results = []
+    print(f"{'endpoint':<18} {'legacy ms/10k':>14} {'current ms/10k':>15} {'speedup':>8}  same body")
+    for label, path, legacy, current in cases:
+        app.json = DefaultJSONProvider(app)  # 기존: Flask 기본 프로바이더 (표준 json)
+        legacy_time, legacy_body = measure(app, path, legacy, args.repeat)
+        app.json = current_json
+        current_time, current_body = measure(app, path, current, args.repeat)
+        scale = 10000 / args.rows * 1000
+        results.append({
+            "endpoint": label,
+            "rows": args.rows,
+            "legacy_cpu_ms_per_10k": legacy_time * scale,
+            "current_cpu_ms_per_10k": current_time * scale,
+            "identical": legacy_body == current_body,
+        })
+        print(
+            f"{label:<18} {legacy_time * scale:>14.1f} {current_time * scale:>15.1f} "
+            f"{legacy_time / current_time:>7.1f}x  {legacy_body == current_body}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
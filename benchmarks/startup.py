@@ -0,0 +1,185 @@
+"""
+앱 시작 비용 측정
+- 한 프로세스: import / create_app / 첫 요청까지 걸린 시간, 시작 시 불러오지 않는 무거운 모듈 확인
+- gunicorn: preload 켬 / 끔에서 워커별 첫 요청을 받을 수 있을 때까지 걸린 시간과 메모리 (RSS / PSS)
+- 앱을 만들거나 run.py를 import해도 DB에 접속하지 않고, 스키마는 flask init-db로 생성되는지 확인
+실행: python -m benchmarks.startup [--workers 4] [--repeat 3]
+"""
+import argparse
+import glob
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+from benchmarks.concurrency import ROOT, free_port
+
+# 첫 사용 시 불러오는 선택 / 무거운 의존성 (앱 시작 시에는 없어야 함)
+LAZY_MODULES = ("requests", "PIL.Image", "pyarrow")
+
+IN_PROCESS = """
+import json, sys, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+application = app.create_app()
+created = time.perf_counter()
+application.test_client().get("/")
+finished = time.perf_counter()
+print(json.dumps({
+    "import": imported - started,
+    "create_app": created - imported,
+    "first_request": finished - created,
+    "loaded": [name for name in %r if name in sys.modules],
+}))
+"""
+
+# gunicorn.conf.py 설정에 워커 준비 시각 기록만 추가
+GUNICORN_CONFIG = """
+exec(open(%r).read())
+
+
+def post_worker_init(worker):
+    import time
+    with open(os.path.join(%r, str(worker.pid)), "w") as f:
+        f.write(repr(time.time()))
+"""
+
+
+def check(label, condition):
+    print(f"{'ok  ' if condition else 'FAIL'} {label}")
+    return condition
+
+
+def environment(directory, database_url, **extra):
+    return {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "IMAGE_CACHE_DIR": os.path.join(directory, "image_cache"),
+        "IMAGE_VARIANT_DIR": os.path.join(directory, "image_variants"),
+        "METRICS_DIR": os.path.join(directory, "metrics"),
+        "ANSWER_SPOOL_DIR": os.path.join(directory, "answer_spool"),
+        "CONTENT_VERSION_PATH": os.path.join(directory, "content_version"),
+        "ADMISSION_DIR": os.path.join(directory, "admission"),
+        **extra,
+    }
+
+
+def memory(pid):
+    """프로세스의 RSS / PSS (MB), PSS는 fork로 공유하는 페이지를 프로세스 수로 나눈 값"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if name in ("Rss", "Pss"):
+                values[name] = int(rest.split()[0]) / 1024
+    return values["Rss"], values["Pss"]
+
+
+def in_process(env, repeat):
+    """새 인터프리터에서 import / create_app / 첫 요청 시간 측정 (repeat번 중 중앙값)"""
+    runs = [
+        json.loads(subprocess.run(
+            [sys.executable, "-c", IN_PROCESS % (LAZY_MODULES,)],
+            cwd=ROOT, env=env, check=True, capture_output=True, text=True,
+        ).stdout)
+        for _ in range(repeat)
+    ]
+    result = {key: statistics.median(run[key] for run in runs) for key in ("import", "create_app", "first_request")}
+    result["loaded"] = runs[0]["loaded"]
+    return result
+
+
+def boot(directory, env, workers, preload):
+    """
+    gunicorn 실행 후 모든 워커가 준비될 때까지 대기
+    반환: (워커별 준비까지 걸린 초, 첫 응답까지 걸린 초, 워커별 (RSS, PSS))
+    """
+    ready_dir = tempfile.mkdtemp(dir=directory, prefix="ready_")
+    config_path = os.path.join(ready_dir, "gunicorn.conf.py")
+    with open(config_path, "w") as f:
+        f.write(GUNICORN_CONFIG % (os.path.join(ROOT, "gunicorn.conf.py"), ready_dir))
+
+    port = free_port()
+    started = time.time()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", config_path, "-b", f"127.0.0.1:{port}", "wsgi:app"],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        env={**env, "WEB_CONCURRENCY": str(workers), "GUNICORN_PRELOAD": "1" if preload else "0"},
+    )
+    try:
+        first_response = None
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            if first_response is None:
+                try:
+                    requests.get(f"http://127.0.0.1:{port}/", timeout=1)
+                    first_response = time.time() - started
+                except requests.RequestException:
+                    pass
+            paths = [path for path in glob.glob(os.path.join(ready_dir, "*")) if not path.endswith(".py")]
+            if first_response is not None and len(paths) >= workers:
+                break
+            time.sleep(0.02)
+        else:
+            raise RuntimeError("gunicorn 워커가 60초 안에 준비되지 않았습니다.")
+
+        ready = sorted(float(open(path).read()) - started for path in paths)
+        usage = [memory(int(os.path.basename(path))) for path in paths]
+        return ready, first_response, usage
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="oz_form_startup_")
+    db_path = os.path.join(directory, "startup.db")
+    env = environment(directory, f"sqlite:///{db_path}", ADMISSION_ENABLED="0")
+    passed = True
+
+    result = in_process(env, args.repeat)
+    print(f"import {result['import'] * 1000:.0f} ms, create_app {result['create_app'] * 1000:.0f} ms, "
+          f"first request {result['first_request'] * 1000:.1f} ms")
+    passed &= check(f"시작 시 불러오지 않는 모듈 {', '.join(LAZY_MODULES)}", not result["loaded"])
+
+    subprocess.run([sys.executable, "-c", "import run"], cwd=ROOT, env=env, check=True, capture_output=True)
+    passed &= check("run.py import / create_app / 첫 요청에서 DB 접속 없음", not os.path.exists(db_path))
+
+    print()
+    print(f"{'mode':<12} {'first resp s':>12} {'worker ready s':>24} {'RSS MB/worker':>14} {'PSS MB/worker':>14}")
+    for preload in (False, True):
+        ready, first_response, usage = boot(directory, env, args.workers, preload)
+        print(
+            f"{'preload' if preload else 'no preload':<12} {first_response:>12.2f} "
+            f"{' '.join(f'{value:.2f}' for value in ready):>24} "
+            f"{statistics.mean(rss for rss, _ in usage):>14.1f} {statistics.mean(pss for _, pss in usage):>14.1f}"
+        )
+    passed &= check("gunicorn 시작에서 DB 접속 없음", not os.path.exists(db_path))
+
+    print()
+    subprocess.run([sys.executable, "-m", "flask", "--app", "wsgi", "init-db"], cwd=ROOT, env=env, check=True,
+                   capture_output=True)
+    with sqlite3.connect(db_path) as connection:
+        tables = {name for name, in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        revision = connection.execute("SELECT version_num FROM alembic_version").fetchone() if "alembic_version" in tables else None
+    passed &= check(f"flask init-db: 테이블 {len(tables)}개 생성, 마이그레이션 버전 {revision and revision[0]}",
+                    "users" in tables and revision is not None)
+
+    print()
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
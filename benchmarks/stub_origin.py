@@ -0,0 +1,70 @@
+"""
+외부 이미지 서버 역할을 하는 로컬 HTTP 서버 (이미지 프록시 벤치마크용)
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubOrigin:
+    """
+    /<이름>.png 요청에 고정 크기 이미지를 돌려주는 서버
+    delay: 응답 전 대기 시간(초), 느린 원본 서버 흉내
+    body / content_type: 실제 이미지 파일을 돌려줄 때 지정 (기본은 size 바이트의 가짜 PNG)
+    """
+
+    def __init__(self, size=200 * 1024, delay=0.0, host="127.0.0.1", port=0, body=None, content_type="image/png"):
+        if body is None:
+            body = (b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * (size // 256 + 1))[:size]
+        self.body = body
+        self.content_type = content_type
+        self.delay = delay
+        self.requests = 0
+        origin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                origin.requests += 1
+                if origin.delay:
+                    time.sleep(origin.delay)
+                if self.headers.get("If-None-Match") == '"stub"':
+                    self.send_response(304)
+                    self.send_header("ETag", '"stub"')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", origin.content_type)
+                self.send_header("Content-Length", str(len(origin.body)))
+                self.send_header("ETag", '"stub"')
+                self.send_header("Cache-Control", "max-age=300")
+                self.end_headers()
+                self.wfile.write(origin.body)
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://{host}:{self.server.server_port}"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--size", type=int, default=200 * 1024)
+    parser.add_argument("--delay", type=float, default=0.0)
+    args = parser.parse_args()
+    origin = StubOrigin(args.size, args.delay, port=args.port)
+    print(f"serving {origin.url}/<name>.png")
+    origin.server.serve_forever()
@@ -0,0 +1,132 @@
+"""
+유저 일괄 가입 처리량 비교: 행마다 중복 조회 + INSERT + 커밋 (/signup과 같은 방식) vs 묶음 단위 (POST /users/import)
+- 파일 안 중복 / 이미 가입된 이메일 / 잘못된 값이 행별 결과로 구분되는지 확인
+- 헤더가 잘못된 파일은 400, 도중에 끊긴 파일은 error 줄 + complete가 false인 summary로 끝나는지 확인
+실행: python -m benchmarks.user_import [--database-url URL] [--rows 100000] [--per-row-rows 2000]
+"""
+import argparse
+import gzip
+import json
+import sys
+import time
+import tracemalloc
+
+from app.models import AgeStatus, GenderStatus, User
+from benchmarks.common import make_app
+from config import db
+
+AGES = list(AgeStatus.__members__)
+GENDERS = list(GenderStatus.__members__)
+
+
+def check(label, condition):
+    print(f"{'ok  ' if condition else 'FAIL'} {label}")
+    return condition
+
+
+def records(count, prefix):
+    return [
+        {"name": f"user{i}", "age": AGES[i % len(AGES)], "gender": GENDERS[i % len(GENDERS)], "email": f"{prefix}{i}@example.com"}
+        for i in range(count)
+    ]
+
+
+def as_csv(rows):
+    return "name,age,gender,email\n" + "".join(f"{r['name']},{r['age']},{r['gender']},{r['email']}\n" for r in rows)
+
+
+def as_ndjson(rows):
+    return "".join(json.dumps(r) + "\n" for r in rows)
+
+
+def per_row(app, rows):
+    """기존 /signup 방식: 행마다 이메일 조회, 객체 추가, 커밋"""
+    with app.app_context():
+        started = time.perf_counter()
+        for row in rows:
+            if User.query.filter_by(email=row["email"]).first():
+                continue
+            db.session.add(User(
+                name=row["name"], age=AgeStatus[row["age"]], gender=GenderStatus[row["gender"]], email=row["email"]
+            ))
+            db.session.commit()
+        return time.perf_counter() - started
+
+
+def bulk(client, body, **kwargs):
+    """POST /users/import 호출, (걸린 시간, 행별 결과, 요약) 반환"""
+    started = time.perf_counter()
+    response = client.post("/users/import", data=body, **kwargs)
+    elapsed = time.perf_counter() - started
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    return elapsed, lines[:-1], lines[-1]["summary"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="생략하면 임시 SQLite 파일")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--per-row-rows", type=int, default=2000, help="행 단위 방식은 느리므로 적은 행으로 측정")
+    args = parser.parse_args()
+
+    app = make_app(args.database_url)
+    client = app.test_client()
+    passed = True
+
+    # 행별 결과 확인
+    client.post("/signup", json={"name": "old", "age": "teen", "gender": "male", "email": "old@example.com"})
+    body = as_csv([
+        {"name": "a", "age": "teen", "gender": "male", "email": "a@example.com"},
+        {"name": "b", "age": "unknown", "gender": "male", "email": "b@example.com"},
+        {"name": "c", "age": "teen", "gender": "female", "email": "old@example.com"},
+        {"name": "d", "age": "teen", "gender": "female", "email": "a@example.com"},
+    ])
+    _, results, summary = bulk(client, body, content_type="text/csv")
+    passed &= check(
+        "행별 결과: created / invalid / exists / duplicate",
+        [r["status"] for r in results] == ["created", "invalid", "exists", "duplicate"] and results[3]["first_row"] == 1,
+    )
+    passed &= check("잘못된 format은 400", client.post("/users/import?format=xml", data=body).status_code == 400)
+    passed &= check(
+        "CSV 헤더에 필요한 컬럼이 없으면 응답 전에 400",
+        client.post("/users/import", data="name,email\na,a@example.com\n", content_type="text/csv").status_code == 400,
+    )
+
+    # 두 번째 묶음을 읽는 도중 끊긴 gzip 파일 (첫 묶음은 저장되고, 끝은 error + complete: false)
+    batch_rows = app.config["USER_IMPORT_BATCH_ROWS"]
+    compressed = gzip.compress(as_csv(records(batch_rows * 3, "cut")).encode())
+    response = client.post("/users/import", data=compressed[:len(compressed) // 2], content_type="text/csv",
+                           headers={"Content-Encoding": "gzip"})
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    passed &= check(
+        f"도중에 끊긴 파일 → error 줄(after_row {lines[-2].get('after_row')}) + complete: false",
+        lines[-2].get("status") == "error" and lines[-1]["complete"] is False
+        and lines[-1]["summary"]["created"] == lines[-2]["after_row"] >= batch_rows,
+    )
+
+    # 처리량 비교
+    per_row_seconds = per_row(app, records(args.per_row_rows, "row"))
+    print()
+    print(f"{'method':<24} {'rows':>8} {'rows/s':>10} {'peak MB':>10}")
+    print(f"{'per-row commit':<24} {args.per_row_rows:>8,} {args.per_row_rows / per_row_seconds:>10,.0f} {'':>10}")
+
+    rows = records(args.rows, "bulk")
+    for label, body, kwargs in [
+        ("import csv", as_csv(rows), {"content_type": "text/csv"}),
+        ("import ndjson.gz", gzip.compress(as_ndjson(rows).encode()),
+         {"query_string": {"format": "ndjson"}, "headers": {"Content-Encoding": "gzip"}}),
+    ]:
+        tracemalloc.start()
+        elapsed, results, summary = bulk(client, body, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{label:<24} {args.rows:>8,} {args.rows / elapsed:>10,.0f} {peak / 1024 / 1024:>10.1f}")
+        expected = "created" if label == "import csv" else "exists"  # 두 번째는 같은 이메일을 다시 가져옴
+        passed &= check(f"{label}: {summary}", summary[expected] == args.rows)
+
+    print()
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+gunicorn 설정 (launch.sh에서 gunicorn -c gunicorn.conf.py wsgi:app 으로 사용)
+gthread 워커: 워커마다 WORKER_CONCURRENCY개 스레드가 요청을 처리하므로
+느린 외부 이미지 요청(/image/<id>)이 스레드 하나만 묶고 다른 API는 계속 응답함
+(requests / PyMySQL은 I/O 대기 중 GIL을 놓으므로 스레드끼리 번갈아 실행)
+"""
+import os
+import shutil
+
+from config import Config
+
+bind = os.getenv("GUNICORN_BIND", "127.0.0.1:8000")
+workers = Config.WEB_CONCURRENCY  # 프로세스 수 (CPU 코어 수 정도, 이미지 동시 처리 한도도 이 값 기준)
+worker_class = "gthread"
+threads = Config.WORKER_CONCURRENCY  # 워커당 동시 처리 수 (DB 풀 / 이미지 프록시 풀 크기도 이 값 기준)
+timeout = 30  # 이 시간 동안 응답 없는 워커는 재시작 (이미지 프록시 읽기 제한 시간보다 길게)
+keepalive = 5
+# 마스터에서 앱을 한 번 만들고 워커는 fork로 공유 (워커마다 import / create_app을 반복하지 않고 메모리 페이지도 공유)
+# 코드 변경은 HUP 재시작으로 반영되지 않으므로 배포 시 마스터까지 재시작 (terminate.sh 후 launch.sh)
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+
+def on_starting(server):
+    # 이전 실행에서 남은 워커별 지표 파일 정리 (/metrics 합산 기준 초기화)
+    shutil.rmtree(Config.METRICS_DIR, ignore_errors=True)
+
+
+def post_fork(server, worker):
+    # 마스터에서 만든 DB 커넥션이 있으면 워커가 같은 소켓을 쓰지 않도록 풀을 비움 (마스터 쪽 연결은 닫지 않음)
+    app = worker.app.callable
+    if app is None:
+        return  # preload가 아니면 워커가 앱을 새로 만듦
+    from config import db
+
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
@@ -24,8 +24,8 @@ else
     exit 1
 fi
 
-# Gunicorn 실행
-gunicorn --workers 4 --bind 127.0.0.1:8000 wsgi:app --daemon --log-file gunicorn.log
+# Gunicorn 실행 (워커 수 / 스레드 수 등은 gunicorn.conf.py 참고)
+gunicorn -c gunicorn.conf.py wsgi:app --daemon --log-file gunicorn.log
 
 if [ $? -eq 0 ]; then
     echo "Flask app launched successfully with Gunicorn."
@@ -0,0 +1,56 @@
+"""one answer per user per question
+
+Revision ID: 02bc467d1ecf
+Revises: 3581ce315779
+Create Date: 2026-10-18 13:21:13.025910
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '02bc467d1ecf'
+down_revision = '3581ce315779'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('answers', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('question_id', sa.Integer(), nullable=True))
+
+    # 기존 답변의 질문 id 채우기
+    op.execute(
+        "UPDATE answers SET question_id = "
+        "(SELECT choices.question_id FROM choices WHERE choices.id = answers.choice_id)"
+    )
+
+    # 유저가 같은 질문에 여러 번 답한 경우 가장 최근 답변(가장 큰 id)만 남김
+    # (MySQL은 DELETE 대상 테이블을 서브쿼리에서 바로 읽을 수 없어 파생 테이블로 감쌈)
+    op.execute(
+        "DELETE FROM answers WHERE question_id IS NOT NULL AND id NOT IN ("
+        "SELECT id FROM (SELECT MAX(id) AS id FROM answers "
+        "WHERE question_id IS NOT NULL GROUP BY user_id, question_id) AS latest)"
+    )
+
+    # 지운 답변만큼 집계가 어긋나므로 answers 기준으로 다시 계산
+    op.execute("DELETE FROM answer_stats")
+    op.execute(
+        "INSERT INTO answer_stats (question_id, choice_id, age, gender, count, created_at, updated_at) "
+        "SELECT choices.question_id, answers.choice_id, users.age, users.gender, COUNT(*), "
+        "CURRENT_TIMESTAMP, CURRENT_TIMESTAMP "
+        "FROM answers JOIN users ON users.id = answers.user_id JOIN choices ON choices.id = answers.choice_id "
+        "GROUP BY choices.question_id, answers.choice_id, users.age, users.gender"
+    )
+
+    with op.batch_alter_table('answers', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_answers_user_id_question_id', ['user_id', 'question_id'])
+        batch_op.create_foreign_key('fk_answers_question_id_questions', 'questions', ['question_id'], ['id'])
+
+
+def downgrade():
+    with op.batch_alter_table('answers', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_answers_question_id_questions', type_='foreignkey')
+        batch_op.drop_constraint('uq_answers_user_id_question_id', type_='unique')
+        batch_op.drop_column('question_id')
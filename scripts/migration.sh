@@ -33,9 +33,8 @@ fi
 echo "==== Starting Migration ===="
 echo
 
-# Flask 마이그레이션 작업
-flask db init
-flask db migrate
+# Flask 마이그레이션 작업 (migrations/ 디렉토리는 저장소에 포함되어 있음)
+# db.create_all()로 이미 테이블을 만든 DB라면 처음 한 번 'flask db stamp ece3692467ef' 후 실행
 flask db upgrade
 
 echo "==== Migration Completed ===="
\ No newline at end of file